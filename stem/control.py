@@ -67,6 +67,7 @@ If you're fine with allowing your script to raise exceptions then this can be mo
 ::
 
   event_description - brief description of a tor event type
+  read_recorded_events - provides the events within an EventRecorder's file
 
   Controller - General controller class intended for direct use
     | |- from_port - Provides a Controller based on a port connection.
@@ -118,10 +119,27 @@ If you're fine with allowing your script to raise exceptions then this can be mo
     |
     |- add_event_listener - attaches an event listener to be notified of tor events
     |- remove_event_listener - removes a listener so it isn't notified of further events
+    |- get_listener_stats - provides queue and lag information for a listener
     |
     |- is_caching_enabled - true if the controller has enabled caching
     |- set_caching - enables or disables caching
     |- clear_cache - clears any cached results
+    |- get_cache_stats - provides hit and miss counts for our cache
+    |
+    |- is_coalescing_enabled - true if concurrent GETINFO and GETCONF queries are merged
+    |- set_coalescing - enables or disables merging of concurrent queries
+    |
+    |- is_network_status_mirroring_enabled - true if we keep a copy of the consensus
+    |- set_network_status_mirroring - enables or disables our copy of the consensus
+    |
+    |- is_circuit_tracking_enabled - true if we track circuits and streams through events
+    |- set_circuit_tracking - enables or disables tracking of circuits and streams
+    |
+    |- get_stream_attacher - provides the attacher that picks circuits for our streams
+    |- set_stream_attacher - attaches new streams through a StreamAttacher
+    |
+    |- is_lazy_event_parsing_enabled - true if event attributes are parsed when accessed
+    |- set_lazy_event_parsing - enables or disables lazy parsing of events
     |
     |- load_conf - loads configuration information as if it was in the torrc
     |- save_conf - saves configuration information to the torrc
@@ -149,6 +167,18 @@ If you're fine with allowing your script to raise exceptions then this can be mo
 
   BaseController - Base controller class asynchronous message handling
     |- msg - communicates with the tor process
+    |- is_pipelining_enabled - true if multiple requests can be in flight at once
+    |- set_pipelining - enables or disables pipelined requests
+    |- set_event_queue_limit - bounds how many events we buffer for our listeners
+    |- get_event_queue_stats - provides the depth, drops, and lag of our event queue
+    |- get_event_recorder - provides the recorder that we write events to
+    |- set_event_recorder - records the events that we receive
+    |- replay_events - provides recorded events to our listeners
+    |- is_metrics_enabled - true if we're measuring our requests and events
+    |- set_metrics - enables or disables measuring our requests and events
+    |- get_metrics - provides the latency and throughput of our requests and events
+    |- add_metrics_listener - notifies a callback of each request's measurements
+    |- remove_metrics_listener - removes a metrics listener
     |- is_alive - reports if our connection to tor is open or closed
     |- is_localhost - returns if the connection is for the local system or not
     |- connection_time - time when we last connected or disconnected
@@ -160,6 +190,22 @@ If you're fine with allowing your script to raise exceptions then this can be mo
     |- add_status_listener - notifies a callback of changes in our status
     +- remove_status_listener - prevents further notification of status changes
 
+  BandwidthAggregator - Event listener that retains bandwidth usage
+    |- total - bytes read and written within a window
+    |- rate - bytes per second read and written within a window
+    +- top - circuits, streams, or connections that used the most bandwidth
+
+  StreamAttacher - Picks the circuits that new streams are attached to
+    |- add_route - attaches streams for an address or port to a circuit
+    |- remove_route - stops attaching streams for an address or port to a circuit
+    |- remove_circuit - removes all routes to a circuit
+    |- choose - circuit that a stream should be attached to
+    +- latency - percentiles for how long we take to attach streams
+
+  EventRecorder - Appends the events we receive to a file
+    |- record - appends an event
+    +- close - closes our file
+
 .. data:: State (enum)
 
   Enumeration for states that a controller can have.
@@ -242,15 +288,51 @@ If you're fine with allowing your script to raise exceptions then this can be mo
   **EXTOR**       pluggable transport for Extended ORPorts (torrc's **ExtORPort**)
   **HTTPTUNNEL**  http tunneling proxy (torrc's **HTTPTunnelPort**)
   =============== ===========
+
+.. data:: ListenerOverflow (enum)
+
+  Action taken when an event arrives for a listener whose queue is full. See
+  :func:`~stem.control.Controller.add_event_listener`.
+
+  .. versionadded:: 2.0.0
+
+  ================= ===========
+  ListenerOverflow  Description
+  ================= ===========
+  **BLOCK**         wait for the listener to make room, delaying further events
+  **DROP_OLDEST**   discard the oldest queued event
+  **COALESCE**      sum bandwidth events into the queued event for the same circuit, stream, or connection, and when full replace the oldest queued event of the same type (or discard the oldest event if there's none)
+  ================= ===========
+
+.. data:: EventQueueOverflow (enum)
+
+  Action taken when an event arrives and our controller's event queue is
+  full. See :func:`~stem.control.BaseController.set_event_queue_limit`.
+
+  .. versionadded:: 2.0.0
+
+  =================== ===========
+  EventQueueOverflow  Description
+  =================== ===========
+  **PAUSE_READING**   stop reading from the socket until there's room, so tor buffers further events
+  **DROP_OLDEST**     discard the oldest queued event
+  **DROP_NEWEST**     discard the event that just arrived
+  =================== ===========
 """
 
+import array
 import asyncio
+import bisect
 import calendar
 import collections
+import copy
 import functools
 import inspect
 import io
+import itertools
+import operator
 import os
+import struct
 import threading
 import time
 
@@ -273,11 +355,11 @@ import stem.util.system
 import stem.util.tor_tools
 import stem.version
 
-from stem import UNDEFINED, CircStatus, Signal
+from stem import UNDEFINED, CircStatus, Signal, StreamStatus
 from stem.util import log
 from stem.util.asyncio import Synchronous
 from types import TracebackType
-from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Mapping, Optional, Sequence, Set, Tuple, Type, Union
+from typing import Any, AsyncIterator, Awaitable, BinaryIO, Callable, Deque, Dict, Iterator, List, Mapping, Optional, Sequence, Set, Tuple, Type, Union
 
 # When closing the controller we attempt to finish processing enqueued events,
 # but if it takes longer than this we terminate.
@@ -339,6 +421,18 @@ Listener = stem.util.enum.UppercaseEnum(
   'HTTPTUNNEL',
 )
 
+ListenerOverflow = stem.util.enum.UppercaseEnum(
+  'BLOCK',
+  'DROP_OLDEST',
+  'COALESCE',
+)
+
+EventQueueOverflow = stem.util.enum.UppercaseEnum(
+  'PAUSE_READING',
+  'DROP_OLDEST',
+  'DROP_NEWEST',
+)
+
 # torrc options that cannot be changed once tor's running
 
 IMMUTABLE_CONFIG_OPTIONS = set(map(stem.util.str_tools._to_unicode, map(str.lower, (
@@ -361,6 +455,32 @@ IMMUTABLE_CONFIG_OPTIONS = set(map(stem.util.str_tools._to_unicode, map(str.lowe
 
 LOG_CACHE_FETCHES = True  # provide trace level logging for cache hits
 MSG_TIMEOUT = 5  # seconds to await a response from tor
+REQUEST_CACHE_SIZE = 1000  # maximum number of entries in our request cache
+STREAM_BACKLOG = 16  # chunks of a streamed reply we buffer before pausing reads
+STREAM_STALL_TIMEOUT = 1  # seconds we pause reads for a streamed reply's consumer before buffering the rest
+
+# Upper bounds (in seconds) of the buckets that we count request latencies
+# within. Latencies above the last bound are counted in a final bucket.
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Event recordings begin with a header, followed by events of the form...
+#
+#   arrival timestamp (double), content length (uint32), raw content
+
+EVENT_RECORDING_HEADER = b'stem-events 1\n'
+EVENT_RECORD = struct.Struct('!dI')
+
+# Attributes of bandwidth events that are summed when coalescing them. Each
+# circuit, stream, or connection reports its usage since its last event, so
+# the sum of several events is equivalent to them all.
+
+COALESCED_EVENT_ATTR = {
+  'BW': ('read', 'written'),
+  'CIRC_BW': ('read', 'written', 'delivered_read', 'delivered_written', 'overhead_read', 'overhead_written'),
+  'CONN_BW': ('read', 'written'),
+  'STREAM_BW': ('read', 'written'),
+}
 
 # Configuration options that are fetched by a special key. The keys are
 # lowercase to make case insensitive lookups easier.
@@ -395,6 +515,31 @@ CACHEABLE_GETINFO_PARAMS_UNTIL_SETCONF = (
   'accounting/enabled',
 )
 
+# GETINFO parameters that change frequently, but are cheap to keep for a few
+# seconds. These are mappings of the parameter to seconds they're cached for.
+
+CACHEABLE_GETINFO_PARAMS_WITH_TTL = {
+  'traffic/read': 1,
+  'traffic/written': 1,
+}
+
+# GETINFO parameters that remain valid until we receive an event. Entries
+# ending with a slash are prefixes. These are only cached while we're
+# listening for all of their events, since otherwise we couldn't tell when
+# they become stale.
+
+CACHEABLE_GETINFO_PARAMS_UNTIL_EVENT = {
+  'ns/all': ('NEWCONSENSUS', 'NS'),
+  'ns/id/': ('NEWCONSENSUS', 'NS'),
+  'ns/name/': ('NEWCONSENSUS', 'NS'),
+  'desc/all-recent': ('NEWDESC',),
+  'desc/id/': ('NEWDESC',),
+  'desc/name/': ('NEWDESC',),
+  'md/all': ('NEWDESC',),
+  'md/id/': ('NEWDESC',),
+  'md/name/': ('NEWDESC',),
+}
+
 # GETCONF parameters we shouldn't cache. This includes hidden service
 # perameters due to the funky way they're set and retrieved (for instance,
 # 'SETCONF HiddenServiceDir' effects 'GETCONF HiddenServiceOptions').
@@ -470,251 +615,2001 @@ class HiddenServiceCredential(collections.namedtuple('HiddenServiceCredential',
   """
 
 
-def with_default(yields: bool = False) -> Callable:
+class CacheStats(collections.namedtuple('CacheStats', ['hits', 'misses', 'evictions', 'expirations', 'size'])):
   """
-  Provides a decorator to support having a default value. This should be
-  treated as private.
+  Usage of a controller's request cache.
+
+  :var int hits: lookups that were answered from our cache
+  :var int misses: lookups that weren't cached
+  :var int evictions: entries dropped to stay within our size limit
+  :var int expirations: entries dropped because their time to live elapsed
+  :var int size: number of entries presently cached
   """
 
-  def decorator(func: Callable) -> Callable:
-    def get_default(func: Callable, args: Any, kwargs: Any) -> Any:
-      arg_names = inspect.getfullargspec(func).args[1:]  # drop 'self'
-      default_position = arg_names.index('default') if 'default' in arg_names else None
 
-      if default_position is not None and default_position < len(args):
-        return args[default_position]
-      else:
-        return kwargs.get('default', UNDEFINED)
+class ListenerStats(collections.namedtuple('ListenerStats', ['queued', 'delivered', 'dropped', 'lag', 'max_lag', 'coalesced'])):
+  """
+  Backlog of a listener that's notified from its own queue.
+
+  :var int queued: events awaiting delivery
+  :var int delivered: events that have been provided to the listener
+  :var int dropped: events discarded because the queue was full
+  :var float lag: seconds our most recently delivered event was queued
+  :var float max_lag: longest that an event has been queued, in seconds
+  :var int coalesced: bandwidth events summed into one that was already queued
+  """
 
-    if asyncio.iscoroutinefunction(func) and not yields:
-      @functools.wraps(func)
-      async def wrapped(self, *args: Any, **kwargs: Any) -> Any:
-        try:
-          return await func(self, *args, **kwargs)
-        except:
-          default = get_default(func, args, kwargs)
 
-          if default == UNDEFINED:
-            raise
-          else:
-            return default
-    elif inspect.isasyncgenfunction(func) and yields:
-      @functools.wraps(func)
-      async def wrapped(self, *args: Any, **kwargs: Any) -> Any:
-        try:
-          async for val in func(self, *args, **kwargs):
-            yield val
-        except:
-          default = get_default(func, args, kwargs)
+class EventQueueStats(collections.namedtuple('EventQueueStats', ['queued', 'received', 'dropped', 'paused', 'lag', 'max_lag'])):
+  """
+  Backlog of the queue our controller reads events into.
+
+  :var int queued: events awaiting our listeners
+  :var int received: events we've read from the socket
+  :var int dropped: events discarded because the queue was full
+  :var int paused: times we stopped reading because the queue was full
+  :var float lag: seconds since the oldest event our listeners haven't
+    finished with was queued
+  :var float max_lag: longest that an event has been queued, in seconds
+  """
 
-          if default == UNDEFINED:
-            raise
-          else:
-            if default is not None:
-              for val in default:
-                yield val
-    elif not yields:
-      @functools.wraps(func)
-      def wrapped(self, *args: Any, **kwargs: Any) -> Any:
-        try:
-          return func(self, *args, **kwargs)
-        except:
-          default = get_default(func, args, kwargs)
 
-          if default == UNDEFINED:
-            raise
-          else:
-            return default
-    else:
-      @functools.wraps(func)
-      def wrapped(self, *args: Any, **kwargs: Any) -> Any:
-        try:
-          for val in func(self, *args, **kwargs):
-            yield val
-        except:
-          default = get_default(func, args, kwargs)
+class RequestMetrics(collections.namedtuple('RequestMetrics', ['command', 'queue_wait', 'round_trip', 'bytes_sent', 'bytes_received', 'is_error'])):
+  """
+  Measurements of a request that we've made to tor.
+
+  :var str command: request's command, such as 'GETINFO'
+  :var float queue_wait: seconds the request waited behind others before we
+    sent it
+  :var float round_trip: seconds from sending the request until we read its
+    reply
+  :var int bytes_sent: size of the request
+  :var int bytes_received: size of the reply
+  :var bool is_error: **True** if tor rejected the request or we failed to
+    receive a reply
+  """
 
-          if default == UNDEFINED:
-            raise
-          else:
-            if default is not None:
-              for val in default:
-                yield val
 
-    return wrapped
+class _LatencyHistogram(object):
+  """
+  Counts durations within the buckets of **LATENCY_BUCKETS**.
+  """
 
-  return decorator
+  def __init__(self) -> None:
+    self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+    self.total = 0.0
+    self.max = 0.0
 
+  def add(self, duration: float) -> None:
+    self.counts[bisect.bisect_left(LATENCY_BUCKETS, duration)] += 1
+    self.total += duration
+    self.max = max(self.max, duration)
 
-def event_description(event: str) -> str:
+  def snapshot(self) -> Dict[str, Any]:
+    count = sum(self.counts)
+
+    return {
+      'count': count,
+      'mean': self.total / count if count else 0.0,
+      'max': self.max,
+      'buckets': list(zip(LATENCY_BUCKETS + (float('inf'),), self.counts)),
+    }
+
+
+class _CommandMetrics(object):
+  """
+  Totals for the requests we've made with a command.
   """
-  Provides a description for Tor events.
 
-  :param event: the event for which a description is needed
+  def __init__(self) -> None:
+    self.count = 0
+    self.errors = 0
+    self.bytes_sent = 0
+    self.bytes_received = 0
+    self.max_reply_size = 0
+    self.queue_wait = _LatencyHistogram()
+    self.round_trip = _LatencyHistogram()
 
-  :returns: **str** The event description or **None** if this is an event name
-    we don't have a description for
+
+class _Metrics(object):
+  """
+  Measurements of our requests (by their command) and the events we receive
+  (by their type).
   """
 
-  global EVENT_DESCRIPTIONS
+  def __init__(self) -> None:
+    self.started_at = time.time()
+    self.bytes_sent = 0
+    self.bytes_received = 0
+
+    self._commands = {}  # type: Dict[str, _CommandMetrics]
+    self._events = {}  # type: Dict[str, List[int]] # event type => [count, bytes]
+
+  def add_request(self, request: 'stem.control.RequestMetrics') -> None:
+    command = self._commands.get(request.command)
+
+    if command is None:
+      command = self._commands[request.command] = _CommandMetrics()
+
+    command.count += 1
+    command.errors += request.is_error
+    command.bytes_sent += request.bytes_sent
+    command.bytes_received += request.bytes_received
+    command.max_reply_size = max(command.max_reply_size, request.bytes_received)
+    command.queue_wait.add(request.queue_wait)
+    command.round_trip.add(request.round_trip)
+
+    self.bytes_sent += request.bytes_sent
+    self.bytes_received += request.bytes_received
+
+  def add_event(self, event_message: stem.response.ControlMessage) -> None:
+    raw_content = event_message.raw_content(get_bytes = True)
+    event_type = raw_content[4:].split(None, 1)[0].decode('utf-8', 'replace') if len(raw_content) > 4 else ''
+    event = self._events.get(event_type)
+
+    if event is None:
+      event = self._events[event_type] = [0, 0]
+
+    event[0] += 1
+    event[1] += len(raw_content)
+    self.bytes_received += len(raw_content)
+
+  def snapshot(self) -> Dict[str, Any]:
+    elapsed = max(time.time() - self.started_at, 1e-6)
+
+    commands = {}
+
+    for name, command in list(self._commands.items()):
+      commands[name] = {
+        'count': command.count,
+        'errors': command.errors,
+        'bytes_sent': command.bytes_sent,
+        'bytes_received': command.bytes_received,
+        'max_reply_size': command.max_reply_size,
+        'rate': command.count / elapsed,
+        'queue_wait': command.queue_wait.snapshot(),
+        'round_trip': command.round_trip.snapshot(),
+      }
 
-  if EVENT_DESCRIPTIONS is None:
-    config = stem.util.conf.Config()
-    config_path = os.path.join(os.path.dirname(__file__), 'settings.cfg')
+    events = {}
 
-    try:
-      config.load(config_path)
-      EVENT_DESCRIPTIONS = dict([(key.lower()[18:], config.get_value(key)) for key in config.keys() if key.startswith('event.description.')])  # type: ignore
-    except Exception as exc:
-      log.warn("BUG: stem failed to load its internal manual information from '%s': %s" % (config_path, exc))
-      return None
+    for event_type, (count, size) in list(self._events.items()):
+      events[event_type] = {
+        'count': count,
+        'bytes': size,
+        'rate': count / elapsed,
+      }
 
-  return EVENT_DESCRIPTIONS.get(event.lower())
+    return {
+      'since': self.started_at,
+      'bytes_sent': self.bytes_sent,
+      'bytes_received': self.bytes_received,
+      'commands': commands,
+      'events': events,
+    }
 
 
-class BaseController(Synchronous):
+class _RequestCache(object):
   """
-  Controller for the tor process. This is a minimal base class for other
-  controllers, providing basic process communication and event listing. Don't
-  use this directly - subclasses like the :class:`~stem.control.Controller`
-  provide higher level functionality.
+  Cache for the results of our requests. Entries can expire after a number of
+  seconds or when we receive an event, and when full we evict the least
+  recently used entry.
 
-  It's highly suggested that you don't interact directly with the
-  :class:`~stem.socket.ControlSocket` that we're constructed from - use our
-  wrapper methods instead.
+  This isn't thread safe, so callers are expected to hold the controller's
+  cache lock.
+  """
 
-  If the **control_socket** is already authenticated to Tor then the caller
-  should provide the **is_authenticated** flag. Otherwise, we will treat the
-  socket as though it hasn't yet been authenticated.
+  def __init__(self, max_size: Optional[int] = None) -> None:
+    self.max_size = max_size
+
+    self.hits = 0
+    self.misses = 0
+    self.evictions = 0
+    self.expirations = 0
+
+    self._entries = collections.OrderedDict()  # type: collections.OrderedDict[str, Tuple[Any, Optional[float], Sequence[str]]] # key => (value, expiration, events)
+    self._keys_by_event = {}  # type: Dict[str, Set[str]] # event type => keys it invalidates
+
+    # Number of times we've received each event type. Requests can snapshot
+    # this to tell if an event arrived while they awaited tor's reply.
+
+    self.invalidation_counts = collections.Counter()  # type: collections.Counter[str]
+
+  def __len__(self) -> int:
+    return len(self._entries)
+
+  def get(self, key: str) -> Any:
+    """
+    Provides a cached value, or **None** if it's absent or expired.
+
+    :param key: key to be queried
+
+    :returns: value for the given key
+    """
+
+    entry = self._entries.get(key)
+
+    if entry is not None:
+      value, expiration, _ = entry
+
+      if expiration is not None and expiration <= time.time():
+        self.delete(key)
+        self.expirations += 1
+      else:
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    self.misses += 1
+    return None
+
+  def set(self, key: str, value: Any, ttl: Optional[float] = None, invalidated_by: Sequence[str] = ()) -> None:
+    """
+    Caches a value, evicting our least recently used entry if we're full.
+
+    :param key: key to cache the value under
+    :param value: value to be cached
+    :param ttl: seconds until this entry expires, no expiration if **None**
+    :param invalidated_by: event types that invalidate this entry
+    """
+
+    self.delete(key)
+    self._entries[key] = (value, time.time() + ttl if ttl is not None else None, tuple(invalidated_by))
+
+    for event_type in invalidated_by:
+      self._keys_by_event.setdefault(event_type, set()).add(key)
+
+    while self.max_size is not None and len(self._entries) > self.max_size:
+      self.delete(next(iter(self._entries)))
+      self.evictions += 1
+
+  def delete(self, key: str) -> None:
+    """
+    Removes an entry from our cache if present.
+
+    :param key: key to be removed
+    """
+
+    entry = self._entries.pop(key, None)
+
+    if entry is not None:
+      for event_type in entry[2]:
+        self._keys_by_event.get(event_type, set()).discard(key)
+
+  def delete_namespace(self, namespace: str) -> None:
+    """
+    Removes all entries within a namespace.
+
+    :param namespace: namespace to be removed
+    """
+
+    for key in [k for k in self._entries if k.startswith('%s.' % namespace)]:
+      self.delete(key)
+
+  def invalidate(self, event_type: str) -> None:
+    """
+    Removes all entries that are invalidated by the given event type.
+
+    :param event_type: event that we've received
+    """
+
+    self.invalidation_counts[event_type] += 1
+
+    for key in self._keys_by_event.pop(event_type, ()):
+      self.delete(key)
+
+  def clear(self) -> None:
+    """
+    Removes all entries, retaining our counters.
+    """
+
+    self._entries.clear()
+    self._keys_by_event.clear()
+
+
+class _ReplyStream(object):
   """
+  Reply whose data block is provided as it's read from the socket, rather than
+  once the whole message has been received.
 
-  def __init__(self, control_socket: stem.socket.ControlSocket, is_authenticated: bool = False) -> None:
-    super(BaseController, self).__init__()
+  If our reader outpaces our consumer we pause reading from the socket, so at
+  most **STREAM_BACKLOG** chunks are buffered. Other replies and events can't
+  be read while we're paused, so we instead buffer the rest of our reply if
+  another request is sent or our consumer stalls for **STREAM_STALL_TIMEOUT**
+  seconds (for instance, if it was abandoned without being closed).
 
-    self._socket = control_socket
+  :var asyncio.Future reply: resolved with the reply (sans its streamed data)
+    once it has been fully received
+  """
 
-    self._status_listeners = []  # type: List[Tuple[Callable[[stem.control.BaseController, stem.control.State, float], None], bool]] # tuples of the form (callback, spawn_thread)
-    self._status_listeners_lock = threading.RLock()
+  def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+    self.reply = loop.create_future()  # type: asyncio.Future
 
-    # saves our socket's prior _connect() and _close() methods so they can be
-    # called along with ours
+    self._chunks = collections.deque()  # type: Deque[bytes]
+    self._is_closed = False
+    self._is_spilling = False  # buffers without pausing our reader if True
+    self._readable = asyncio.Event()
+    self._writable = asyncio.Event()
+    self._writable.set()
+
+    self.reply.add_done_callback(lambda _: self._readable.set())
+
+  async def put(self, chunk: bytes) -> None:
+    """
+    Provides a chunk of data to our consumer, waiting if it has fallen behind.
+
+    :param chunk: data that we've read
+    """
+
+    if self._is_closed:
+      return
+
+    if not self._writable.is_set():
+      try:
+        await asyncio.wait_for(self._writable.wait(), STREAM_STALL_TIMEOUT)
+      except asyncio.TimeoutError:
+        log.debug('Consumer of a streamed reply stalled, buffering the rest of it')
+        self.spill()
+
+    self._chunks.append(chunk)
+    self._readable.set()
+
+    if len(self._chunks) >= STREAM_BACKLOG and not self._is_spilling:
+      self._writable.clear()
+
+  def spill(self) -> None:
+    """
+    Buffers the rest of our reply rather than pausing our reader, so replies
+    and events behind it can be read.
+    """
+
+    self._is_spilling = True
+    self._writable.set()
+
+  async def chunks(self) -> AsyncIterator[bytes]:
+    """
+    Provides the data as it arrives.
+
+    :returns: iterates over **bytes** chunks of data
+
+    :raises: :class:`stem.ControllerError` if we don't receive further data
+      within **MSG_TIMEOUT** seconds
+    """
+
+    while True:
+      if self._chunks:
+        chunk = self._chunks.popleft()
+        self._writable.set()
+        yield chunk
+      elif self.reply.done():
+        break
+      else:
+        self._readable.clear()
+
+        try:
+          await asyncio.wait_for(self._readable.wait(), MSG_TIMEOUT)
+        except asyncio.TimeoutError:
+          self.close()
+          raise stem.ControllerError('Failed to receive a reply within %i seconds' % MSG_TIMEOUT)
+
+  def close(self) -> None:
+    """
+    Stops buffering further data, discarding the remainder of our reply.
+    """
+
+    self._is_closed = True
+    self._chunks.clear()
+    self._writable.set()
+
+    if not self.reply.done():
+      self.reply.cancel()
+
+
+class _NetworkStatusMirror(object):
+  """
+  Copy of tor's present consensus, indexed by relay fingerprint and nickname.
+
+  Updates received before we're seeded are retained, and applied on top of
+  our seed so we don't regress to an older consensus.
+  """
+
+  def __init__(self) -> None:
+    self.is_seeded = False
+
+    self._by_fingerprint = {}  # type: Dict[str, stem.descriptor.router_status_entry.RouterStatusEntryV3]
+    self._by_nickname = {}  # type: Dict[str, str] # lowercase nickname => fingerprint
+    self._pending = []  # type: List[Tuple[Sequence[stem.descriptor.router_status_entry.RouterStatusEntryV3], bool]]
+
+  def get(self, relay: str) -> Optional[stem.descriptor.router_status_entry.RouterStatusEntryV3]:
+    """
+    Provides the router status entry for a relay.
+
+    :param relay: fingerprint or nickname of the relay to be queried
+
+    :returns: :class:`~stem.descriptor.router_status_entry.RouterStatusEntryV3`
+      for the relay, or **None** if it isn't in the consensus
+    """
+
+    if stem.util.tor_tools.is_valid_fingerprint(relay):
+      return self._by_fingerprint.get(relay.upper())
+
+    fingerprint = self._by_nickname.get(relay.lower())
+    return self._by_fingerprint.get(fingerprint) if fingerprint else None
+
+  def entries(self) -> List[stem.descriptor.router_status_entry.RouterStatusEntryV3]:
+    """
+    Provides all router status entries within the consensus.
+
+    :returns: **list** of :class:`~stem.descriptor.router_status_entry.RouterStatusEntryV3`
+    """
+
+    return list(self._by_fingerprint.values())
+
+  def seed(self, entries: Sequence[stem.descriptor.router_status_entry.RouterStatusEntryV3]) -> None:
+    """
+    Populates us with a full consensus, then applies any updates we've
+    received in the meantime.
+
+    :param entries: router status entries of the consensus
+    """
+
+    self._apply(entries, True)
+
+    for pending_entries, is_consensus in self._pending:
+      self._apply(pending_entries, is_consensus)
+
+    self._pending = []
+    self.is_seeded = True
+
+  def update(self, entries: Sequence[stem.descriptor.router_status_entry.RouterStatusEntryV3], is_consensus: bool) -> None:
+    """
+    Applies router status entries from an event.
+
+    :param entries: router status entries that have changed
+    :param is_consensus: **True** if this is a new consensus, which replaces
+      all prior entries
+    """
+
+    if self.is_seeded:
+      self._apply(entries, is_consensus)
+    else:
+      self._pending.append((entries, is_consensus))
+
+  def _apply(self, entries: Sequence[stem.descriptor.router_status_entry.RouterStatusEntryV3], is_consensus: bool) -> None:
+    if is_consensus:
+      self._by_fingerprint = {}
+      self._by_nickname = {}
+
+    for entry in entries:
+      prior_entry = self._by_fingerprint.get(entry.fingerprint)
+
+      if prior_entry and prior_entry.nickname.lower() != entry.nickname.lower():
+        if self._by_nickname.get(prior_entry.nickname.lower()) == entry.fingerprint:
+          del self._by_nickname[prior_entry.nickname.lower()]
+
+      self._by_fingerprint[entry.fingerprint] = entry
+      self._by_nickname[entry.nickname.lower()] = entry.fingerprint
+
+
+class _CircuitTracker(object):
+  """
+  Tor's present circuits and streams, maintained from CIRC, CIRC_MINOR, and
+  STREAM events.
+
+  Events received before we're seeded are retained and applied on top of our
+  seed. Each event carries the full state of its circuit or stream, so those
+  that predate our seed just restate what it already has.
+  """
+
+  def __init__(self) -> None:
+    self.is_seeded = False
+
+    self._circuits = collections.OrderedDict()  # type: collections.OrderedDict[str, stem.response.events.CircuitEvent]
+    self._streams = collections.OrderedDict()  # type: collections.OrderedDict[str, stem.response.events.StreamEvent]
+    self._pending = []  # type: List[stem.response.events.Event]
+
+  def circuit(self, circuit_id: str) -> Optional[stem.response.events.CircuitEvent]:
+    """
+    Provides a circuit that's presently open or being built.
+
+    :param circuit_id: circuit to be fetched
+
+    :returns: :class:`~stem.response.events.CircuitEvent` for the circuit, or
+      **None** if it doesn't exist
+    """
+
+    return self._circuits.get(circuit_id)
+
+  def circuits(self) -> List[stem.response.events.CircuitEvent]:
+    """
+    Provides our circuits, in the order they were created.
+
+    :returns: **list** of :class:`~stem.response.events.CircuitEvent`
+    """
+
+    return list(self._circuits.values())
+
+  def streams(self) -> List[stem.response.events.StreamEvent]:
+    """
+    Provides our streams, in the order they were created.
+
+    :returns: **list** of :class:`~stem.response.events.StreamEvent`
+    """
+
+    return list(self._streams.values())
+
+  def seed(self, circuits: Sequence[stem.response.events.CircuitEvent], streams: Sequence[stem.response.events.StreamEvent]) -> None:
+    """
+    Populates us with tor's circuit and stream status, then applies any events
+    we've received in the meantime.
+
+    :param circuits: tor's present circuits
+    :param streams: tor's present streams
+    """
+
+    self._circuits = collections.OrderedDict((circ.id, circ) for circ in circuits)
+    self._streams = collections.OrderedDict((stream.id, stream) for stream in streams)
+
+    for event in self._pending:
+      self._apply(event)
+
+    self._pending = []
+    self.is_seeded = True
+
+  def update(self, event: stem.response.events.Event) -> None:
+    """
+    Applies a CIRC, CIRC_MINOR, or STREAM event.
+
+    :param event: event to be applied
+    """
+
+    if self.is_seeded:
+      self._apply(event)
+    else:
+      self._pending.append(event)
+
+  def _apply(self, event: stem.response.events.Event) -> None:
+    if isinstance(event, stem.response.events.CircuitEvent):
+      if event.status in (CircStatus.CLOSED, CircStatus.FAILED):
+        self._circuits.pop(event.id, None)
+      else:
+        self._circuits[event.id] = event
+    elif isinstance(event, stem.response.events.CircMinorEvent):
+      circ = self._circuits.get(event.id)
+
+      if circ is not None:
+        # minor events describe the circuit's present path and purpose
+
+        circ = copy.copy(circ)
+
+        for attr in ('path', 'build_flags', 'purpose', 'hs_state', 'rend_query', 'created'):
+          setattr(circ, attr, getattr(event, attr))
+
+        self._circuits[event.id] = circ
+    elif isinstance(event, stem.response.events.StreamEvent):
+      if event.status in (StreamStatus.CLOSED, StreamStatus.FAILED):
+        self._streams.pop(event.id, None)
+      else:
+        self._streams[event.id] = event
+
+
+class _ListenerQueue(object):
+  """
+  Notifies a listener of events from its own task, so it can fall behind
+  without delaying other listeners. Coroutine listeners are awaited, and other
+  listeners are called from our loop's thread pool.
+
+  Our task is started when we're first given an event, and restarted if our
+  controller's loop changes.
+
+  When coalescing, bandwidth events replace the event that's queued for their
+  circuit, stream, or connection (if any) with a new event of their summed
+  usage. This has the content of the later event (such as its time) and
+  arrived when the earlier did. Neither event is modified, so other listeners
+  are unaffected.
+
+  :var int size: maximum number of events we queue
+  :var stem.control.ListenerOverflow overflow: action taken when we're full
+  """
+
+  def __init__(self, listener: Callable[[stem.response.events.Event], Union[None, Awaitable[None]]], size: int, overflow: 'stem.control.ListenerOverflow') -> None:
+    self.size = size
+    self.overflow = overflow
+
+    self.delivered = 0
+    self.dropped = 0
+    self.coalesced = 0
+    self.lag = 0.0
+    self.max_lag = 0.0
+
+    self._listener = listener
+    self._events = collections.deque()  # type: Deque[List[Any]] # event and when it was queued
+    self._coalescing = {}  # type: Dict[Tuple[str, Optional[str]], List[Any]] # queued bandwidth events by their type and id
+    self._task = None  # type: Optional[asyncio.Task]
+    self._loop = None  # type: Optional[asyncio.AbstractEventLoop]
+    self._readable = None  # type: Optional[asyncio.Event]
+    self._writable = None  # type: Optional[asyncio.Event]
+
+  def __len__(self) -> int:
+    return len(self._events)
+
+  async def put(self, event: stem.response.events.Event) -> None:
+    """
+    Queues an event for our listener.
+
+    :param event: event to be delivered
+    """
+
+    loop = asyncio.get_event_loop()
+
+    if self._task is None or self._task.done() or self._loop is not loop:
+      self._loop = loop
+      self._readable = asyncio.Event()
+      self._writable = asyncio.Event()
+      self._task = loop.create_task(self._run())
+
+    coalesce_key = _coalesce_key(event) if self.overflow == ListenerOverflow.COALESCE else None
+
+    if coalesce_key:
+      entry = self._coalescing.get(coalesce_key)
+
+      if entry is not None:
+        entry[0] = _sum_bandwidth(entry[0], event)
+        self.coalesced += 1
+        return
+
+    if len(self._events) >= self.size:
+      if self.overflow == ListenerOverflow.BLOCK:
+        while len(self._events) >= self.size:
+          self._writable.clear()
+          await self._writable.wait()
+      elif self.overflow == ListenerOverflow.COALESCE:
+        event_type = getattr(event, 'type', None)
+        index = next((i for i, entry in enumerate(self._events) if getattr(entry[0], 'type', None) == event_type), 0)
+        self._discard(self._events[index])
+        del self._events[index]
+        self.dropped += 1
+      else:
+        self._discard(self._events.popleft())
+        self.dropped += 1
+
+    entry = [event, time.time()]
+    self._events.append(entry)
+    self._readable.set()
+
+    if coalesce_key:
+      self._coalescing[coalesce_key] = entry
+
+  async def stop(self) -> None:
+    """
+    Stops our task. Queued events are retained, and delivered if we're given
+    further events.
+    """
+
+    if self._task and not self._task.done() and self._loop is asyncio.get_event_loop():
+      self._task.cancel()
+
+      try:
+        await self._task
+      except asyncio.CancelledError:
+        pass
+
+    self._task = None
+
+  async def _run(self) -> None:
+    loop = asyncio.get_event_loop()
+
+    while True:
+      while not self._events:
+        self._readable.clear()
+        await self._readable.wait()
+
+      entry = self._events.popleft()
+      event, queued_at = entry[0], entry[1]
+      self._discard(entry)
+      self._writable.set()
+
+      self.lag = time.time() - queued_at
+      self.max_lag = max(self.max_lag, self.lag)
+
+      try:
+        if inspect.iscoroutinefunction(self._listener):
+          await self._listener(event)
+        else:
+          listener_call = await loop.run_in_executor(None, self._listener, event)
+
+          if asyncio.iscoroutine(listener_call):
+            await listener_call
+      except Exception as exc:
+        log.warn('Event listener raised an uncaught exception (%s): %s' % (exc, event))
+
+      self.delivered += 1
+
+  def _discard(self, entry: List[Any]) -> None:
+    """
+    Stops coalescing into an entry that's leaving our queue.
+    """
+
+    if self._coalescing:
+      coalesce_key = _coalesce_key(entry[0])
+
+      if coalesce_key and self._coalescing.get(coalesce_key) is entry:
+        del self._coalescing[coalesce_key]
+
+
+def _coalesce_key(event: stem.response.events.Event) -> Optional[Tuple[str, Optional[str]]]:
+  """
+  Provides the type and id that a bandwidth event is coalesced by.
+
+  :returns: **tuple** of the form (type, id), or **None** if this isn't a
+    bandwidth event
+  """
+
+  event_type = getattr(event, 'type', None)
+
+  if event_type not in COALESCED_EVENT_ATTR:
+    return None
+
+  try:
+    return (event_type, getattr(event, 'id', None))
+  except stem.ProtocolError:
+    return None  # malformed event that's lazily parsed
+
+
+def _sum_bandwidth(event: stem.response.events.Event, other: stem.response.events.Event) -> stem.response.events.Event:
+  """
+  Provides a bandwidth event with the usage of two others. This has the
+  content of the latter (such as its time) with our summed usage, and arrived
+  when the former did.
+
+  :param event: earlier event
+  :param other: later event of the same type and id
+
+  :returns: :class:`~stem.response.events.Event` with the usage of both
+  """
+
+  positional_attr = type(other)._POSITIONAL_ARGS
+  keyword_attr = dict((attr, keyword) for keyword, attr in type(other)._KEYWORD_ARGS.items())
+  args = str(other).split(' ')
+
+  for attr in COALESCED_EVENT_ATTR[event.type]:
+    value, other_value = getattr(event, attr, None), getattr(other, attr, None)
+
+    if value is None:
+      continue
+    elif attr in positional_attr:
+      args[positional_attr.index(attr) + 1] = str(value + (other_value or 0))
+    else:
+      keyword_arg = '%s=%i' % (keyword_attr[attr], value + (other_value or 0))
+      index = next((i for i, arg in enumerate(args) if arg.startswith(keyword_attr[attr] + '=')), None)
+
+      if index is None:
+        args.append(keyword_arg)
+      else:
+        args[index] = keyword_arg
+
+  return stem.response.ControlMessage.from_str('650 %s\r\n' % ' '.join(args), 'EVENT', arrived_at = event.arrived_at)  # type: ignore
+
+
+class BandwidthAggregator(object):
+  """
+  Event listener that retains bandwidth usage from **BW**, **CIRC_BW**,
+  **STREAM_BW**, and **CONN_BW** events. Samples are kept within fixed size
+  ring buffers of arrays (one per event type) rather than as event objects,
+  so hours of usage can be retained and summarized cheaply...
+
+  ::
+
+    aggregator = BandwidthAggregator()
+
+    controller.add_event_listener(
+      aggregator,
+      EventType.BW,
+      EventType.CIRC_BW,
+    )
+
+    # bytes per second over the last minute
+
+    read_rate, write_rate = aggregator.rate(EventType.BW, 60)
+
+    # circuits that transferred the most over the last minute
+
+    for circ_id, read, written in aggregator.top(EventType.CIRC_BW, 5, 60):
+      print('circuit %s: %i bytes read, %i written' % (circ_id, read, written))
+
+  Windows are measured from the most recent event of that type, in seconds.
+
+  .. versionadded:: 2.0.0
+
+  :var int size: maximum number of samples retained for each event type
+  """
+
+  def __init__(self, size: int = 65536) -> None:
+    if size < 1:
+      raise ValueError('Bandwidth aggregators must retain at least one sample, but our size was %s' % size)
+
+    self.size = size
+    self._samples = {}  # type: Dict[str, _BandwidthSamples]
+
+  def __call__(self, event: stem.response.events.Event) -> None:
+    read, written = getattr(event, 'read', None), getattr(event, 'written', None)
+
+    if read is None or written is None:
+      return  # not a bandwidth event, or lacks usage
+
+    samples = self._samples.get(event.type)
+
+    if samples is None:
+      samples = self._samples[event.type] = _BandwidthSamples(self.size)
+
+    samples.append(event.arrived_at, getattr(event, 'id', None), read, written)
+
+  def total(self, event_type: 'stem.control.EventType', window: Optional[float] = None, entry_id: Optional[str] = None) -> Tuple[int, int]:
+    """
+    Provides the bytes read and written within a window.
+
+    :param event_type: bandwidth event type to summarize
+    :param window: seconds to summarize, or all retained samples if **None**
+    :param entry_id: only include this circuit, stream, or connection
+
+    :returns: **tuple** of the form (read, written)
+    """
+
+    samples = self._samples.get(event_type)
+
+    if samples is None:
+      return (0, 0)
+
+    start, end = samples.window(window)
+
+    if entry_id is None:
+      return (samples.sum(samples.read, start, end), samples.sum(samples.written, start, end))
+
+    return samples.total(samples.id_index(entry_id), start, end)
+
+  def rate(self, event_type: 'stem.control.EventType', window: float) -> Tuple[float, float]:
+    """
+    Provides the bytes per second read and written within a window. If our
+    samples only cover part of the window (for instance, we began listening
+    more recently) then we average over the part they cover.
+
+    :param event_type: bandwidth event type to summarize
+    :param window: seconds to average over
+
+    :returns: **tuple** of the form (read_rate, write_rate)
+    """
+
+    samples = self._samples.get(event_type)
+
+    if samples is None:
+      return (0.0, 0.0)
+
+    read, written = self.total(event_type, window)
+    elapsed = samples.span(window)
+
+    return (read / elapsed, written / elapsed)
+
+  def top(self, event_type: 'stem.control.EventType', count: int = 10, window: Optional[float] = None) -> List[Tuple[str, int, int]]:
+    """
+    Provides the circuits, streams, or connections that read and wrote the
+    most bytes within a window.
+
+    :param event_type: **CIRC_BW**, **STREAM_BW**, or **CONN_BW**
+    :param count: maximum number of results to provide
+    :param window: seconds to summarize, or all retained samples if **None**
+
+    :returns: **list** of (id, read, written) tuples, from most to least total
+      bytes
+    """
+
+    samples = self._samples.get(event_type)
+
+    if samples is None:
+      return []
+
+    start, end = samples.window(window)
+    results = sorted(samples.totals(start, end).items(), key = lambda entry: entry[1][0] + entry[1][1], reverse = True)[:count]
+    return [(samples.id_value(sample_id), read, written) for sample_id, (read, written) in results]
+
+
+class _BandwidthSamples(object):
+  """
+  Ring buffer of bandwidth samples, each column of which is an array.
+
+  Identifiers are numeric for tor, so we store them as one more than their
+  value (zero is for events without one). Anything else is assigned a
+  negative index.
+
+  We also keep running totals of each identifier's retained samples, so
+  summarizing everything we retain doesn't visit each sample.
+  """
+
+  def __init__(self, size: int) -> None:
+    self.size = size
+    self.count = 0  # number of samples we've retained
+    self.start = 0  # index of our oldest sample
+
+    self.timestamps = array.array('d', bytes(8 * size))
+    self.ids = array.array('q', bytes(8 * size))
+    self.read = array.array('Q', bytes(8 * size))
+    self.written = array.array('Q', bytes(8 * size))
+
+    self._id_indices = {}  # type: Dict[str, int]
+    self._id_values = []  # type: List[str]
+    self._totals = {}  # type: Dict[int, List[int]] # id index => [read, written, samples]
+
+  def append(self, timestamp: float, entry_id: Optional[str], read: int, written: int) -> None:
+    if self.count < self.size:
+      index = (self.start + self.count) % self.size
+      self.count += 1
+    else:
+      index = self.start
+      self.start = (self.start + 1) % self.size
+
+      evicted_totals = self._totals[self.ids[index]]
+      evicted_totals[0] -= self.read[index]
+      evicted_totals[1] -= self.written[index]
+      evicted_totals[2] -= 1
+
+      if evicted_totals[2] == 0:
+        del self._totals[self.ids[index]]
+
+    id_index = self.id_index(entry_id, True)
+
+    self.timestamps[index] = timestamp
+    self.ids[index] = id_index
+    self.read[index] = read
+    self.written[index] = written
+
+    entry_totals = self._totals.get(id_index)
+
+    if entry_totals is None:
+      self._totals[id_index] = [read, written, 1]
+    else:
+      entry_totals[0] += read
+      entry_totals[1] += written
+      entry_totals[2] += 1
+
+  def id_index(self, entry_id: Optional[str], add: bool = False) -> int:
+    if entry_id is None:
+      return 0
+    elif entry_id.isdigit() and len(entry_id) < 18:
+      return int(entry_id) + 1
+
+    index = self._id_indices.get(entry_id)
+
+    if index is None:
+      if not add:
+        return -1 - len(self._id_values)  # unused index
+
+      self._id_values.append(entry_id)
+      index = self._id_indices[entry_id] = -len(self._id_values)
+
+    return index
+
+  def id_value(self, index: int) -> Optional[str]:
+    if index == 0:
+      return None
+    elif index > 0:
+      return str(index - 1)
+    else:
+      return self._id_values[-1 - index]
+
+  def window(self, seconds: Optional[float]) -> Tuple[int, int]:
+    """
+    Provides the logical range of samples within the given number of seconds
+    of our newest sample.
+    """
+
+    if seconds is None or self.count == 0:
+      return (0, self.count)
+
+    # Our samples are in chronological order within each of our physical
+    # slices, so we can bisect whichever contains the start of our window.
+
+    end = (self.start + self.count) % self.size or self.size
+    cutoff = self.timestamps[end - 1] - seconds
+
+    if end > self.start:
+      return (bisect.bisect_right(self.timestamps, cutoff, self.start, end) - self.start, self.count)
+    elif self.timestamps[self.size - 1] > cutoff:
+      return (bisect.bisect_right(self.timestamps, cutoff, self.start, self.size) - self.start, self.count)
+    else:
+      return (self.size - self.start + bisect.bisect_right(self.timestamps, cutoff, 0, end), self.count)
+
+  def span(self, seconds: float) -> float:
+    """
+    Provides the number of seconds within a window that our samples cover.
+    Each sample reports usage since the one before it, so if our samples begin
+    within the window we estimate the first's interval from their spacing.
+    """
+
+    start, end = self.window(seconds)
+
+    if start > 0 or end - start < 2:
+      return seconds  # we have usage preceding the window, or can't tell
+
+    oldest, newest = self.timestamps[self.start], self.timestamps[(self.start + end - 1) % self.size]
+    covered = (newest - oldest) * (end - start) / (end - start - 1)
+
+    return min(seconds, covered) if covered > 0 else seconds
+
+  def slices(self, column: array.array, start: int, end: int) -> List[array.array]:
+    """
+    Provides the physical slices of a column for a logical range.
+    """
+
+    if start >= end:
+      return []
+
+    physical_start, physical_end = (self.start + start) % self.size, (self.start + end) % self.size
+
+    if physical_start < physical_end:
+      return [column[physical_start:physical_end]]
+    else:
+      return [column[physical_start:], column[:physical_end]]
+
+  def column(self, column: array.array, start: int, end: int) -> array.array:
+    """
+    Provides a column's values for a logical range.
+    """
+
+    slices = self.slices(column, start, end)
+
+    if not slices:
+      return array.array(column.typecode)
+    elif len(slices) == 1:
+      return slices[0]
+    else:
+      return slices[0] + slices[1]
+
+  def sum(self, column: array.array, start: int, end: int) -> int:
+    return sum(sum(column_slice) for column_slice in self.slices(column, start, end))
+
+  def total(self, entry_index: int, start: int, end: int) -> Tuple[int, int]:
+    """
+    Provides the bytes read and written by an identifier within a logical
+    range. Like :func:`~stem.control._BandwidthSamples.totals` this visits
+    whichever samples are fewer, selecting the identifier's per column.
+    """
+
+    if end - start <= self.count // 2:
+      read, written = 0, 0
+      ranges, sign = [(start, end)], 1
+    else:
+      read, written = self._totals.get(entry_index, (0, 0, 0))[:2]
+      ranges, sign = [(0, start), (end, self.count)], -1
+
+    for range_start, range_end in ranges:
+      for ids, read_slice, written_slice in zip(self.slices(self.ids, range_start, range_end), self.slices(self.read, range_start, range_end), self.slices(self.written, range_start, range_end)):
+        read += sign * sum(itertools.compress(read_slice, map(operator.eq, ids, itertools.repeat(entry_index))))
+        written += sign * sum(itertools.compress(written_slice, map(operator.eq, ids, itertools.repeat(entry_index))))
+
+    return (read, written)
+
+  def totals(self, start: int, end: int) -> Dict[int, List[int]]:
+    """
+    Provides the bytes read and written by each identifier within a logical
+    range. This starts with our running totals and visits whichever is fewer:
+    the samples within our range, or those outside it.
+    """
+
+    if end - start <= self.count // 2:
+      totals = {}  # type: Dict[int, List[int]]
+      ranges, sign = [(start, end)], 1
+    else:
+      totals = dict((id_index, list(entry_totals)) for id_index, entry_totals in self._totals.items())
+      ranges, sign = [(0, start), (end, self.count)], -1
+
+    for range_start, range_end in ranges:
+      for sample_id, read, written in zip(self.column(self.ids, range_start, range_end), self.column(self.read, range_start, range_end), self.column(self.written, range_start, range_end)):
+        entry_totals = totals.get(sample_id)
+
+        if entry_totals is None:
+          totals[sample_id] = [read, written, 1]
+        else:
+          entry_totals[0] += sign * read
+          entry_totals[1] += sign * written
+          entry_totals[2] += sign
+
+    return dict((sample_id, entry_totals[:2]) for sample_id, entry_totals in totals.items() if entry_totals[2])
+
+
+class StreamAttacher(object):
+  """
+  Picks the circuits that new streams are attached to. Once provided to
+  :func:`~stem.control.Controller.set_stream_attacher` tor leaves streams for
+  us to attach, and we do so as soon as we're notified of them...
+
+  ::
+
+    attacher = StreamAttacher()
+    attacher.add_route(circuit_id, port = 443)
+    attacher.add_route(onion_circuit_id, address = 'example.onion')
+
+    controller.set_stream_attacher(attacher)
+
+  Routes are precomputed, so picking a circuit is a dictionary lookup. We
+  match a stream's target by its address and port, then address, then port,
+  then the route that has neither. Streams that match none are given to our
+  **chooser**, and if it doesn't provide a circuit tor picks one. Routes to
+  circuits that close are removed.
+
+  .. versionadded:: 2.0.0
+
+  :var function chooser: callback given the
+    :class:`~stem.response.events.StreamEvent` of streams that don't match a
+    route, which provides the circuit id to attach them to or **None** to let
+    tor pick
+  :var int attached: number of streams we've attached
+  :var int failed: number of streams we were unable to attach to the circuit
+    we picked
+  :var int size: number of recent attachments we retain the latency of
+  """
+
+  def __init__(self, chooser: Optional[Callable[[stem.response.events.StreamEvent], Optional[str]]] = None, size: int = 10000) -> None:
+    self.chooser = chooser
+    self.size = size
+    self.attached = 0
+    self.failed = 0
+
+    self._routes = {}  # type: Dict[Tuple[Optional[str], Optional[int]], str] # (address, port) => circuit id
+    self._latencies = collections.deque(maxlen = size)  # type: Deque[float]
+
+  def add_route(self, circuit_id: str, address: Optional[str] = None, port: Optional[int] = None) -> None:
+    """
+    Attaches streams to the given address and port to a circuit. Either can be
+    omitted to match any address or port, and if both are the circuit is used
+    for streams that don't match another route.
+
+    :param circuit_id: circuit to attach the streams to
+    :param address: target address of the streams
+    :param port: target port of the streams
+    """
+
+    self._routes[(address.lower() if address else None, int(port) if port else None)] = str(circuit_id)
+
+  def remove_route(self, address: Optional[str] = None, port: Optional[int] = None) -> None:
+    """
+    Stops attaching streams to the given address and port to the circuit we
+    were provided. This is a no-op if we lack such a route.
+
+    :param address: target address of the streams
+    :param port: target port of the streams
+    """
+
+    self._routes.pop((address.lower() if address else None, int(port) if port else None), None)
+
+  def remove_circuit(self, circuit_id: str) -> None:
+    """
+    Removes all routes to a circuit.
+
+    :param circuit_id: circuit to stop attaching streams to
+    """
+
+    circuit_id = str(circuit_id)
+
+    for key in [key for key, route_circuit in self._routes.items() if route_circuit == circuit_id]:
+      del self._routes[key]
+
+  def choose(self, stream: stem.response.events.StreamEvent) -> Optional[str]:
+    """
+    Provides the circuit a stream should be attached to.
+
+    :param stream: stream to be attached
+
+    :returns: **str** with the circuit id to attach the stream to, or **None**
+      if tor should pick one
+    """
+
+    routes = self._routes
+
+    if routes:
+      address = stream.target_address.lower() if stream.target_address else None
+      port = stream.target_port
+
+      circuit_id = routes.get((address, port)) or routes.get((address, None)) or routes.get((None, port)) or routes.get((None, None))
+
+      if circuit_id is not None:
+        return circuit_id
+
+    return self.chooser(stream) if self.chooser else None
+
+  def latency(self, *percentiles: float) -> List[float]:
+    """
+    Provides percentiles for how long we've taken to attach our recent
+    streams, from when we're notified of the stream until tor acknowledges
+    that it's attached.
+
+    :param percentiles: percentiles to provide, by default the 50th, 90th,
+      and 99th
+
+    :returns: **list** with the seconds of each percentile, which are zero if
+      we haven't attached a stream
+    """
+
+    if not percentiles:
+      percentiles = (50, 90, 99)
+
+    latencies = sorted(self._latencies)
+
+    if not latencies:
+      return [0.0] * len(percentiles)
+
+    return [latencies[min(len(latencies) - 1, int(len(latencies) * percentile / 100.0))] for percentile in percentiles]
+
+
+class EventRecorder(object):
+  """
+  Appends the raw content of events to a file, along with when they arrived,
+  so they can later be replayed without tor. Once provided to
+  :func:`~stem.control.BaseController.set_event_recorder` we record events as
+  they're read from our socket...
+
+  ::
+
+    with EventRecorder('/tmp/events') as recorder:
+      controller.set_event_recorder(recorder)
+      controller.add_event_listener(my_listener, EventType.CIRC, EventType.BW)
+      time.sleep(60)
+      controller.set_event_recorder(None)
+
+    # later, without tor...
+
+    controller = Controller(stem.socket.ControlSocket())
+    controller.add_event_listener(my_listener, EventType.CIRC, EventType.BW)
+    controller.replay_events('/tmp/events', speed = 10)
+
+  Recordings are only appended to, so a recording can span several sessions.
+  If a prior session ended while writing an event we discard its partial
+  content before appending.
+
+  .. versionadded:: 2.0.0
+
+  :var str path: file we record to
+  :var int count: number of events we've recorded
+
+  :raises:
+    * **ValueError** if the file exists but isn't an event recording
+    * **OSError** if unable to open the file
+  """
+
+  def __init__(self, path: str) -> None:
+    self.path = path
+    self.count = 0
+
+    self._file = open(path, 'ab+')
+    size = self._file.seek(0, io.SEEK_END)
+
+    if size == 0:
+      self._file.write(EVENT_RECORDING_HEADER)
+      return
+
+    self._file.seek(0)
+
+    if self._file.read(len(EVENT_RECORDING_HEADER)) != EVENT_RECORDING_HEADER:
+      self._file.close()
+      raise ValueError("%s isn't an event recording" % path)
+
+    # skip to the end of our last complete event
+
+    position = len(EVENT_RECORDING_HEADER)
+
+    while position + EVENT_RECORD.size <= size:
+      self._file.seek(position)
+      record_end = position + EVENT_RECORD.size + EVENT_RECORD.unpack(self._file.read(EVENT_RECORD.size))[1]
+
+      if record_end > size:
+        break
+
+      position = record_end
+
+    if position < size:
+      log.info('%s ended with a partially written event, discarding its last %i bytes' % (path, size - position))
+      self._file.truncate(position)
+
+  def record(self, event_message: stem.response.ControlMessage, arrived_at: Optional[float] = None) -> None:
+    """
+    Appends an event to our recording.
+
+    :param event_message: event to be recorded
+    :param arrived_at: unix timestamp when the event arrived, the message's
+      if **None**
+    """
+
+    raw_content = event_message.raw_content(get_bytes = True)
+
+    self._file.write(EVENT_RECORD.pack(arrived_at if arrived_at is not None else event_message.arrived_at, len(raw_content)))
+    self._file.write(raw_content)
+    self.count += 1
+
+  def close(self) -> None:
+    """
+    Flushes and closes our file.
+    """
+
+    self._file.close()
+
+  def __enter__(self) -> 'stem.control.EventRecorder':
+    return self
+
+  def __exit__(self, exit_type: Optional[Type[BaseException]], value: Optional[BaseException], traceback: Optional[TracebackType]) -> None:
+    self.close()
+
+
+def with_default(yields: bool = False) -> Callable:
+  """
+  Provides a decorator to support having a default value. This should be
+  treated as private.
+  """
+
+  def decorator(func: Callable) -> Callable:
+    def get_default(func: Callable, args: Any, kwargs: Any) -> Any:
+      arg_names = inspect.getfullargspec(func).args[1:]  # drop 'self'
+      default_position = arg_names.index('default') if 'default' in arg_names else None
+
+      if default_position is not None and default_position < len(args):
+        return args[default_position]
+      else:
+        return kwargs.get('default', UNDEFINED)
+
+    if asyncio.iscoroutinefunction(func) and not yields:
+      @functools.wraps(func)
+      async def wrapped(self, *args: Any, **kwargs: Any) -> Any:
+        try:
+          return await func(self, *args, **kwargs)
+        except:
+          default = get_default(func, args, kwargs)
+
+          if default == UNDEFINED:
+            raise
+          else:
+            return default
+    elif inspect.isasyncgenfunction(func) and yields:
+      @functools.wraps(func)
+      async def wrapped(self, *args: Any, **kwargs: Any) -> Any:
+        try:
+          async for val in func(self, *args, **kwargs):
+            yield val
+        except:
+          default = get_default(func, args, kwargs)
+
+          if default == UNDEFINED:
+            raise
+          else:
+            if default is not None:
+              for val in default:
+                yield val
+    elif not yields:
+      @functools.wraps(func)
+      def wrapped(self, *args: Any, **kwargs: Any) -> Any:
+        try:
+          return func(self, *args, **kwargs)
+        except:
+          default = get_default(func, args, kwargs)
+
+          if default == UNDEFINED:
+            raise
+          else:
+            return default
+    else:
+      @functools.wraps(func)
+      def wrapped(self, *args: Any, **kwargs: Any) -> Any:
+        try:
+          for val in func(self, *args, **kwargs):
+            yield val
+        except:
+          default = get_default(func, args, kwargs)
+
+          if default == UNDEFINED:
+            raise
+          else:
+            if default is not None:
+              for val in default:
+                yield val
+
+    return wrapped
+
+  return decorator
+
+
+def event_description(event: str) -> str:
+  """
+  Provides a description for Tor events.
+
+  :param event: the event for which a description is needed
+
+  :returns: **str** The event description or **None** if this is an event name
+    we don't have a description for
+  """
+
+  global EVENT_DESCRIPTIONS
+
+  if EVENT_DESCRIPTIONS is None:
+    config = stem.util.conf.Config()
+    config_path = os.path.join(os.path.dirname(__file__), 'settings.cfg')
+
+    try:
+      config.load(config_path)
+      EVENT_DESCRIPTIONS = dict([(key.lower()[18:], config.get_value(key)) for key in config.keys() if key.startswith('event.description.')])  # type: ignore
+    except Exception as exc:
+      log.warn("BUG: stem failed to load its internal manual information from '%s': %s" % (config_path, exc))
+      return None
+
+  return EVENT_DESCRIPTIONS.get(event.lower())
+
+
+def read_recorded_events(path: str) -> Iterator[Tuple[float, stem.response.ControlMessage]]:
+  """
+  Provides the events within a recording made by an
+  :class:`~stem.control.EventRecorder`. If the recording ends with a partially
+  written event it's ignored.
+
+  .. versionadded:: 2.0.0
+
+  :param path: recording to be read
+
+  :returns: iterates over (arrived_at, :class:`~stem.response.ControlMessage`)
+    tuples, in the order they were recorded
+
+  :raises:
+    * **ValueError** if the file isn't an event recording
+    * **OSError** if unable to read the file
+  """
+
+  with open(path, 'rb') as recording:
+    if recording.read(len(EVENT_RECORDING_HEADER)) != EVENT_RECORDING_HEADER:
+      raise ValueError("%s isn't an event recording" % path)
+
+    while True:
+      record = recording.read(EVENT_RECORD.size)
+
+      if len(record) < EVENT_RECORD.size:
+        break
+
+      arrived_at, content_length = EVENT_RECORD.unpack(record)
+      raw_content = recording.read(content_length)
+
+      if len(raw_content) < content_length:
+        break
+
+      yield arrived_at, stem.socket.recv_message_from_bytes_io(io.BytesIO(raw_content), arrived_at = arrived_at)
+
+
+class BaseController(Synchronous):
+  """
+  Controller for the tor process. This is a minimal base class for other
+  controllers, providing basic process communication and event listing. Don't
+  use this directly - subclasses like the :class:`~stem.control.Controller`
+  provide higher level functionality.
+
+  It's highly suggested that you don't interact directly with the
+  :class:`~stem.socket.ControlSocket` that we're constructed from - use our
+  wrapper methods instead.
+
+  If the **control_socket** is already authenticated to Tor then the caller
+  should provide the **is_authenticated** flag. Otherwise, we will treat the
+  socket as though it hasn't yet been authenticated.
+  """
+
+  def __init__(self, control_socket: stem.socket.ControlSocket, is_authenticated: bool = False) -> None:
+    super(BaseController, self).__init__()
+
+    self._socket = control_socket
+
+    self._status_listeners = []  # type: List[Tuple[Callable[[stem.control.BaseController, stem.control.State, float], None], bool]] # tuples of the form (callback, spawn_thread)
+    self._status_listeners_lock = threading.RLock()
+
+    # saves our socket's prior _connect() and _close() methods so they can be
+    # called along with ours
+
+    self._socket_connect = self._socket._connect
+    self._socket_close = self._socket._close
+
+    self._socket._connect = self._connect  # type: ignore
+    self._socket._close = self._close  # type: ignore
+
+    self._last_heartbeat = 0.0  # timestamp for when we last heard from tor
+    self._is_authenticated = False
+
+    # Futures for requests that are awaiting a reply. Tor answers requests in
+    # the order they're received so these are resolved in order. None means
+    # the reply belongs to a msg() call that awaits our reply queue.
+
+    self._is_pipelining_enabled = False
+    self._reply_futures = collections.deque()  # type: Deque[Optional[asyncio.Future]]
+    self._reply_streams = {}  # type: Dict[asyncio.Future, _ReplyStream] # reply futures whose data we stream
+
+    # Measurements of our requests and events when enabled. Each reply future
+    # is paired with its request and when it was made and sent, or None if we
+    # weren't measuring at the time.
+
+    self._metrics = None  # type: Optional[_Metrics]
+    self._metrics_listeners = []  # type: List[Callable[[stem.control.RequestMetrics], None]]
+    self._reply_metrics = collections.deque()  # type: Deque[Optional[Tuple[str, float, float]]]
+
+    # Bounds for our event queue, and how far our listeners have fallen behind.
+
+    self._event_queue_size = None  # type: Optional[int]
+    self._event_queue_overflow = EventQueueOverflow.PAUSE_READING
+    self._event_queue_depth = 0  # events within our queue
+    self._event_queue_oldest = None  # type: Optional[float] # when the oldest event our listeners haven't finished with was queued
+    self._events_received = 0
+    self._events_dropped = 0
+    self._event_reads_paused = 0
+    self._event_max_lag = 0.0
+    self._event_recorder = None  # type: Optional[EventRecorder]
+
+    self._state_change_threads = []  # type: List[threading.Thread] # threads we've spawned to notify of state changes
+
+    self._reader_loop_task = None  # type: Optional[asyncio.Task]
+    self._event_loop_task = None  # type: Optional[asyncio.Task]
+
+    if self._socket.is_alive():
+      self._create_loop_tasks()
+
+    if is_authenticated:
+      self._loop.create_task(self._post_authentication())
+
+  def __ainit__(self) -> None:
+    self._msg_lock = asyncio.Lock()
+    self._write_lock = asyncio.Lock()  # held while registering a request's reply and sending it
+
+    # queues where incoming messages are directed
+
+    self._reply_queue = asyncio.Queue()  # type: asyncio.Queue[Union[stem.response.ControlMessage, stem.ControllerError]]
+    self._event_queue = asyncio.Queue()  # type: asyncio.Queue[Optional[Tuple[stem.response.ControlMessage, float]]] # events and when they were queued, None wakes our event loop
+    self._event_queue_writable = asyncio.Event()  # set when a paused reader should check if it can resume
+
+  async def msg(self, message: str) -> stem.response.ControlMessage:
+    """
+    Sends a message to our control socket and provides back its reply.
+
+    :param message: message to be formatted and sent to tor
+
+    :returns: :class:`~stem.response.ControlMessage` with the response
+
+    :raises:
+      * :class:`stem.ProtocolError` the content from the socket is
+        malformed
+      * :class:`stem.SocketError` if a problem arises in using the
+        socket
+      * :class:`stem.SocketClosed` if the socket is shut down
+    """
+
+    if self._is_pipelining_enabled:
+      return await self._msg_pipelined(message)
+
+    called_at = time.time()
+
+    async with self._msg_lock:
+      # If our _reply_queue isn't empty then one of a few things happened...
+      #
+      # - Our connection was closed and probably re-restablished. This was
+      #   in reply to pulling for an asynchronous event and getting this is
+      #   expected - ignore it.
+      #
+      # - Pulling for asynchronous events produced an error. If this was a
+      #   ProtocolError then it's a tor bug, and if a non-closure SocketError
+      #   then it was probably a socket glitch. Deserves an INFO level log
+      #   message.
+      #
+      # - This is a leftover response for a msg() call. We can't tell who an
+      #   exception was earmarked for, so we only know that this was the case
+      #   if it's a ControlMessage.
+      #
+      #   This is the most concerning situation since it indicates that one of
+      #   our callers didn't get their reply. However, this is still a
+      #   perfectly viable use case. For instance...
+      #
+      #   1. We send a request.
+      #   2. The reader thread encounters an exception, for instance a socket
+      #      error. We enqueue the exception.
+      #   3. The reader thread receives the reply.
+      #   4. We raise the socket error, and have an undelivered message.
+      #
+      #   Thankfully this only seems to arise in edge cases around rapidly
+      #   closing/reconnecting the socket.
+
+      while not self._reply_queue.empty():
+        try:
+          response = self._reply_queue.get_nowait()
+
+          if isinstance(response, stem.SocketClosed):
+            pass  # this is fine
+          elif isinstance(response, stem.ProtocolError):
+            log.info('Tor provided a malformed message (%s)' % response)
+          elif isinstance(response, stem.ControllerError):
+            log.info('Socket experienced a problem (%s)' % response)
+          elif isinstance(response, stem.response.ControlMessage):
+            log.info('Failed to deliver a response: %s' % response)
+        except asyncio.QueueEmpty:
+          # the empty() method is documented to not be fully reliable so this
+          # isn't entirely surprising
+
+          break
+
+      try:
+        await self._send_request(message, None, called_at)
+
+        try:
+          response = await asyncio.wait_for(self._reply_queue.get(), MSG_TIMEOUT)
+        except asyncio.TimeoutError:
+          raise stem.ControllerError('%s failed to receive a reply within %i seconds' % (message, MSG_TIMEOUT))
+
+        # If the message we received back had an exception then re-raise it to the
+        # caller. Otherwise return the response.
+
+        if isinstance(response, stem.ControllerError):
+          raise response
+        else:
+          return response
+      except stem.SocketClosed:
+        # If the recv() thread caused the SocketClosed then we could still be
+        # in the process of closing. Calling close() here so that we can
+        # provide an assurance to the caller that when we raise a SocketClosed
+        # exception we are shut down afterward for realz.
+
+        await self.close()
+        raise
+
+  async def _msg_pipelined(self, message: str, immediate: bool = False) -> stem.response.ControlMessage:
+    """
+    Pipelined counterpart of :func:`~stem.control.BaseController.msg`. Our
+    lock is only held while writing the request, so other callers can send
+    theirs while we await our reply.
+
+    Immediate requests don't wait for our lock at all, so they're sent even
+    while a msg() call awaits its reply. This is for requests that shouldn't be
+    delayed (such as attaching streams) and needn't be ordered among others.
+
+    :param message: message to be formatted and sent to tor
+    :param immediate: sends without waiting behind other requests if **True**
+    """
+
+    reply = self._loop.create_future()  # type: asyncio.Future
+    called_at = time.time()
+
+    try:
+      if immediate:
+        await self._send_request(message, reply, called_at)
+      else:
+        async with self._msg_lock:
+          await self._send_request(message, reply, called_at)
+
+      try:
+        return await asyncio.wait_for(reply, MSG_TIMEOUT)
+      except asyncio.TimeoutError:
+        # Our future remains enqueued so when tor eventually replies it's
+        # consumed in our place rather than being given to the next caller.
+
+        raise stem.ControllerError('%s failed to receive a reply within %i seconds' % (message, MSG_TIMEOUT))
+    except stem.SocketClosed:
+      await self.close()
+      raise
+
+  async def _msg_streamed(self, message: str) -> _ReplyStream:
+    """
+    Sends a message, providing its reply's data block as it's read from the
+    socket rather than buffering it in memory. Callers should either consume
+    the stream or close it, otherwise its remaining data is buffered.
+
+    :param message: message to be formatted and sent to tor
+
+    :returns: **_ReplyStream** for the reply
+
+    :raises:
+      * :class:`stem.SocketError` if a problem arises in using the socket
+      * :class:`stem.SocketClosed` if the socket is shut down
+    """
+
+    reply_stream = _ReplyStream(self._loop)
+    called_at = time.time()
+
+    try:
+      async with self._msg_lock:
+        self._reply_streams[reply_stream.reply] = reply_stream
+
+        try:
+          await self._send_request(message, reply_stream.reply, called_at)
+        except:
+          del self._reply_streams[reply_stream.reply]
+          raise
+    except stem.SocketClosed:
+      await self.close()
+      raise
+
+    return reply_stream
+
+  async def _send_request(self, message: str, reply: Optional[asyncio.Future], called_at: Optional[float] = None) -> None:
+    """
+    Sends a request to tor, registering where its reply should be delivered.
+    Registering and sending are atomic so the order of our futures matches the
+    order tor receives our requests. If our reader is paused it resumes so the
+    reply can be read.
+
+    :param message: message to be formatted and sent to tor
+    :param reply: future for the reply, or **None** if it should be delivered
+      to our reply queue
+    :param called_at: unix timestamp when our caller made the request
+    """
+
+    async with self._write_lock:
+      # our reply is read after any streamed replies ahead of it, so they can
+      # no longer pause our reader
+
+      for reply_stream in self._reply_streams.values():
+        if reply_stream.reply is not reply:
+          reply_stream.spill()
+
+      sent_at = time.time()
+      self._reply_futures.append(reply)
+      self._reply_metrics.append((message, called_at if called_at else sent_at, sent_at) if self._metrics is not None else None)
+
+      try:
+        await self._socket.send(message)
+      except:
+        # we hold the write lock so our future is last, unless closing our
+        # socket has already discarded it
+
+        if self._reply_futures and self._reply_futures[-1] is reply:
+          self._reply_futures.pop()
+          self._reply_metrics.pop()
+
+        raise
+
+    self._event_queue_writable.set()
+
+  def is_pipelining_enabled(self) -> bool:
+    """
+    **True** if pipelining has been enabled, **False** otherwise.
+
+    .. versionadded:: 2.0.0
+
+    :returns: bool to indicate if pipelining is enabled
+    """
+
+    return self._is_pipelining_enabled
+
+  def set_pipelining(self, enabled: bool) -> None:
+    """
+    Enables or disables pipelining of our requests. By default
+    :func:`~stem.control.BaseController.msg` sends a request and awaits its
+    reply before the next request can be sent. When pipelined requests are
+    written as soon as they're made, and replies are matched with callers in
+    the order tor provides them.
+
+    This only benefits callers that make concurrent requests (for instance,
+    from several asyncio tasks).
+
+    .. versionadded:: 2.0.0
+
+    :param enabled: **True** to enable pipelining, **False** to disable it
+    """
+
+    self._is_pipelining_enabled = enabled
+
+  def is_metrics_enabled(self) -> bool:
+    """
+    **True** if we're measuring our requests and events, **False** otherwise.
+
+    .. versionadded:: 2.0.0
+
+    :returns: bool to indicate if metrics are enabled
+    """
+
+    return self._metrics is not None
+
+  def set_metrics(self, enabled: bool) -> None:
+    """
+    Enables or disables measuring our requests and events. While enabled we
+    count the requests we make by their command, including the size of their
+    replies and how long they took. Latency is split between how long a
+    request waited behind others before we sent it, and tor's round trip.
+
+    Enabling this starts fresh measurements, and disabling it discards them.
+
+    .. versionadded:: 2.0.0
+
+    :param enabled: **True** to measure our requests and events, **False**
+      otherwise
+    """
+
+    self._metrics = _Metrics() if enabled else None
+
+  def get_metrics(self) -> Optional[Dict[str, Any]]:
+    """
+    Provides the latency and throughput of our requests and events since
+    metrics were enabled. This is a dictionary of the form...
+
+    ::
+
+      {
+        'since': 1600000000.0,     # unix timestamp when we started measuring
+        'bytes_sent': 1024,        # size of our requests
+        'bytes_received': 65536,   # size of our replies and events
+        'commands': {
+          'GETINFO': {
+            'count': 12,           # requests we've made
+            'errors': 1,           # requests that tor rejected or that failed
+            'bytes_sent': 300,
+            'bytes_received': 60000,
+            'max_reply_size': 50000,
+            'rate': 0.4,           # requests per second
+            'queue_wait': {        # seconds waiting to be sent
+              'count': 12,
+              'mean': 0.0001,
+              'max': 0.0005,
+              'buckets': [(0.001, 12), (0.0025, 0), ..., (inf, 0)],
+            },
+            'round_trip': {...},   # seconds from being sent until its reply was read
+          },
+        },
+        'events': {
+          'BW': {
+            'count': 30,           # events received
+            'bytes': 480,
+            'rate': 1.0,           # events per second
+          },
+        },
+      }
+
+    Histogram buckets are pairs of the form (upper bound, count), with bounds
+    from **LATENCY_BUCKETS**.
+
+    .. versionadded:: 2.0.0
+
+    :returns: **dict** with our measurements, or **None** if metrics aren't
+      enabled
+    """
+
+    metrics = self._metrics
+    return metrics.snapshot() if metrics else None
+
+  def add_metrics_listener(self, listener: Callable[['stem.control.RequestMetrics'], None]) -> None:
+    """
+    Notifies a callback with the measurements of each request we make while
+    metrics are enabled. Listeners are called from our event loop as replies
+    are read, so they should be quick.
+
+    .. versionadded:: 2.0.0
+
+    :param listener: function to be called with
+      :class:`~stem.control.RequestMetrics`
+    """
+
+    self._metrics_listeners.append(listener)
+
+  def remove_metrics_listener(self, listener: Callable[['stem.control.RequestMetrics'], None]) -> bool:
+    """
+    Stops a listener from being notified of our requests.
+
+    .. versionadded:: 2.0.0
+
+    :param listener: function to be removed
+
+    :returns: **True** if we removed one or more occurrences of the listener,
+      **False** otherwise
+    """
+
+    listeners = [entry for entry in self._metrics_listeners if entry != listener]
+    is_changed = len(listeners) != len(self._metrics_listeners)
+    self._metrics_listeners = listeners
+
+    return is_changed
+
+  def set_event_queue_limit(self, size: Optional[int], overflow: 'stem.control.EventQueueOverflow' = EventQueueOverflow.PAUSE_READING) -> None:
+    """
+    Bounds how many events we buffer for our listeners. By default events are
+    read from the socket as soon as they arrive and queued until our listeners
+    are notified, so slow listeners cause this queue to grow without bound.
+
+    With **PAUSE_READING** we stop reading from the socket while the queue is
+    full, so tor buffers further events instead. Replies share our socket, so
+    we continue reading while a request awaits its reply. This lets listeners
+    issue requests, but the queue can briefly exceed its limit.
+
+    .. versionadded:: 2.0.0
+
+    :param size: maximum number of queued events, or **None** to not limit
+      our queue
+    :param overflow: :data:`~stem.control.EventQueueOverflow` action to take
+      when an event arrives and our queue is full
+
+    :raises: **ValueError** if the size isn't positive
+    """
+
+    if size is not None and size < 1:
+      raise ValueError('Event queue size must be positive, but was %s' % size)
+
+    self._event_queue_size = size
+    self._event_queue_overflow = overflow
+    self._loop.call_soon_threadsafe(self._event_queue_writable.set)
+
+  def get_event_queue_stats(self) -> 'stem.control.EventQueueStats':
+    """
+    Provides the backlog of events awaiting our listeners.
+
+    .. versionadded:: 2.0.0
+
+    :returns: :class:`~stem.control.EventQueueStats` for our event queue
+    """
 
-    self._socket_connect = self._socket._connect
-    self._socket_close = self._socket._close
+    # Our event loop updates these, so read each once rather than walking
+    # the queue it's modifying.
 
-    self._socket._connect = self._connect  # type: ignore
-    self._socket._close = self._close  # type: ignore
+    queued, oldest = self._event_queue_depth, self._event_queue_oldest
+    lag = max(0.0, time.time() - oldest) if oldest is not None else 0.0
 
-    self._last_heartbeat = 0.0  # timestamp for when we last heard from tor
-    self._is_authenticated = False
+    return EventQueueStats(queued, self._events_received, self._events_dropped, self._event_reads_paused, lag, max(lag, self._event_max_lag))
 
-    self._state_change_threads = []  # type: List[threading.Thread] # threads we've spawned to notify of state changes
+  def get_event_recorder(self) -> Optional['stem.control.EventRecorder']:
+    """
+    Provides the recorder we write events to.
 
-    self._reader_loop_task = None  # type: Optional[asyncio.Task]
-    self._event_loop_task = None  # type: Optional[asyncio.Task]
+    .. versionadded:: 2.0.0
 
-    if self._socket.is_alive():
-      self._create_loop_tasks()
+    :returns: :class:`~stem.control.EventRecorder` we record events with, or
+      **None** if we aren't recording
+    """
 
-    if is_authenticated:
-      self._loop.create_task(self._post_authentication())
+    return self._event_recorder
 
-  def __ainit__(self) -> None:
-    self._msg_lock = asyncio.Lock()
+  def set_event_recorder(self, recorder: Optional['stem.control.EventRecorder']) -> None:
+    """
+    Records the events we read from our socket, including those nobody
+    listens for (such as ones subscribed to by other controllers). Recorders
+    belong to the caller, so they should close them when done.
 
-    # queues where incoming messages are directed
+    .. versionadded:: 2.0.0
 
-    self._reply_queue = asyncio.Queue()  # type: asyncio.Queue[Union[stem.response.ControlMessage, stem.ControllerError]]
-    self._event_queue = asyncio.Queue()  # type: asyncio.Queue[stem.response.ControlMessage]
+    :param recorder: :class:`~stem.control.EventRecorder` to record events
+      with, or **None** to stop recording
+    """
 
-    self._event_notice = asyncio.Event()
+    self._event_recorder = recorder
 
-  async def msg(self, message: str) -> stem.response.ControlMessage:
+  async def replay_events(self, path: str, speed: Optional[float] = 1.0) -> int:
     """
-    Sends a message to our control socket and provides back its reply.
+    Provides recorded events to our listeners, just as if they'd been read
+    from our socket. This doesn't need a connection to tor, so it can be used
+    to reproduce the traffic of a prior session or benchmark our listeners.
 
-    :param message: message to be formatted and sent to tor
+    .. versionadded:: 2.0.0
 
-    :returns: :class:`~stem.response.ControlMessage` with the response
+    :param path: recording made by an :class:`~stem.control.EventRecorder`
+    :param speed: multiple of the original pace to replay events at (two is
+      twice as fast), or **None** to replay them as fast as our listeners
+      can handle
+
+    :returns: **int** for the number of events we replayed
 
     :raises:
-      * :class:`stem.ProtocolError` the content from the socket is
-        malformed
-      * :class:`stem.SocketError` if a problem arises in using the
-        socket
-      * :class:`stem.SocketClosed` if the socket is shut down
+      * **ValueError** if the file isn't an event recording or our speed isn't
+        positive
+      * **OSError** if unable to read the file
     """
 
-    async with self._msg_lock:
-      # If our _reply_queue isn't empty then one of a few things happened...
-      #
-      # - Our connection was closed and probably re-restablished. This was
-      #   in reply to pulling for an asynchronous event and getting this is
-      #   expected - ignore it.
-      #
-      # - Pulling for asynchronous events produced an error. If this was a
-      #   ProtocolError then it's a tor bug, and if a non-closure SocketError
-      #   then it was probably a socket glitch. Deserves an INFO level log
-      #   message.
-      #
-      # - This is a leftover response for a msg() call. We can't tell who an
-      #   exception was earmarked for, so we only know that this was the case
-      #   if it's a ControlMessage.
-      #
-      #   This is the most concerning situation since it indicates that one of
-      #   our callers didn't get their reply. However, this is still a
-      #   perfectly viable use case. For instance...
-      #
-      #   1. We send a request.
-      #   2. The reader thread encounters an exception, for instance a socket
-      #      error. We enqueue the exception.
-      #   3. The reader thread receives the reply.
-      #   4. We raise the socket error, and have an undelivered message.
-      #
-      #   Thankfully this only seems to arise in edge cases around rapidly
-      #   closing/reconnecting the socket.
-
-      while not self._reply_queue.empty():
-        try:
-          response = self._reply_queue.get_nowait()
-
-          if isinstance(response, stem.SocketClosed):
-            pass  # this is fine
-          elif isinstance(response, stem.ProtocolError):
-            log.info('Tor provided a malformed message (%s)' % response)
-          elif isinstance(response, stem.ControllerError):
-            log.info('Socket experienced a problem (%s)' % response)
-          elif isinstance(response, stem.response.ControlMessage):
-            log.info('Failed to deliver a response: %s' % response)
-        except asyncio.QueueEmpty:
-          # the empty() method is documented to not be fully reliable so this
-          # isn't entirely surprising
+    if speed is not None and speed <= 0:
+      raise ValueError('Replay speed must be positive, but was %s' % speed)
 
-          break
+    count = 0
+    started_at, first_arrived_at = time.time(), None
 
-      try:
-        await self._socket.send(message)
+    for arrived_at, event_message in read_recorded_events(path):
+      if speed is not None:
+        if first_arrived_at is None:
+          first_arrived_at = arrived_at
 
-        try:
-          response = await asyncio.wait_for(self._reply_queue.get(), MSG_TIMEOUT)
-        except asyncio.TimeoutError:
-          raise stem.ControllerError('%s failed to receive a reply within %i seconds' % (message, MSG_TIMEOUT))
+        delay = started_at + (arrived_at - first_arrived_at) / speed - time.time()
 
-        # If the message we received back had an exception then re-raise it to the
-        # caller. Otherwise return the response.
+        if delay > 0:
+          await asyncio.sleep(delay)
 
-        if isinstance(response, stem.ControllerError):
-          raise response
-        else:
-          return response
-      except stem.SocketClosed:
-        # If the recv() thread caused the SocketClosed then we could still be
-        # in the process of closing. Calling close() here so that we can
-        # provide an assurance to the caller that when we raise a SocketClosed
-        # exception we are shut down afterward for realz.
+      await self._handle_event(event_message)
+      count += 1
 
-        await self.close()
-        raise
+    return count
 
   def is_alive(self) -> bool:
     """
@@ -898,9 +2793,19 @@ class BaseController(Synchronous):
     # awake from recv() raising a closure exception. Wake up the event thread
     # too so it can end.
 
-    self._event_notice.set()
+    self._event_queue.put_nowait(None)
+    self._event_queue_writable.set()
     self._is_authenticated = False
 
+    while self._reply_futures:
+      reply = self._reply_futures.popleft()
+
+      if reply is not None and not reply.done():
+        reply.set_exception(stem.SocketClosed('Control socket closed before receiving a reply'))
+
+    self._reply_metrics.clear()
+    self._reply_streams.clear()
+
     reader_loop_task = self._reader_loop_task
     self._reader_loop_task = None
     event_loop_task = self._event_loop_task
@@ -991,23 +2896,159 @@ class BaseController(Synchronous):
 
     while self.is_alive():
       try:
-        control_message = await self._socket.recv()
+        control_message = await self._socket.recv(data_handler = self._stream_data)
         self._last_heartbeat = time.time()
 
-        if control_message.content()[-1][0] == '650':
-          # asynchronous message, adds to the event queue and wakes up its handler
-          self._event_queue.put_nowait(control_message)
-          self._event_notice.set()
+        if control_message.is_event():
+          if self._metrics is not None:
+            self._metrics.add_event(control_message)
+
+          if self._event_recorder is not None:
+            try:
+              self._event_recorder.record(control_message, self._last_heartbeat)
+            except (OSError, ValueError) as exc:
+              log.warn('Unable to record events to %s, so no longer recording (%s)' % (self._event_recorder.path, exc))
+              self._event_recorder = None
+
+          # asynchronous message, adds to the event queue for its handler
+          await self._enqueue_event(control_message)
         else:
           # response to a msg() call
-          self._reply_queue.put_nowait(control_message)
+          self._deliver_reply(control_message)
       except stem.ControllerError as exc:
         # Assume that all exceptions belong to the reader. This isn't always
         # true, but the msg() call can do a better job of sorting it out.
         #
         # Be aware that the msg() method relies on this to unblock callers.
 
-        self._reply_queue.put_nowait(exc)
+        if isinstance(exc, stem.SocketClosed):
+          while self._reply_futures:
+            self._deliver_reply(exc)
+
+        self._deliver_reply(exc)
+
+  async def _enqueue_event(self, event_message: stem.response.ControlMessage) -> None:
+    """
+    Adds an event to our queue, applying our overflow action if it's full.
+
+    :param event_message: event that we've read from the socket
+    """
+
+    self._events_received += 1
+
+    if self._is_event_queue_full():
+      if self._event_queue_overflow == EventQueueOverflow.DROP_NEWEST:
+        self._events_dropped += 1
+        return
+      elif self._event_queue_overflow == EventQueueOverflow.DROP_OLDEST:
+        while self._is_event_queue_full():
+          if self._event_queue.get_nowait() is not None:
+            self._event_queue_depth -= 1
+            self._events_dropped += 1
+
+          self._event_queue.task_done()
+      else:
+        self._event_reads_paused += 1
+
+        # replies share our socket, so keep reading if one is expected
+
+        while self._is_event_queue_full() and self.is_alive() and not (self._msg_lock.locked() or self._reply_futures):
+          self._event_queue_writable.clear()
+          await self._event_queue_writable.wait()
+
+    queued_at = time.time()
+
+    if self._event_queue_oldest is None:
+      self._event_queue_oldest = queued_at
+
+    self._event_queue.put_nowait((event_message, queued_at))
+    self._event_queue_depth += 1
+
+  def _is_event_queue_full(self) -> bool:
+    """
+    Checks if our event queue has reached its limit.
+
+    :returns: **True** if our event queue is full, **False** otherwise
+    """
+
+    return self._event_queue_size is not None and self._event_queue_depth >= self._event_queue_size
+
+  def _deliver_reply(self, reply: Union[stem.response.ControlMessage, stem.ControllerError]) -> None:
+    """
+    Provides a reply to the oldest request that's awaiting one. Replies for
+    msg() calls that aren't pipelined, or that nobody awaits, go to our reply
+    queue.
+
+    :param reply: message or exception to be delivered
+    """
+
+    if self._reply_futures:
+      reply_future = self._reply_futures.popleft()
+      request = self._reply_metrics.popleft()
+
+      if request is not None and self._metrics is not None:
+        self._record_request(request, reply)
+    else:
+      reply_future = None
+
+    if reply_future is None:
+      self._reply_queue.put_nowait(reply)
+      return
+
+    self._reply_streams.pop(reply_future, None)
+
+    if reply_future.done():
+      # caller gave up on this reply (for instance, it timed out)
+
+      if isinstance(reply, stem.response.ControlMessage):
+        log.info('Failed to deliver a response: %s' % reply)
+    elif isinstance(reply, stem.ControllerError):
+      reply_future.set_exception(reply)
+    else:
+      reply_future.set_result(reply)
+
+  def _record_request(self, request: Tuple[str, float, float], reply: Union[stem.response.ControlMessage, stem.ControllerError]) -> None:
+    """
+    Measures a request that we've received the reply for, and notifies our
+    metrics listeners.
+
+    :param request: tuple of the form (message, called_at, sent_at)
+    :param reply: message or exception the request received
+    """
+
+    message, called_at, sent_at = request
+
+    if isinstance(reply, stem.response.ControlMessage):
+      reply_size, is_error = len(reply.raw_content(get_bytes = True)), not reply.is_ok()
+    else:
+      reply_size, is_error = 0, True
+
+    command = message.split(None, 1)[0].upper() if message.strip() else ''
+    request_metrics = RequestMetrics(command, sent_at - called_at, time.time() - sent_at, len(stem.util.str_tools._to_bytes(stem.socket.send_formatting(message))), reply_size, is_error)
+
+    self._metrics.add_request(request_metrics)
+
+    for listener in list(self._metrics_listeners):
+      try:
+        listener(request_metrics)
+      except Exception as exc:
+        log.warn('Metrics listener raised an uncaught exception (%s): %s' % (exc, request_metrics))
+
+  def _stream_data(self, status_code: str, content: bytes) -> Optional[Callable[[bytes], Awaitable[None]]]:
+    """
+    Provides the sink for a data block if it belongs to a streamed reply.
+
+    :param status_code: status code of the data block's first line
+    :param content: content of the data block's first line
+
+    :returns: sink for the data block, or **None** if it should be buffered
+    """
+
+    if status_code == '650' or not self._reply_futures:
+      return None  # events and unrequested messages aren't streamed
+
+    reply_stream = self._reply_streams.get(self._reply_futures[0])
+    return reply_stream.put if reply_stream else None
 
   async def _event_loop(self) -> None:
     """
@@ -1020,28 +3061,34 @@ class BaseController(Synchronous):
     socket_closed_at = None
 
     while True:
-      try:
-        event_message = self._event_queue.get_nowait()
-        await self._handle_event(event_message)
-        self._event_queue.task_done()
-
-        # Attempt to finish processing enqueued events when our controller closes
+      # Attempt to finish processing enqueued events when our controller
+      # closes, but only for EVENTS_LISTENING_TIMEOUT seconds.
 
-        if not self.is_alive():
-          if not socket_closed_at:
-            socket_closed_at = time.time()
-          elif time.time() - socket_closed_at > EVENTS_LISTENING_TIMEOUT:
-            break
-      except asyncio.queues.QueueEmpty:
-        if not self.is_alive():
+      if not self.is_alive():
+        if self._event_queue.empty():
+          break
+        elif not socket_closed_at:
+          socket_closed_at = time.time()
+        elif time.time() - socket_closed_at > EVENTS_LISTENING_TIMEOUT:
           break
 
-        try:
-          await asyncio.wait_for(self._event_notice.wait(), timeout=0.05)
-        except asyncio.TimeoutError:
-          pass
-        finally:
-          self._event_notice.clear()
+      # Rather than polling we sleep until there's an event, or _close() wakes
+      # us with None.
+
+      queued_event = await self._event_queue.get()
+
+      if queued_event is not None:
+        event_message, queued_at = queued_event
+        self._event_queue_depth -= 1
+        self._event_queue_oldest = queued_at
+        self._event_max_lag = max(self._event_max_lag, time.time() - queued_at)
+        self._event_queue_writable.set()
+        await self._handle_event(event_message)
+
+        if self._event_queue_depth == 0:
+          self._event_queue_oldest = None
+
+      self._event_queue.task_done()
 
 
 class Controller(BaseController):
@@ -1101,14 +3148,26 @@ class Controller(BaseController):
 
   def __init__(self, control_socket: stem.socket.ControlSocket, is_authenticated: bool = False) -> None:
     self._is_caching_enabled = True
-    self._request_cache = {}  # type: Dict[str, Any]
+    self._request_cache = _RequestCache(REQUEST_CACHE_SIZE)
     self._last_newnym = 0.0
 
+    # seconds to collect GETINFO and GETCONF queries before sending them as a
+    # single request, None if coalescing is disabled
+
+    self._coalescing_window = None  # type: Optional[float]
+    self._is_lazy_event_parsing_enabled = False
+    self._network_status_mirror = None  # type: Optional[_NetworkStatusMirror]
+    self._circuit_tracker = None  # type: Optional[_CircuitTracker]
+    self._stream_attacher = None  # type: Optional[StreamAttacher]
+    self._stream_attach_tasks = set()  # type: Set[asyncio.Task]
+    self._coalescing_batches = {}  # type: Dict[str, Tuple[Set[str], asyncio.Future]]
+
     self._cache_lock = threading.RLock()
 
     # mapping of event types to their listeners
 
     self._event_listeners = {}  # type: Dict[stem.control.EventType, List[Callable[[stem.response.events.Event], Union[None, Awaitable[None]]]]]
+    self._listener_queues = {}  # type: Dict[Callable[[stem.response.events.Event], Union[None, Awaitable[None]]], _ListenerQueue]
     self._enabled_features = []  # type: List[str]
 
     self._last_address_exc = None  # type: Optional[BaseException]
@@ -1156,6 +3215,10 @@ class Controller(BaseController):
 
   async def close(self) -> None:
     self.clear_cache()
+
+    for listener_queue in list(self._listener_queues.values()):
+      await listener_queue.stop()
+
     await super(Controller, self).close()
 
   async def authenticate(self, *args: Any, **kwargs: Any) -> None:
@@ -1247,7 +3310,7 @@ class Controller(BaseController):
 
     for key in cached_results:
       user_expected_key = _case_insensitive_lookup(param_set, key)
-      reply[user_expected_key] = cached_results[key]
+      reply[user_expected_key] = stem.util.str_tools._to_bytes(cached_results[key]) if get_bytes else stem.util.str_tools._to_unicode(cached_results[key])
       param_set.remove(user_expected_key)
 
     # if everything was cached then short circuit making the query
@@ -1260,27 +3323,42 @@ class Controller(BaseController):
       else:
         return list(reply.values())[0]
 
+    with self._cache_lock:
+      invalidation_counts = collections.Counter(self._request_cache.invalidation_counts)
+
     try:
-      response = stem.response._convert_to_getinfo(await self.msg('GETINFO %s' % ' '.join(param_set)))
-      response._assert_matches(param_set)
+      response, queried_params = await self._coalesced_request('GETINFO', param_set)
+      response._assert_matches(queried_params)  # type: ignore
+      entries = dict((param, response.entries[param]) for param in param_set)  # type: ignore
 
       # usually we want unicode values under python 3.x
 
       if not get_bytes:
-        response.entries = dict((k, stem.util.str_tools._to_unicode(v)) for (k, v) in response.entries.items())  # type: ignore
+        entries = dict((k, stem.util.str_tools._to_unicode(v)) for (k, v) in entries.items())
 
-      reply.update(response.entries)
+      reply.update(entries)
 
       if self.is_caching_enabled():
         to_cache = {}
 
-        for key, value in response.entries.items():
+        for key, value in entries.items():
           key = key.lower()  # make case insensitive
 
           if key in CACHEABLE_GETINFO_PARAMS or key in CACHEABLE_GETINFO_PARAMS_UNTIL_SETCONF:
             to_cache[key] = value
           elif key.startswith('ip-to-country/'):
             to_cache[key] = value
+          elif key in CACHEABLE_GETINFO_PARAMS_WITH_TTL:
+            to_cache[key] = value
+          else:
+            invalidated_by = _cache_invalidated_by(key)
+
+            if invalidated_by and all(event_type in self._event_listeners for event_type in invalidated_by):
+              # skip caching if the value may have become stale while we
+              # awaited tor's reply
+
+              if all(self._request_cache.invalidation_counts[event_type] == invalidation_counts[event_type] for event_type in invalidated_by):
+                to_cache[key] = value
 
         self._set_cache(to_cache, 'getinfo')
 
@@ -1859,12 +3937,7 @@ class Controller(BaseController):
       default was provided
     """
 
-    desc_content = await self.get_info('md/all', get_bytes = True)
-
-    if not desc_content:
-      raise stem.DescriptorUnavailable('Descriptor information is unavailable, tor might still be downloading it')
-
-    for desc in stem.descriptor.microdescriptor._parse_file(io.BytesIO(desc_content)):
+    async for desc in self._get_descriptors_streamed('md/all', b'onion-key', stem.descriptor.microdescriptor._parse_file):
       yield desc
 
   @with_default()
@@ -1953,17 +4026,7 @@ class Controller(BaseController):
       default was provided
     """
 
-    # TODO: We should iterate over the descriptors as they're read from the
-    # socket rather than reading the whole thing into memory.
-    #
-    # https://github.com/torproject/stem/issues/30
-
-    desc_content = await self.get_info('desc/all-recent', get_bytes = True)
-
-    if not desc_content:
-      raise stem.DescriptorUnavailable('Descriptor information is unavailable, tor might still be downloading it')
-
-    for desc in stem.descriptor.server_descriptor._parse_file(io.BytesIO(desc_content)):
+    async for desc in self._get_descriptors_streamed('desc/all-recent', b'router', stem.descriptor.server_descriptor._parse_file):
       yield desc  # type: ignore
 
   @with_default()
@@ -1980,9 +4043,16 @@ class Controller(BaseController):
     authorities so this both won't be available for newly started relays and
     may be up to around an hour out of date.
 
+    If :func:`~stem.control.Controller.set_network_status_mirroring` is
+    enabled this is answered from our copy of the consensus rather than
+    querying tor.
+
     .. versionchanged:: 1.3.0
        Changed so we'd fetch our own descriptor if no 'relay' is provided.
 
+    .. versionchanged:: 2.0.0
+       Provided from our copy of the consensus when mirroring is enabled.
+
     :param relay: fingerprint or nickname of the relay to be queried
     :param default: response if the query fails
 
@@ -2012,6 +4082,16 @@ class Controller(BaseController):
     else:
       raise ValueError("'%s' isn't a valid fingerprint or nickname" % relay)
 
+    mirror = self._network_status_mirror
+
+    if mirror and mirror.is_seeded:
+      entry = mirror.get(relay)
+
+      if entry is None:
+        raise stem.DescriptorUnavailable("Tor was unable to provide the descriptor for '%s'" % relay)
+
+      return entry
+
     try:
       desc_content = await self.get_info(query, get_bytes = True)
     except stem.InvalidArguments as exc:
@@ -2033,6 +4113,13 @@ class Controller(BaseController):
     Provides an iterator for all of the router status entries that tor
     currently knows about.
 
+    If :func:`~stem.control.Controller.set_network_status_mirroring` is
+    enabled this is provided from our copy of the consensus rather than
+    querying tor.
+
+    .. versionchanged:: 2.0.0
+       Provided from our copy of the consensus when mirroring is enabled.
+
     :param default: items to provide if the query fails
 
     :returns: iterates over
@@ -2043,25 +4130,60 @@ class Controller(BaseController):
       default was provided
     """
 
-    # TODO: We should iterate over the descriptors as they're read from the
-    # socket rather than reading the whole thing into memory.
-    #
-    # https://github.com/torproject/stem/issues/30
-
-    desc_content = await self.get_info('ns/all', get_bytes = True)
+    mirror = self._network_status_mirror
 
-    if not desc_content:
-      raise stem.DescriptorUnavailable('Descriptor information is unavailable, tor might still be downloading it')
+    if mirror and mirror.is_seeded:
+      for entry in mirror.entries():
+        yield entry
 
-    desc_iterator = stem.descriptor.router_status_entry._parse_file(
-      io.BytesIO(desc_content),
-      False,
-      entry_class = stem.descriptor.router_status_entry.RouterStatusEntryV3,
-    )
+      return
 
-    for desc in desc_iterator:
+    async for desc in self._get_descriptors_streamed('ns/all', b'r', _parse_router_status_entries):
       yield desc  # type: ignore
 
+  async def _get_descriptors_streamed(self, param: str, keyword: bytes, parse_file: Callable[[BinaryIO], Iterator[stem.descriptor.Descriptor]]) -> AsyncIterator[stem.descriptor.Descriptor]:
+    """
+    Queries descriptors through GETINFO, parsing them as they're read from
+    the socket rather than once the whole reply has been received.
+
+    :param param: GETINFO parameter to query
+    :param keyword: keyword that each descriptor begins with
+    :param parse_file: function that parses descriptors from a file
+
+    :returns: iterates over the descriptors we receive
+
+    :raises:
+      * :class:`stem.DescriptorUnavailable` if tor didn't provide any descriptors
+      * :class:`stem.ControllerError` if unable to query tor
+    """
+
+    reply_stream = await self._msg_streamed('GETINFO %s' % param)
+    desc_content = bytearray()
+    received_content = False
+
+    try:
+      async for chunk in reply_stream.chunks():
+        desc_content += chunk
+        received_content = True
+        desc_start = _last_descriptor_start(desc_content, keyword)
+
+        if desc_start:
+          for desc in parse_file(io.BytesIO(bytes(desc_content[:desc_start]))):
+            yield desc
+
+          del desc_content[:desc_start]
+
+      response = stem.response._convert_to_getinfo(await reply_stream.reply)
+      response._assert_matches(set([param]))
+
+      if not received_content:
+        raise stem.DescriptorUnavailable('Descriptor information is unavailable, tor might still be downloading it')
+
+      for desc in parse_file(io.BytesIO(bytes(desc_content))):
+        yield desc
+    finally:
+      reply_stream.close()
+
   @with_default()
   async def get_hidden_service_descriptor(self, address: str, default: Any = UNDEFINED, servers: Optional[Sequence[str]] = None, await_result: bool = True, timeout: Optional[float] = None) -> stem.descriptor.hidden_service.HiddenServiceDescriptorV2:
     """
@@ -2306,11 +4428,31 @@ class Controller(BaseController):
       return self._get_conf_dict_to_response(reply, default, multiple)
 
     try:
-      response = stem.response._convert_to_getconf(await self.msg('GETCONF %s' % ' '.join(lookup_params)))
-      reply.update(response.entries)
+      if any(param.lower() in MAPPED_CONFIG_KEYS for param in lookup_params):
+        # These options provide entries other than what we requested, so we
+        # couldn't tell which parts of a merged response are ours.
+
+        response = stem.response._convert_to_getconf(await self.msg('GETCONF %s' % ' '.join(lookup_params)))
+        queried_params = lookup_params
+      else:
+        response, queried_params = await self._coalesced_request('GETCONF', lookup_params)  # type: ignore
+
+      entries = response.entries
+
+      if queried_params != lookup_params:
+        # Our query was merged with others. Tor provides the canonical casing
+        # of options, so if we can't find all of ours we query them alone.
+
+        lookup_keys = set([param.lower() for param in lookup_params])
+        entries = dict((k, list(v)) for (k, v) in response.entries.items() if k.lower() in lookup_keys)
+
+        if len(entries) != len(lookup_keys):
+          entries = stem.response._convert_to_getconf(await self.msg('GETCONF %s' % ' '.join(lookup_params))).entries
+
+      reply.update(entries)
 
       if self.is_caching_enabled():
-        to_cache = dict((k.lower(), v) for k, v in response.entries.items())
+        to_cache = dict((k.lower(), v) for k, v in entries.items())
 
         self._set_cache(to_cache, 'getconf')
 
@@ -3182,7 +5324,7 @@ class Controller(BaseController):
     else:
       return response.credentials
 
-  async def add_event_listener(self, listener: Callable[[stem.response.events.Event], Union[None, Awaitable[None]]], *events: 'stem.control.EventType') -> None:
+  async def add_event_listener(self, listener: Callable[[stem.response.events.Event], Union[None, Awaitable[None]]], *events: 'stem.control.EventType', queue_size: Optional[int] = None, overflow: 'stem.control.ListenerOverflow' = ListenerOverflow.BLOCK) -> None:
     """
     Directs further tor controller events to a given function. The function is
     expected to take a single argument, which is a
@@ -3208,16 +5350,41 @@ class Controller(BaseController):
     If tor emits a malformed event it can be received by listening for the
     stem.control.MALFORMED_EVENTS constant.
 
+    Listeners are ordinarily notified one after another, so a slow listener
+    delays all others. If a **queue_size** is provided this listener is
+    instead notified from a queue and task of its own, with non-coroutine
+    listeners run in a thread pool. When more than **queue_size** events are
+    pending the **overflow** policy applies, and
+    :func:`~stem.control.Controller.get_listener_stats` reports how far
+    behind the listener is.
+
+    Bandwidth events (**BW**, **CIRC_BW**, **CONN_BW**, and **STREAM_BW**)
+    report usage since their last event, so with a **COALESCE** policy those
+    that are queued for the same circuit, stream, or connection are summed
+    into a single event. This bounds the listener's queue while keeping its
+    totals exact.
+
     .. versionchanged:: 1.7.0
        Listener exceptions and malformed events no longer break further event
        processing. Added the **MALFORMED_EVENTS** constant.
 
+    .. versionchanged:: 2.0.0
+       Added the queue_size and overflow arguments.
+
     :param listener: function to be called when an event is received
     :param events: event types to be listened for
+    :param queue_size: notify this listener from its own queue of this size
+    :param overflow: :data:`~stem.control.ListenerOverflow` action when the
+      listener's queue is full
 
-    :raises: :class:`stem.ProtocolError` if unable to set the events
+    :raises:
+      * :class:`stem.ProtocolError` if unable to set the events
+      * **ValueError** if the queue_size isn't positive
     """
 
+    if queue_size is not None and queue_size < 1:
+      raise ValueError('Listener queue size must be positive, but was %s' % queue_size)
+
     # first checking that tor supports these event types
 
     async with self._event_listeners_lock:
@@ -3231,6 +5398,14 @@ class Controller(BaseController):
       for event_type in events:
         self._event_listeners.setdefault(event_type, []).append(listener)
 
+      if queue_size is not None:
+        listener_queue = self._listener_queues.get(listener)
+
+        if listener_queue is not None:
+          listener_queue.size, listener_queue.overflow = queue_size, overflow
+        else:
+          self._listener_queues[listener] = _ListenerQueue(listener, queue_size, overflow)
+
       failed_events = (await self._attach_listeners())[1]
 
       # restricted the failures to just things we requested
@@ -3251,6 +5426,10 @@ class Controller(BaseController):
 
     async with self._event_listeners_lock:
       event_types_changed = False
+      listener_queue = self._listener_queues.pop(listener, None)
+
+      if listener_queue is not None:
+        await listener_queue.stop()
 
       for event_type, event_listeners in list(self._event_listeners.items()):
         if listener in event_listeners:
@@ -3260,11 +5439,36 @@ class Controller(BaseController):
             event_types_changed = True
             del self._event_listeners[event_type]
 
-      if event_types_changed:
-        response = await self.msg('SETEVENTS %s' % ' '.join(self._event_listeners.keys()))
+            # we'll no longer be notified when entries tied to this event are stale
+
+            with self._cache_lock:
+              self._request_cache.invalidate(event_type)
+
+      if event_types_changed:
+        response = await self.msg('SETEVENTS %s' % ' '.join(self._event_listeners.keys()))
+
+        if not response.is_ok():
+          raise stem.ProtocolError('SETEVENTS received unexpected response\n%s' % response)
+
+  def get_listener_stats(self, listener: Callable[[stem.response.events.Event], Union[None, Awaitable[None]]]) -> 'stem.control.ListenerStats':
+    """
+    Provides the backlog of a listener that was added with a **queue_size**.
+
+    .. versionadded:: 2.0.0
+
+    :param listener: listener to provide the backlog of
+
+    :returns: :class:`~stem.control.ListenerStats` for the listener
+
+    :raises: **ValueError** if the listener doesn't have its own queue
+    """
+
+    listener_queue = self._listener_queues.get(listener)
 
-        if not response.is_ok():
-          raise stem.ProtocolError('SETEVENTS received unexpected response\n%s' % response)
+    if listener_queue is None:
+      raise ValueError("%s isn't notified from a queue of its own" % listener)
+
+    return ListenerStats(len(listener_queue), listener_queue.delivered, listener_queue.dropped, listener_queue.lag, listener_queue.max_lag, listener_queue.coalesced)
 
   def _get_cache(self, param: str, namespace: Optional[str] = None) -> Any:
     """
@@ -3281,7 +5485,7 @@ class Controller(BaseController):
         return None
 
       cache_key = '%s.%s' % (namespace, param) if namespace else param
-      return self._request_cache.get(cache_key, None)
+      return self._request_cache.get(cache_key)
 
   def _get_cache_map(self, params: Sequence[str], namespace: Optional[str] = None) -> Dict[str, Any]:
     """
@@ -3299,9 +5503,10 @@ class Controller(BaseController):
       if self.is_caching_enabled():
         for param in params:
           cache_key = '%s.%s' % (namespace, param) if namespace else param
+          cached_value = self._request_cache.get(cache_key)
 
-          if cache_key in self._request_cache:
-            cached_values[param] = self._request_cache[cache_key]
+          if cached_value is not None:
+            cached_values[param] = cached_value
 
       return cached_values
 
@@ -3321,10 +5526,7 @@ class Controller(BaseController):
       # if params is None then clear the namespace
 
       if params is None and namespace:
-        for cache_key in list(self._request_cache.keys()):
-          if cache_key.startswith('%s.' % namespace):
-            del self._request_cache[cache_key]
-
+        self._request_cache.delete_namespace(namespace)
         return
 
       # remove uncacheable items
@@ -3342,10 +5544,11 @@ class Controller(BaseController):
           cache_key = key
 
         if value is None:
-          if cache_key in list(self._request_cache.keys()):
-            del self._request_cache[cache_key]
+          self._request_cache.delete(cache_key)
+        elif namespace == 'getinfo':
+          self._request_cache.set(cache_key, value, CACHEABLE_GETINFO_PARAMS_WITH_TTL.get(key), _cache_invalidated_by(key))
         else:
-          self._request_cache[cache_key] = value
+          self._request_cache.set(cache_key, value)
 
   def _confchanged_cache_invalidation(self, params: Mapping[str, Any]) -> None:
     """
@@ -3398,9 +5601,387 @@ class Controller(BaseController):
     """
 
     with self._cache_lock:
-      self._request_cache = {}
+      self._request_cache.clear()
       self._last_newnym = 0.0
 
+  def get_cache_stats(self) -> 'stem.control.CacheStats':
+    """
+    Provides usage information for our request cache.
+
+    .. versionadded:: 2.0.0
+
+    :returns: :class:`~stem.control.CacheStats` for our cache
+    """
+
+    with self._cache_lock:
+      cache = self._request_cache
+      return CacheStats(cache.hits, cache.misses, cache.evictions, cache.expirations, len(cache))
+
+  def is_coalescing_enabled(self) -> bool:
+    """
+    **True** if concurrent GETINFO and GETCONF queries are merged, **False**
+    otherwise.
+
+    .. versionadded:: 2.0.0
+
+    :returns: bool to indicate if coalescing is enabled
+    """
+
+    return self._coalescing_window is not None
+
+  def set_coalescing(self, enabled: bool, window: float = 0.0) -> None:
+    """
+    Enables or disables coalescing of GETINFO and GETCONF queries. When enabled
+    the queries made by :func:`~stem.control.Controller.get_info` and
+    :func:`~stem.control.Controller.get_conf_map` within **window** seconds
+    of each other are sent as a single request, and its reply is shared with
+    each caller. A window of zero merges queries made within the same
+    iteration of our event loop.
+
+    If a merged request fails its callers retry on their own, so a bad
+    parameter from one caller doesn't fail the others.
+
+    .. versionadded:: 2.0.0
+
+    :param enabled: **True** to enable coalescing, **False** to disable it
+    :param window: seconds to collect queries for before sending them
+    """
+
+    self._coalescing_window = window if enabled else None
+
+  def is_lazy_event_parsing_enabled(self) -> bool:
+    """
+    **True** if the events we provide our listeners parse their attributes
+    when they're first accessed, **False** otherwise.
+
+    .. versionadded:: 2.0.0
+
+    :returns: bool to indicate if lazy event parsing is enabled
+    """
+
+    return self._is_lazy_event_parsing_enabled
+
+  def set_lazy_event_parsing(self, enabled: bool) -> None:
+    """
+    Enables or disables lazy parsing of events. When enabled the events we
+    provide our listeners parse their attributes when they're first accessed
+    rather than upfront, so listeners of frequent events only pay to parse
+    the events they read.
+
+    Malformed events can't be recognized without parsing them, so when enabled
+    they're provided to the listeners of their type (raising a
+    :class:`~stem.ProtocolError` when read) rather than our
+    **MALFORMED_EVENTS** listeners.
+
+    .. versionadded:: 2.0.0
+
+    :param enabled: **True** to enable lazy parsing, **False** to disable it
+    """
+
+    self._is_lazy_event_parsing_enabled = enabled
+
+  def is_network_status_mirroring_enabled(self) -> bool:
+    """
+    **True** if we maintain a copy of tor's consensus, **False** otherwise.
+
+    .. versionadded:: 2.0.0
+
+    :returns: bool to indicate if network status mirroring is enabled
+    """
+
+    return self._network_status_mirror is not None
+
+  async def set_network_status_mirroring(self, enabled: bool) -> None:
+    """
+    Enables or disables our copy of tor's consensus. When enabled we download
+    the consensus once, then keep it current through NEWCONSENSUS and NS
+    events so :func:`~stem.control.Controller.get_network_status` and
+    :func:`~stem.control.Controller.get_network_statuses` needn't query tor.
+
+    Our copy is downloaded again when we reconnect, and until then we query
+    tor as usual.
+
+    .. versionadded:: 2.0.0
+
+    :param enabled: **True** to enable mirroring, **False** to disable it
+
+    :raises: :class:`stem.ControllerError` if unable to download the
+      consensus or listen for its events
+    """
+
+    if enabled and self._network_status_mirror is None:
+      self._network_status_mirror = _NetworkStatusMirror()
+
+      try:
+        await self.add_event_listener(self._update_network_status_mirror, EventType.NEWCONSENSUS, EventType.NS)
+        await self._seed_network_status_mirror()
+      except:
+        await self.set_network_status_mirroring(False)
+        raise
+    elif not enabled and self._network_status_mirror is not None:
+      self._network_status_mirror = None
+      await self.remove_event_listener(self._update_network_status_mirror)
+
+  async def _seed_network_status_mirror(self) -> None:
+    """
+    Populates our copy of the consensus from tor.
+    """
+
+    mirror = self._network_status_mirror
+    entries = [entry async for entry in self._get_descriptors_streamed('ns/all', b'r', _parse_router_status_entries)]
+
+    if mirror and mirror is self._network_status_mirror:
+      mirror.seed(entries)  # type: ignore
+
+  def _update_network_status_mirror(self, event: Union[stem.response.events.NewConsensusEvent, stem.response.events.NetworkStatusEvent]) -> None:
+    """
+    Listener that applies NEWCONSENSUS and NS events to our copy of the
+    consensus.
+    """
+
+    mirror = self._network_status_mirror
+
+    if mirror is None:
+      return
+    elif isinstance(event, stem.response.events.NewConsensusEvent):
+      mirror.update(event.entries(), True)
+    elif isinstance(event, stem.response.events.NetworkStatusEvent):
+      mirror.update(event.descriptors, False)
+
+  def is_circuit_tracking_enabled(self) -> bool:
+    """
+    **True** if we track circuits and streams through events, **False**
+    otherwise.
+
+    .. versionadded:: 2.0.0
+
+    :returns: bool to indicate if circuit tracking is enabled
+    """
+
+    return self._circuit_tracker is not None
+
+  async def set_circuit_tracking(self, enabled: bool) -> None:
+    """
+    Enables or disables tracking of our circuits and streams. When enabled we
+    query their status once, then keep it current through CIRC, CIRC_MINOR,
+    and STREAM events so :func:`~stem.control.Controller.get_circuit`,
+    :func:`~stem.control.Controller.get_circuits`, and
+    :func:`~stem.control.Controller.get_streams` needn't query tor.
+
+    Their status is queried again when we reconnect, and until then we query
+    tor as usual.
+
+    .. versionadded:: 2.0.0
+
+    :param enabled: **True** to enable tracking, **False** to disable it
+
+    :raises: :class:`stem.ControllerError` if unable to query our circuits
+      and streams or listen for their events
+    """
+
+    if enabled and self._circuit_tracker is None:
+      self._circuit_tracker = _CircuitTracker()
+
+      try:
+        await self.add_event_listener(self._update_circuit_tracker, EventType.CIRC, EventType.CIRC_MINOR, EventType.STREAM)
+        await self._seed_circuit_tracker()
+      except:
+        await self.set_circuit_tracking(False)
+        raise
+    elif not enabled and self._circuit_tracker is not None:
+      self._circuit_tracker = None
+      await self.remove_event_listener(self._update_circuit_tracker)
+
+  async def _seed_circuit_tracker(self) -> None:
+    """
+    Populates our circuit and stream tables from tor.
+    """
+
+    tracker = self._circuit_tracker
+    circuits = await self.get_circuits()
+    streams = await self.get_streams()
+
+    if tracker and tracker is self._circuit_tracker:
+      tracker.seed(circuits, streams)
+
+  def _update_circuit_tracker(self, event: stem.response.events.Event) -> None:
+    """
+    Listener that applies CIRC, CIRC_MINOR, and STREAM events to our circuit
+    and stream tables.
+    """
+
+    tracker = self._circuit_tracker
+
+    if tracker is not None:
+      tracker.update(event)
+
+  def get_stream_attacher(self) -> Optional['stem.control.StreamAttacher']:
+    """
+    Provides the attacher that picks circuits for our streams.
+
+    .. versionadded:: 2.0.0
+
+    :returns: :class:`~stem.control.StreamAttacher` we attach streams with,
+      or **None** if tor attaches them
+    """
+
+    return self._stream_attacher
+
+  async def set_stream_attacher(self, attacher: Optional['stem.control.StreamAttacher']) -> None:
+    """
+    Attaches new streams to the circuits an attacher picks. This sets
+    **__LeaveStreamsUnattached** so tor leaves streams for us, and issues
+    ATTACHSTREAM as soon as we're notified of each stream. These requests
+    aren't delayed by others that await a reply, even without
+    :func:`~stem.control.BaseController.set_pipelining`.
+
+    Stream events are read in order with other events, so listeners that
+    block our event loop delay attachment as well.
+
+    .. versionadded:: 2.0.0
+
+    :param attacher: :class:`~stem.control.StreamAttacher` to pick circuits
+      with, or **None** to let tor attach streams
+
+    :raises: :class:`stem.ControllerError` if unable to listen for streams or
+      set **__LeaveStreamsUnattached**
+    """
+
+    if attacher is not None:
+      if self._stream_attacher is None:
+        self._stream_attacher = attacher
+
+        try:
+          await self.add_event_listener(self._attach_new_stream, EventType.STREAM, EventType.CIRC)
+          await self.set_conf('__LeaveStreamsUnattached', '1')
+        except:
+          await self.set_stream_attacher(None)
+          raise
+      else:
+        self._stream_attacher = attacher
+    elif self._stream_attacher is not None:
+      self._stream_attacher = None
+      await self.remove_event_listener(self._attach_new_stream)
+      await self.reset_conf('__LeaveStreamsUnattached')
+
+  def _attach_new_stream(self, event: stem.response.events.Event) -> None:
+    """
+    Listener that attaches new streams, and drops routes to circuits that
+    have closed.
+    """
+
+    attacher = self._stream_attacher
+
+    if attacher is None:
+      return
+    elif isinstance(event, stem.response.events.StreamEvent):
+      if event.status in (StreamStatus.NEW, StreamStatus.NEWRESOLVE, StreamStatus.DETACHED):
+        attach_task = self._loop.create_task(self._attach_stream_with(attacher, event, time.time()))
+        self._stream_attach_tasks.add(attach_task)
+        attach_task.add_done_callback(self._stream_attach_tasks.discard)
+    elif isinstance(event, stem.response.events.CircuitEvent):
+      if event.status in (CircStatus.CLOSED, CircStatus.FAILED):
+        attacher.remove_circuit(event.id)
+
+  async def _attach_stream_with(self, attacher: 'stem.control.StreamAttacher', stream: stem.response.events.StreamEvent, notified_at: float) -> None:
+    """
+    Attaches a stream to the circuit our attacher picks. If that fails we let
+    tor pick a circuit, so the stream isn't left unattached.
+
+    :param attacher: attacher to pick a circuit with
+    :param stream: stream to be attached
+    :param notified_at: unix timestamp when we were notified of the stream
+    """
+
+    try:
+      circuit_id = attacher.choose(stream) or '0'
+    except Exception as exc:
+      log.warn('Stream attacher raised an uncaught exception (%s): %s' % (exc, stream))
+      circuit_id = '0'
+
+    try:
+      try:
+        await self._attach_stream(stream.id, circuit_id, immediate = True)
+      except (stem.InvalidRequest, stem.OperationFailed) as exc:
+        if circuit_id == '0':
+          raise
+
+        log.info('Unable to attach stream %s to circuit %s, letting tor pick one instead (%s)' % (stream.id, circuit_id, exc))
+        attacher.failed += 1
+        await self._attach_stream(stream.id, '0', immediate = True)
+
+      attacher.attached += 1
+      attacher._latencies.append(time.time() - notified_at)
+    except stem.ControllerError as exc:
+      log.info('Unable to attach stream %s (%s)' % (stream.id, exc))
+
+  async def _coalesced_request(self, command: str, params: Set[str]) -> Tuple[stem.response.ControlMessage, Set[str]]:
+    """
+    Issues a GETINFO or GETCONF query. If coalescing is enabled then queries
+    made within our window are merged into a single request.
+
+    :param command: **GETINFO** or **GETCONF**
+    :param params: parameters to be queried
+
+    :returns: **tuple** of the form (response, queried_params), the later of
+      which may include parameters from other callers
+
+    :raises: :class:`stem.ControllerError` if the query fails
+    """
+
+    convert = stem.response._convert_to_getinfo if command == 'GETINFO' else stem.response._convert_to_getconf
+
+    if self._coalescing_window is None:
+      return convert(await self.msg('%s %s' % (command, ' '.join(params)))), params
+
+    batch = self._coalescing_batches.get(command)
+
+    if batch is None:
+      batch = (set(), self._loop.create_future())
+      self._coalescing_batches[command] = batch
+      self._loop.create_task(self._send_coalesced_request(command, *batch))
+
+    batch_params, batch_reply = batch
+
+    if command == 'GETCONF':
+      # Configuration options are case insensitive, and tor provides values
+      # for each time an option is queried.
+
+      batch_keys = set([param.lower() for param in batch_params])
+      batch_params.update([param for param in params if param.lower() not in batch_keys])
+    else:
+      batch_params.update(params)
+
+    try:
+      return await asyncio.shield(batch_reply), batch_params
+    except stem.InvalidArguments:
+      if batch_params == params:
+        raise
+
+      # Another caller's parameter may be responsible for this failure, so
+      # retry with just our own.
+
+      return convert(await self.msg('%s %s' % (command, ' '.join(params)))), params
+
+  async def _send_coalesced_request(self, command: str, params: Set[str], reply: asyncio.Future) -> None:
+    """
+    Sends a batch of queries after our coalescing window has elapsed.
+    """
+
+    await asyncio.sleep(self._coalescing_window or 0)
+
+    # further queries belong to a new batch
+
+    if self._coalescing_batches.get(command, (None, None))[1] is reply:
+      del self._coalescing_batches[command]
+
+    convert = stem.response._convert_to_getinfo if command == 'GETINFO' else stem.response._convert_to_getconf
+
+    try:
+      reply.set_result(convert(await self.msg('%s %s' % (command, ' '.join(params)))))
+    except Exception as exc:
+      reply.set_exception(exc)
+
   async def load_conf(self, configtext: str) -> None:
     """
     Sends the configuration text to Tor and loads it as if it has been read from
@@ -3501,6 +6082,12 @@ class Controller(BaseController):
 
     Provides a circuit currently available from tor.
 
+    If :func:`~stem.control.Controller.set_circuit_tracking` is enabled this
+    is provided from the circuits we track rather than querying tor.
+
+    .. versionchanged:: 2.0.0
+       Provided from our tracked circuits when circuit tracking is enabled.
+
     :param circuit_id: circuit to be fetched
     :param default: response if the query fails
 
@@ -3513,9 +6100,17 @@ class Controller(BaseController):
       An exception is only raised if we weren't provided a default response.
     """
 
-    for circ in await self.get_circuits():
-      if circ.id == str(circuit_id):
+    tracker = self._circuit_tracker
+
+    if tracker and tracker.is_seeded:
+      circ = tracker.circuit(str(circuit_id))
+
+      if circ is not None:
         return circ
+    else:
+      for circ in await self.get_circuits():
+        if circ.id == str(circuit_id):
+          return circ
 
     raise ValueError("Tor currently does not have a circuit with the id of '%s'" % circuit_id)
 
@@ -3526,6 +6121,12 @@ class Controller(BaseController):
 
     Provides tor's currently available circuits.
 
+    If :func:`~stem.control.Controller.set_circuit_tracking` is enabled this
+    is provided from the circuits we track rather than querying tor.
+
+    .. versionchanged:: 2.0.0
+       Provided from our tracked circuits when circuit tracking is enabled.
+
     :param default: response if the query fails
 
     :returns: **list** of :class:`stem.response.events.CircuitEvent` for our circuits
@@ -3533,6 +6134,11 @@ class Controller(BaseController):
     :raises: :class:`stem.ControllerError` if the call fails and no default was provided
     """
 
+    tracker = self._circuit_tracker
+
+    if tracker and tracker.is_seeded:
+      return tracker.circuits()
+
     circuits = []  # type: List[stem.response.events.CircuitEvent]
     response = await self.get_info('circuit-status')
 
@@ -3709,6 +6315,12 @@ class Controller(BaseController):
 
     Provides the list of streams tor is currently handling.
 
+    If :func:`~stem.control.Controller.set_circuit_tracking` is enabled this
+    is provided from the streams we track rather than querying tor.
+
+    .. versionchanged:: 2.0.0
+       Provided from our tracked streams when circuit tracking is enabled.
+
     :param default: response if the query fails
 
     :returns: list of :class:`stem.response.events.StreamEvent` objects
@@ -3717,6 +6329,11 @@ class Controller(BaseController):
       provided
     """
 
+    tracker = self._circuit_tracker
+
+    if tracker and tracker.is_seeded:
+      return tracker.streams()
+
     streams = []  # type: List[stem.response.events.StreamEvent]
     response = await self.get_info('stream-status')
 
@@ -3743,12 +6360,26 @@ class Controller(BaseController):
       * :class:`stem.OperationFailed` if the stream couldn't be attached for any other reason
     """
 
+    await self._attach_stream(stream_id, circuit_id, exiting_hop)
+
+  async def _attach_stream(self, stream_id: str, circuit_id: str, exiting_hop: Optional[int] = None, immediate: bool = False) -> None:
+    """
+    Attaches a stream to a circuit. See
+    :func:`~stem.control.Controller.attach_stream`.
+
+    :param immediate: sends our request without waiting behind others if
+      **True**
+    """
+
     query = 'ATTACHSTREAM %s %s' % (stream_id, circuit_id)
 
     if exiting_hop:
       query += ' HOP=%s' % exiting_hop
 
-    response = stem.response._convert_to_single_line(await self.msg(query))
+    if immediate:
+      response = stem.response._convert_to_single_line(await self._msg_pipelined(query, immediate = True))
+    else:
+      response = stem.response._convert_to_single_line(await self.msg(query))
 
     if not response.is_ok():
       if response.code == '552':
@@ -3935,11 +6566,40 @@ class Controller(BaseController):
           for event_type in failed_events:
             del self._event_listeners[event_type]
 
+            with self._cache_lock:
+              self._request_cache.invalidate(event_type)
+
           logging_id = 'stem.controller.event_reattach-%s' % '-'.join(failed_events)
           log.log_once(logging_id, log.WARN, 'We were unable to re-attach our event listeners to the new tor instance for: %s' % ', '.join(failed_events))
       except stem.ProtocolError as exc:
         log.warn('Unable to issue the SETEVENTS request to re-attach our listeners (%s)' % exc)
 
+    # our copy of the consensus may be stale, so download it again
+
+    if self._network_status_mirror is not None:
+      self._network_status_mirror = _NetworkStatusMirror()
+
+      async def _reseed_network_status_mirror() -> None:
+        try:
+          await self._seed_network_status_mirror()
+        except stem.ControllerError as exc:
+          log.warn('Unable to download the consensus for our copy of it (%s)' % exc)
+
+      self._loop.create_task(_reseed_network_status_mirror())
+
+    # as are our circuits and streams, so query them again
+
+    if self._circuit_tracker is not None:
+      self._circuit_tracker = _CircuitTracker()
+
+      async def _reseed_circuit_tracker() -> None:
+        try:
+          await self._seed_circuit_tracker()
+        except stem.ControllerError as exc:
+          log.warn('Unable to query the circuits and streams we track (%s)' % exc)
+
+      self._loop.create_task(_reseed_circuit_tracker())
+
     # issue TAKEOWNERSHIP if we're the owning process for this tor instance
 
     owning_pid = await self.get_conf('__OwningControllerProcess', None)
@@ -3962,7 +6622,7 @@ class Controller(BaseController):
     event = None  # type: Optional[stem.response.events.Event]
 
     try:
-      event = stem.response._convert_to_event(event_message)
+      event = stem.response._convert_to_event(event_message, lazy_load = self._is_lazy_event_parsing_enabled)
       event_type = event.type
     except stem.ProtocolError as exc:
       # TODO: We should change this so malformed events convert to the base
@@ -3973,17 +6633,43 @@ class Controller(BaseController):
       log.error('Tor sent a malformed event (%s): %s' % (exc, event_message))
       event_type = MALFORMED_EVENTS
 
+    with self._cache_lock:
+      self._request_cache.invalidate(event_type)
+
+    # listeners are indexed by their event type, so our dispatch cost doesn't
+    # depend on how many event types we're subscribed to, and unless a
+    # listener has a queue of its own we needn't look for one
+
+    if not self._event_listeners.get(event_type):
+      return
+
+    queued_listeners = []  # type: List[_ListenerQueue]
+
     async with self._event_listeners_lock:
-      for listener_type, event_listeners in list(self._event_listeners.items()):
-        if listener_type == event_type:
-          for listener in event_listeners:
-            try:
-              listener_call = listener(event)
+      event_listeners = self._event_listeners.get(event_type, [])
+      listener_queues = self._listener_queues
+
+      for listener in event_listeners:
+        if listener_queues:
+          listener_queue = listener_queues.get(listener)
+
+          if listener_queue is not None:
+            queued_listeners.append(listener_queue)
+            continue
+
+        try:
+          listener_call = listener(event)
+
+          if asyncio.iscoroutine(listener_call):
+            await listener_call
+        except Exception as exc:
+          log.warn('Event listener raised an uncaught exception (%s): %s' % (exc, event))
 
-              if asyncio.iscoroutine(listener_call):
-                await listener_call
-            except Exception as exc:
-              log.warn('Event listener raised an uncaught exception (%s): %s' % (exc, event))
+    # queued listeners are given the event outside our lock since blocking
+    # would otherwise prevent them from adding or removing listeners
+
+    for listener_queue in queued_listeners:
+      await listener_queue.put(event)
 
   async def _attach_listeners(self) -> Tuple[Sequence[str], Sequence[str]]:
     """
@@ -4028,6 +6714,76 @@ class Controller(BaseController):
     return (set_events, failed_events)
 
 
+def _last_descriptor_start(content: bytearray, keyword: bytes) -> int:
+  """
+  Provides where the last descriptor within our content begins, including any
+  annotations that precede it.
+
+  :param content: descriptor content, which may end with a partial descriptor
+  :param keyword: keyword that each descriptor begins with
+
+  :returns: **int** index of the last descriptor, which is zero if our content
+    has at most one descriptor
+  """
+
+  index = len(content)
+
+  while True:
+    index = content.rfind(b'\n' + keyword, 0, index)
+
+    if index == -1:
+      return 0
+
+    keyword_end = index + 1 + len(keyword)
+
+    if content[keyword_end:keyword_end + 1] in (b' ', b'\n'):
+      break
+
+  desc_start = index + 1
+
+  while desc_start > 0:
+    line_start = content.rfind(b'\n', 0, desc_start - 1) + 1
+
+    if content.startswith(b'@', line_start):
+      desc_start = line_start
+    else:
+      break
+
+  return desc_start
+
+
+def _parse_router_status_entries(descriptor_file: BinaryIO) -> Iterator[stem.descriptor.router_status_entry.RouterStatusEntryV3]:
+  """
+  Parses router status entries, as provided by GETINFO ns/all.
+
+  :param descriptor_file: file with router status entry content
+
+  :returns: iterator for the router status entries in the file
+  """
+
+  return stem.descriptor.router_status_entry._parse_file(
+    descriptor_file,
+    False,
+    entry_class = stem.descriptor.router_status_entry.RouterStatusEntryV3,
+  )
+
+
+def _cache_invalidated_by(param: str) -> Tuple[str, ...]:
+  """
+  Provides the event types that invalidate a cached GETINFO parameter.
+
+  :param param: lowercase GETINFO parameter
+
+  :returns: **tuple** of event types, empty if events don't invalidate it
+  """
+
+  for key, event_types in CACHEABLE_GETINFO_PARAMS_UNTIL_EVENT.items():
+    if param == key or (key.endswith('/') and param.startswith(key)):
+      return event_types
+
+  return ()
+
+
 def _parse_circ_path(path: str) -> Sequence[Tuple[str, str]]:
   """
   Parses a circuit path as a list of **(fingerprint, nickname)** tuples. Tor
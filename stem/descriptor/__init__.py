@@ -107,9 +107,12 @@ Package for parsing and processing descriptor data.
 import base64
 import codecs
 import collections
+import concurrent.futures
 import copy
 import hashlib
+import heapq
 import io
+import mmap
 import os
 import random
 import re
@@ -121,7 +124,7 @@ import stem.util.enum
 import stem.util.str_tools
 import stem.util.system
 
-from typing import Any, BinaryIO, Callable, Dict, IO, Iterator, List, Mapping, Optional, Sequence, Tuple, Type, Union
+from typing import Any, BinaryIO, Callable, Dict, IO, Iterator, List, Mapping, Optional, Sequence, Set, Tuple, Type, Union
 
 __all__ = [
   'bandwidth_file',
@@ -153,8 +156,35 @@ KEYWORD_LINE = re.compile('^([%s]+)(?:[%s]+(.*))?$' % (KEYWORD_CHAR, WHITESPACE)
 SPECIFIC_KEYWORD_LINE = '^(%%s)(?:[%s]+(.*))?$' % WHITESPACE
 PGP_BLOCK_START = re.compile('^-----BEGIN ([%s%s]+)-----$' % (KEYWORD_CHAR, WHITESPACE))
 PGP_BLOCK_END = '-----END %s-----'
+KEYWORD_ENDINGS = (b'', b' ', b'\t', b'\n')  # content that can follow a keyword
 EMPTY_COLLECTION = ([], {}, set())  # type: ignore
 
+PARALLEL_CHUNK_SIZE = 1048576  # bytes of descriptor content we provide to a worker at a time
+
+# Types of descriptors that we can split into chunks for parallel parsing,
+# mapped to the keyword that begins each descriptor.
+
+PARALLEL_KEYWORDS = {
+  'server-descriptor': b'router',
+  'bridge-server-descriptor': b'router',
+  'extra-info': b'extra-info',
+  'bridge-extra-info': b'extra-info',
+  'microdescriptor': b'onion-key',
+}
+
+# Descriptor types of the files within tor's data directory.
+
+CACHED_FILE_TYPES = {
+  'cached-descriptors': 'server-descriptor 1.0',
+  'cached-descriptors.new': 'server-descriptor 1.0',
+  'cached-extrainfo': 'extra-info 1.0',
+  'cached-extrainfo.new': 'extra-info 1.0',
+  'cached-microdescs': 'microdescriptor 1.0',
+  'cached-microdescs.new': 'microdescriptor 1.0',
+}
+
+FIELD_KEYWORDS = {}  # type: Dict[Tuple[Type[Descriptor], Tuple[str, ...]], Set[str]] # cache of the keywords that back attributes
+
 DIGEST_TYPE_INFO = b'\x00\x01'
 DIGEST_PADDING = b'\xFF'
 DIGEST_SEPARATOR = b'\x00'
@@ -307,7 +337,7 @@ class SigningKey(collections.namedtuple('SigningKey', ['private', 'public', 'pub
   """
 
 
-def parse_file(descriptor_file: Union[str, BinaryIO, tarfile.TarFile, IO[bytes]], descriptor_type: str = None, validate: bool = False, document_handler: 'stem.descriptor.DocumentHandler' = DocumentHandler.ENTRIES, normalize_newlines: Optional[bool] = None, **kwargs: Any) -> Iterator['stem.descriptor.Descriptor']:
+def parse_file(descriptor_file: Union[str, BinaryIO, tarfile.TarFile, IO[bytes]], descriptor_type: str = None, validate: bool = False, document_handler: 'stem.descriptor.DocumentHandler' = DocumentHandler.ENTRIES, normalize_newlines: Optional[bool] = None, workers: Optional[int] = None, ordered: bool = True, fields: Optional[Sequence[str]] = None, **kwargs: Any) -> Iterator['stem.descriptor.Descriptor']:
   """
   Simple function to read the descriptor contents from a file, providing an
   iterator for its :class:`~stem.descriptor.__init__.Descriptor` contents.
@@ -346,6 +376,10 @@ def parse_file(descriptor_file: Union[str, BinaryIO, tarfile.TarFile, IO[bytes]]
   hidden-service-descriptor 1.0             :class:`~stem.descriptor.hidden_service.HiddenServiceDescriptorV2`
   ========================================= =====
 
+  Regular files that we're given the path of are memory-mapped, so we parse
+  directly from the page cache rather than reading them through a series of
+  syscalls and copies.
+
   If you're using **python 3** then beware that the open() function defaults to
   using text mode. **Binary mode** is strongly suggested because it's both
   faster (by my testing by about 33x) and doesn't do universal newline
@@ -355,6 +389,28 @@ def parse_file(descriptor_file: Union[str, BinaryIO, tarfile.TarFile, IO[bytes]]
 
     my_descriptor_file = open(descriptor_path, 'rb')
 
+  Parsing is bound by a single core, so large files and archives can be parsed
+  in a pool of **workers** processes instead. Server, extra-info, and
+  microdescriptor files are split at descriptor boundaries into chunks for our
+  workers, whereas archives are split by their files. Other documents are
+  parsed within this process.
+
+  ::
+
+    for desc in parse_file('/path/to/server-descriptors-2020-05.tar', workers = 32):
+      print(desc.fingerprint)
+
+  If you only need a few attributes of server, extra-info, or microdescriptors
+  you can limit parsing to just those **fields**. Lines for other fields are
+  skipped, and attempting to access them raises an **AttributeError**. This
+  is ignored for other descriptor types, and when validating since that
+  requires the full descriptor.
+
+  ::
+
+    for desc in parse_file('/path/to/cached-descriptors', fields = ('fingerprint', 'observed_bandwidth')):
+      print('%s: %i' % (desc.fingerprint, desc.observed_bandwidth))
+
   :param descriptor_file: path or opened file with the descriptor contents
   :param descriptor_type: `descriptor type <https://metrics.torproject.org/collector.html#data-formats>`_, this is guessed if not provided
   :param validate: checks the validity of the descriptor's content if **True**,
@@ -363,6 +419,11 @@ def parse_file(descriptor_file: Union[str, BinaryIO, tarfile.TarFile, IO[bytes]]
     :class:`~stem.descriptor.networkstatus.NetworkStatusDocument`
   :param normalize_newlines: converts windows newlines (CRLF), this is the
     default when reading data directories on windows
+  :param workers: number of processes to parse descriptors with
+  :param ordered: provides descriptors in the order that they appear if
+    **True**, otherwise they're provided as our workers finish them
+  :param fields: only parse these attributes of server, extra-info, and
+    microdescriptors
   :param kwargs: additional arguments for the descriptor constructor
 
   :returns: iterator for :class:`~stem.descriptor.__init__.Descriptor` instances in the file
@@ -371,6 +432,15 @@ def parse_file(descriptor_file: Union[str, BinaryIO, tarfile.TarFile, IO[bytes]]
     * **ValueError** if the contents is malformed and validate is True
     * **TypeError** if we can't match the contents of the file to a descriptor type
     * **OSError** if unable to read from the descriptor_file
+
+  .. versionchanged:: 2.0.0
+     Regular files are memory-mapped when given their path.
+
+  .. versionchanged:: 2.0.0
+     Added the workers and ordered arguments.
+
+  .. versionchanged:: 2.0.0
+     Added the fields argument.
   """
 
   # Delegate to a helper if this is a path or tarfile.
@@ -386,7 +456,7 @@ def parse_file(descriptor_file: Union[str, BinaryIO, tarfile.TarFile, IO[bytes]]
     handler = _parse_file_for_tarfile
 
   if handler:
-    for desc in handler(descriptor_file, descriptor_type, validate, document_handler, **kwargs):
+    for desc in handler(descriptor_file, descriptor_type, validate, document_handler, workers = workers, ordered = ordered, fields = fields, **kwargs):
       yield desc
 
     return
@@ -394,6 +464,15 @@ def parse_file(descriptor_file: Union[str, BinaryIO, tarfile.TarFile, IO[bytes]]
   if not descriptor_file.seekable():  # type: ignore
     raise OSError(UNSEEKABLE_MSG)
 
+  if workers is not None and workers > 1:
+    tasks = _parallel_tasks_for_file(descriptor_file, descriptor_type, normalize_newlines)  # type: ignore
+
+    if tasks is not None:
+      for desc in _parse_in_parallel(tasks, workers, ordered, validate, document_handler, fields = fields, **kwargs):
+        yield desc
+
+      return
+
   # The tor descriptor specifications do not provide a reliable method for
   # identifying a descriptor file's type and version so we need to guess
   # based on its filename. Metrics descriptors, however, can be identified
@@ -418,14 +497,14 @@ def parse_file(descriptor_file: Union[str, BinaryIO, tarfile.TarFile, IO[bytes]]
 
       if descriptor_type_match:
         desc_type, major_version, minor_version = descriptor_type_match.groups()
-        return _parse_metrics_file(desc_type, int(major_version), int(minor_version), descriptor_file, validate, document_handler, **kwargs)
+        return _parse_metrics_file(desc_type, int(major_version), int(minor_version), descriptor_file, validate, document_handler, fields, **kwargs)
       else:
         raise ValueError("The descriptor_type must be of the form '<type> <major_version>.<minor_version>'")
     elif metrics_header_match:
       # Metrics descriptor handling
 
       desc_type, major_version, minor_version = metrics_header_match.groups()
-      return _parse_metrics_file(desc_type, int(major_version), int(minor_version), descriptor_file, validate, document_handler, **kwargs)
+      return _parse_metrics_file(desc_type, int(major_version), int(minor_version), descriptor_file, validate, document_handler, fields, **kwargs)
     else:
       # Cached descriptor handling. These contain multiple descriptors per file.
 
@@ -433,11 +512,11 @@ def parse_file(descriptor_file: Union[str, BinaryIO, tarfile.TarFile, IO[bytes]]
         descriptor_file = NewlineNormalizer(descriptor_file)  # type: ignore
 
       if filename == 'cached-descriptors' or filename == 'cached-descriptors.new':
-        return stem.descriptor.server_descriptor._parse_file(descriptor_file, validate = validate, **kwargs)
+        return stem.descriptor.server_descriptor._parse_file(descriptor_file, validate = validate, fields = fields, **kwargs)
       elif filename == 'cached-extrainfo' or filename == 'cached-extrainfo.new':
-        return stem.descriptor.extrainfo_descriptor._parse_file(descriptor_file, validate = validate, **kwargs)
+        return stem.descriptor.extrainfo_descriptor._parse_file(descriptor_file, validate = validate, fields = fields, **kwargs)
       elif filename == 'cached-microdescs' or filename == 'cached-microdescs.new':
-        return stem.descriptor.microdescriptor._parse_file(descriptor_file, validate = validate, **kwargs)
+        return stem.descriptor.microdescriptor._parse_file(descriptor_file, validate = validate, fields = fields, **kwargs)
       elif filename == 'cached-consensus':
         return stem.descriptor.networkstatus._parse_file(descriptor_file, validate = validate, document_handler = document_handler, **kwargs)
       elif filename == 'cached-microdesc-consensus':
@@ -453,7 +532,21 @@ def parse_file(descriptor_file: Union[str, BinaryIO, tarfile.TarFile, IO[bytes]]
 
 
 def _parse_file_for_path(descriptor_file: str, *args: Any, **kwargs: Any) -> Iterator['stem.descriptor.Descriptor']:
-  with open(descriptor_file, 'rb') as desc_file:
+  # Regular files are memory-mapped so we can parse directly from them. Empty
+  # files can't be mapped, nor can some special files, so those are read.
+
+  desc_file = None  # type: Any
+
+  if os.path.isfile(descriptor_file):
+    try:
+      desc_file = _MappedFile(descriptor_file)
+    except (OSError, ValueError):
+      pass
+
+  if desc_file is None:
+    desc_file = open(descriptor_file, 'rb')
+
+  with desc_file:
     for desc in parse_file(desc_file, *args, **kwargs):
       yield desc
 
@@ -465,7 +558,15 @@ def _parse_file_for_tar_path(descriptor_file: str, *args: Any, **kwargs: Any) ->
       yield desc
 
 
-def _parse_file_for_tarfile(descriptor_file: tarfile.TarFile, *args: Any, **kwargs: Any) -> Iterator['stem.descriptor.Descriptor']:
+def _parse_file_for_tarfile(descriptor_file: tarfile.TarFile, *args: Any, workers: Optional[int] = None, ordered: bool = True, **kwargs: Any) -> Iterator['stem.descriptor.Descriptor']:
+  if workers is not None and workers > 1:
+    descriptor_type, validate, document_handler = args
+
+    for desc in _parse_in_parallel(_parallel_tasks_for_tarfile(descriptor_file, descriptor_type), workers, ordered, validate, document_handler, **kwargs):
+      yield desc
+
+    return
+
   for tar_entry in descriptor_file:
     if tar_entry.isfile():
       entry = descriptor_file.extractfile(tar_entry)
@@ -481,7 +582,218 @@ def _parse_file_for_tarfile(descriptor_file: tarfile.TarFile, *args: Any, **kwar
         entry.close()
 
 
-def _parse_metrics_file(descriptor_type: str, major_version: int, minor_version: int, descriptor_file: BinaryIO, validate: bool, document_handler: 'stem.descriptor.DocumentHandler', **kwargs: Any) -> Iterator['stem.descriptor.Descriptor']:
+def _parallel_tasks_for_file(descriptor_file: BinaryIO, descriptor_type: Optional[str], normalize_newlines: Optional[bool]) -> Optional[Iterator[Tuple[Optional[str], Optional[bool], List[Tuple[bytes, Optional[str], Optional[str]]]]]]:
+  """
+  Splits a file into chunks of descriptors that can be parsed independently.
+
+  :param descriptor_file: file with descriptor content
+  :param descriptor_type: type of the descriptors, this is guessed if not
+    provided
+  :param normalize_newlines: converts windows newlines (CRLF)
+
+  :returns: iterator of (descriptor_type, normalize_newlines, entries) tasks
+    for our workers, or **None** if our file can't be split
+  """
+
+  initial_position = descriptor_file.tell()
+  first_line = stem.util.str_tools._to_unicode(descriptor_file.readline().strip())
+  metrics_header_match = re.match('^@type (\\S+) (\\d+).(\\d+)$', first_line)
+
+  if descriptor_type is None:
+    if metrics_header_match:
+      descriptor_type = '%s %s.%s' % metrics_header_match.groups()
+    else:
+      descriptor_type = CACHED_FILE_TYPES.get(os.path.basename(getattr(descriptor_file, 'name', None) or ''))
+
+      if descriptor_type and normalize_newlines is None and stem.util.system.is_windows():
+        normalize_newlines = True
+
+  keyword = PARALLEL_KEYWORDS.get(descriptor_type.split(' ', 1)[0]) if descriptor_type else None
+
+  if keyword is None:
+    descriptor_file.seek(initial_position)
+    return None
+  elif not metrics_header_match:
+    descriptor_file.seek(initial_position)
+
+  content, start, end = _read_remaining(descriptor_file)
+  name = getattr(descriptor_file, 'name', None)
+
+  def tasks() -> Iterator[Tuple[Optional[str], Optional[bool], List[Tuple[bytes, Optional[str], Optional[str]]]]]:
+    for chunk_start, chunk_end in _descriptor_chunks(content, keyword, start, end, PARALLEL_CHUNK_SIZE):
+      yield descriptor_type, normalize_newlines, [(bytes(content[chunk_start:chunk_end]), name, None)]
+
+  return tasks()
+
+
+def _parallel_tasks_for_tarfile(descriptor_file: tarfile.TarFile, descriptor_type: Optional[str]) -> Iterator[Tuple[Optional[str], Optional[bool], List[Tuple[bytes, Optional[str], Optional[str]]]]]:
+  """
+  Groups the files of an archive into chunks for our workers.
+
+  :param descriptor_file: archive with descriptor files
+  :param descriptor_type: type of the descriptors, this is guessed if not
+    provided
+
+  :returns: iterator of (descriptor_type, normalize_newlines, entries) tasks
+    for our workers
+  """
+
+  entries, entries_size = [], 0
+
+  for tar_entry in descriptor_file:
+    if tar_entry.isfile() and tar_entry.size > 0:
+      entry = descriptor_file.extractfile(tar_entry)
+
+      try:
+        entries.append((entry.read(), entry.name, entry.name))
+        entries_size += tar_entry.size
+      finally:
+        entry.close()
+
+      if entries_size >= PARALLEL_CHUNK_SIZE:
+        yield descriptor_type, None, entries
+        entries, entries_size = [], 0
+
+  if entries:
+    yield descriptor_type, None, entries
+
+
+def _descriptor_chunks(content: bytes, keyword: bytes, start: int, end: int, chunk_size: int) -> Iterator[Tuple[int, int]]:
+  """
+  Splits content into ranges of roughly the given size, each of which begins
+  with a descriptor (including the annotations that precede it).
+
+  :param content: descriptor content, such as **bytes** or an **mmap**
+  :param keyword: keyword that each descriptor begins with
+  :param start: index to split our content from
+  :param end: index to split our content until
+  :param chunk_size: minimum size of our ranges, except the last
+
+  :returns: iterator of (start, end) tuples for our ranges
+  """
+
+  position = start
+
+  while position < end:
+    search_from = min(position + chunk_size, end)
+
+    while True:
+      boundary = _find_line(content, keyword, search_from, end)
+
+      if boundary == -1:
+        boundary = end
+        break
+
+      search_from = boundary + 1
+
+      # include the annotations that precede the descriptor
+
+      while boundary > position:
+        newline = content.rfind(b'\n', position, boundary - 1)
+        line_start = position if newline == -1 else newline + 1
+
+        if content[line_start:line_start + 1] != b'@':
+          break
+
+        boundary = line_start
+
+      if boundary > position:
+        break
+
+    yield position, boundary
+    position = boundary
+
+
+def _parse_in_parallel(tasks: Iterator[Tuple[Optional[str], Optional[bool], List[Tuple[bytes, Optional[str], Optional[str]]]]], workers: int, ordered: bool, validate: bool, document_handler: 'stem.descriptor.DocumentHandler', **kwargs: Any) -> Iterator['stem.descriptor.Descriptor']:
+  """
+  Parses descriptors within a pool of processes. Only a couple tasks per
+  worker are in flight at a time, so we don't read far ahead of our caller.
+
+  :param tasks: iterator of (descriptor_type, normalize_newlines, entries)
+    tuples, where entries are the (content, name, archive_path) of files
+  :param workers: number of processes to parse with
+  :param ordered: provides descriptors in the order of our tasks if **True**,
+    otherwise as they're parsed
+  :param validate: checks the validity of the descriptor's content if
+    **True**, skips these checks otherwise
+  :param document_handler: method in which to parse network status documents
+  :param kwargs: additional arguments for the descriptor constructor
+
+  :returns: iterator for the descriptors that our workers parse
+  """
+
+  def next_results(pending: List[concurrent.futures.Future]) -> List['stem.descriptor.Descriptor']:
+    if ordered:
+      return pending.pop(0).result()
+
+    done, _ = concurrent.futures.wait(pending, return_when = concurrent.futures.FIRST_COMPLETED)
+    results = []
+
+    for future in done:
+      pending.remove(future)
+      results += future.result()
+
+    return results
+
+  with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+    pending = []  # type: List[concurrent.futures.Future]
+
+    try:
+      for descriptor_type, normalize_newlines, entries in tasks:
+        pending.append(executor.submit(_parse_in_worker, entries, descriptor_type, validate, document_handler, normalize_newlines, kwargs))
+
+        while len(pending) >= workers * 2:
+          for desc in next_results(pending):
+            yield desc
+
+      while pending:
+        for desc in next_results(pending):
+          yield desc
+    finally:
+      for future in pending:
+        future.cancel()
+
+
+def _parse_in_worker(entries: List[Tuple[bytes, Optional[str], Optional[str]]], descriptor_type: Optional[str], validate: bool, document_handler: 'stem.descriptor.DocumentHandler', normalize_newlines: Optional[bool], kwargs: Dict[str, Any]) -> List['stem.descriptor.Descriptor']:
+  """
+  Parses a chunk of descriptors within a worker process.
+
+  :param entries: (content, name, archive_path) of the files to parse
+  :param descriptor_type: type of the descriptors, this is guessed if not
+    provided
+  :param validate: checks the validity of the descriptor's content if
+    **True**, skips these checks otherwise
+  :param document_handler: method in which to parse network status documents
+  :param normalize_newlines: converts windows newlines (CRLF)
+  :param kwargs: additional arguments for the descriptor constructor
+
+  :returns: **list** of descriptors that we parsed
+  """
+
+  descriptors = []
+
+  for content, name, archive_path in entries:
+    descriptor_file = io.BytesIO(content)
+
+    if name is not None:
+      descriptor_file.name = name  # type: ignore
+
+    for desc in parse_file(descriptor_file, descriptor_type, validate, document_handler, normalize_newlines, **kwargs):
+      if archive_path is not None:
+        desc._set_archive_path(archive_path)
+
+      # Lazy loading would otherwise defer parsing to our caller's process.
+      # Descriptor types that don't support fields parse all their attributes.
+
+      for attr in kwargs['fields'] if desc._keywords is not None else desc.ATTRIBUTES:
+        getattr(desc, attr)
+
+      descriptors.append(desc)
+
+  return descriptors
+
+
+def _parse_metrics_file(descriptor_type: str, major_version: int, minor_version: int, descriptor_file: BinaryIO, validate: bool, document_handler: 'stem.descriptor.DocumentHandler', fields: Optional[Sequence[str]] = None, **kwargs: Any) -> Iterator['stem.descriptor.Descriptor']:
   # Parses descriptor files from metrics, yielding individual descriptors. This
   # throws a TypeError if the descriptor_type or version isn't recognized.
 
@@ -490,19 +802,19 @@ def _parse_metrics_file(descriptor_type: str, major_version: int, minor_version:
   document_type = None  # type: Optional[Type]
 
   if descriptor_type == stem.descriptor.server_descriptor.RelayDescriptor.TYPE_ANNOTATION_NAME and major_version == 1:
-    for desc in stem.descriptor.server_descriptor._parse_file(descriptor_file, is_bridge = False, validate = validate, **kwargs):
+    for desc in stem.descriptor.server_descriptor._parse_file(descriptor_file, is_bridge = False, validate = validate, fields = fields, **kwargs):
       yield desc
   elif descriptor_type == stem.descriptor.server_descriptor.BridgeDescriptor.TYPE_ANNOTATION_NAME and major_version == 1:
-    for desc in stem.descriptor.server_descriptor._parse_file(descriptor_file, is_bridge = True, validate = validate, **kwargs):
+    for desc in stem.descriptor.server_descriptor._parse_file(descriptor_file, is_bridge = True, validate = validate, fields = fields, **kwargs):
       yield desc
   elif descriptor_type == stem.descriptor.extrainfo_descriptor.RelayExtraInfoDescriptor.TYPE_ANNOTATION_NAME and major_version == 1:
-    for desc in stem.descriptor.extrainfo_descriptor._parse_file(descriptor_file, is_bridge = False, validate = validate, **kwargs):
+    for desc in stem.descriptor.extrainfo_descriptor._parse_file(descriptor_file, is_bridge = False, validate = validate, fields = fields, **kwargs):
       yield desc
   elif descriptor_type == stem.descriptor.microdescriptor.Microdescriptor.TYPE_ANNOTATION_NAME and major_version == 1:
-    for desc in stem.descriptor.microdescriptor._parse_file(descriptor_file, validate = validate, **kwargs):
+    for desc in stem.descriptor.microdescriptor._parse_file(descriptor_file, validate = validate, fields = fields, **kwargs):
       yield desc
   elif descriptor_type == stem.descriptor.extrainfo_descriptor.BridgeExtraInfoDescriptor.TYPE_ANNOTATION_NAME and major_version == 1:
-    for desc in stem.descriptor.extrainfo_descriptor._parse_file(descriptor_file, is_bridge = True, validate = validate, **kwargs):
+    for desc in stem.descriptor.extrainfo_descriptor._parse_file(descriptor_file, is_bridge = True, validate = validate, fields = fields, **kwargs):
       yield desc
   elif descriptor_type == stem.descriptor.networkstatus.NetworkStatusDocumentV2.TYPE_ANNOTATION_NAME and major_version == 1:
     document_type = stem.descriptor.networkstatus.NetworkStatusDocumentV2
@@ -826,6 +1138,7 @@ class Descriptor(object):
     self._entries = {}  # type: ENTRY_TYPE
     self._hash = None  # type: Optional[int]
     self._unrecognized_lines = []  # type: List[str]
+    self._keywords = None  # type: Optional[Set[str]] # keywords we retained, if parsed with only some fields
 
   @classmethod
   def from_str(cls, content: str, **kwargs: Any) -> Union['stem.descriptor.Descriptor', List['stem.descriptor.Descriptor']]:
@@ -1027,6 +1340,35 @@ class Descriptor(object):
         if validate:
           raise
 
+  @classmethod
+  def _keywords_for(cls, fields: Sequence[str]) -> Set[str]:
+    """
+    Provides the keywords of the lines that our attributes are parsed from.
+
+    :param fields: attributes to provide the keywords for
+
+    :returns: **set** of keywords that back these attributes
+
+    :raises: **ValueError** if we don't have one of these attributes
+    """
+
+    cache_key = (cls, tuple(fields))
+    keywords = FIELD_KEYWORDS.get(cache_key)
+
+    if keywords is None:
+      parsers = set()
+
+      for field in fields:
+        if field not in cls.ATTRIBUTES:
+          raise ValueError("%s doesn't have a '%s' attribute" % (cls.__name__, field))
+
+        parsers.add(cls.ATTRIBUTES[field][1])
+
+      keywords = frozenset([keyword for keyword, parser in cls.PARSER_FOR_LINE.items() if parser in parsers])
+      FIELD_KEYWORDS[cache_key] = keywords
+
+    return keywords
+
   def _set_path(self, path: str) -> None:
     self._path = path
 
@@ -1150,6 +1492,9 @@ class Descriptor(object):
       default, parsing_function = self.ATTRIBUTES[name]
 
       if self._lazy_loading:
+        if self._keywords is not None and not self._keywords_for([name]).issubset(self._keywords):
+          raise AttributeError("%s was parsed without its '%s' field" % (type(self).__name__, name))
+
         try:
           parsing_function(self, self._entries)
         except (ValueError, KeyError):
@@ -1218,11 +1563,54 @@ class NewlineNormalizer(object):
     return self._wrapped_file.tell(*args)
 
 
-def _read_until_keywords(keywords: Union[str, Sequence[str]], descriptor_file: BinaryIO, inclusive: bool = False, ignore_first: bool = False, skip: bool = False, end_position: Optional[int] = None) -> List[bytes]:
-  return _read_until_keywords_with_ending_keyword(keywords, descriptor_file, inclusive, ignore_first, skip, end_position, include_ending_keyword = False)  # type: ignore
+class _MappedFile(object):
+  """
+  Read-only file whose content is memory-mapped. Descriptor parsers can search
+  and slice our mapping directly rather than reading it.
+
+  :var str name: path of the file
+  :var mmap.mmap mapping: content of the file
+  """
+
+  def __init__(self, path: str) -> None:
+    with open(path, 'rb') as desc_file:
+      self.mapping = mmap.mmap(desc_file.fileno(), 0, access = mmap.ACCESS_READ)
+
+    self.name = path
+
+  def read(self, size: int = -1) -> bytes:
+    return self.mapping.read(size)
+
+  def readline(self) -> bytes:
+    return self.mapping.readline()
+
+  def readlines(self) -> List[bytes]:
+    return list(iter(self.mapping.readline, b''))
+
+  def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+    self.mapping.seek(offset, whence)
+    return self.mapping.tell()
+
+  def seekable(self) -> bool:
+    return True
 
+  def tell(self) -> int:
+    return self.mapping.tell()
 
-def _read_until_keywords_with_ending_keyword(keywords: Union[str, Sequence[str]], descriptor_file: BinaryIO, inclusive: bool = False, ignore_first: bool = False, skip: bool = False, end_position: Optional[int] = None, include_ending_keyword: bool = False) -> Tuple[List[bytes], str]:
+  def close(self) -> None:
+    try:
+      self.mapping.close()
+    except BufferError:
+      pass  # slices of the mapping remain, so it's closed once they're freed
+
+  def __enter__(self) -> '_MappedFile':
+    return self
+
+  def __exit__(self, exit_type: Optional[Type[BaseException]], value: Optional[BaseException], traceback: Any) -> None:
+    self.close()
+
+
+def _read_until_keywords(keywords: Union[str, Sequence[str]], descriptor_file: BinaryIO, inclusive: bool = False, ignore_first: bool = False, skip: bool = False, end_position: Optional[int] = None) -> List[bytes]:
   """
   Reads from the descriptor file until we get to one of the given keywords or reach the
   end of the file.
@@ -1234,27 +1622,23 @@ def _read_until_keywords_with_ending_keyword(keywords: Union[str, Sequence[str]]
     given keywords
   :param skip: skips buffering content, returning None
   :param end_position: end if we reach this point in the file
-  :param include_ending_keyword: provides the keyword we broke on if **True**
 
-  :returns: **list** with the lines until we find one of the keywords, this is
-    a two value tuple with the ending keyword if include_ending_keyword is
-    **True**
+  :returns: **list** with the lines until we find one of the keywords
   """
 
   content = None if skip else []  # type: Optional[List[bytes]]
-  ending_keyword = None
 
   if isinstance(keywords, (bytes, str)):
     keywords = (keywords,)
 
+  keywords = tuple(map(stem.util.str_tools._to_bytes, keywords))
+
   if ignore_first:
     first_line = descriptor_file.readline()
 
     if first_line and content is not None:
       content.append(first_line)
 
-  keyword_match = re.compile(SPECIFIC_KEYWORD_LINE % '|'.join(keywords))
-
   while True:
     last_position = descriptor_file.tell()
 
@@ -1266,11 +1650,7 @@ def _read_until_keywords_with_ending_keyword(keywords: Union[str, Sequence[str]]
     if not line:
       break  # EOF
 
-    line_match = keyword_match.match(stem.util.str_tools._to_unicode(line))
-
-    if line_match:
-      ending_keyword = line_match.groups()[0]
-
+    if _starts_with_keyword(line, keywords):
       if not inclusive:
         descriptor_file.seek(last_position)
       elif content is not None:
@@ -1280,64 +1660,209 @@ def _read_until_keywords_with_ending_keyword(keywords: Union[str, Sequence[str]]
     elif content is not None:
       content.append(line)
 
-  if include_ending_keyword:
-    return (content, ending_keyword)
+  return content  # type: ignore
+
+
+def _read_remaining(descriptor_file: BinaryIO, end_position: Optional[int] = None) -> Tuple[bytes, int, int]:
+  """
+  Provides the remainder of a descriptor file. Memory-mapped files provide
+  their mapping rather than copying its content.
+
+  :param descriptor_file: file with the descriptor content
+  :param end_position: read until this point in the file rather than its end
+
+  :returns: **tuple** of the form (content, start, end), where our start and
+    end are the range of the content that remains
+  """
+
+  if isinstance(descriptor_file, _MappedFile):
+    mapping = descriptor_file.mapping
+    start = mapping.tell()
+    end = len(mapping) if end_position is None else max(start, min(end_position, len(mapping)))
+    mapping.seek(end)
+
+    return mapping, start, end  # type: ignore
+  elif end_position is None:
+    content = descriptor_file.read()
   else:
-    return content  # type: ignore
+    content = descriptor_file.read(max(0, end_position - descriptor_file.tell()))
 
+  return content, 0, len(content)
 
-def _bytes_for_block(content: str) -> bytes:
+
+def _starts_with_keyword(content: bytes, keywords: Sequence[bytes], index: int = 0) -> Optional[bytes]:
   """
-  Provides the base64 decoded content of a pgp-style block.
+  Checks if content has a keyword line at the given index.
 
-  :param content: block to be decoded
+  :param content: descriptor content
+  :param keywords: keywords to check for
+  :param index: start of the line
 
-  :returns: decoded block content
+  :returns: **bytes** with the keyword that begins our line, or **None** if it
+    doesn't begin with any of them
+  """
 
-  :raises: **TypeError** if this isn't base64 encoded content
+  for keyword in keywords:
+    keyword_end = index + len(keyword)
+
+    if content[index:keyword_end] == keyword and content[keyword_end:keyword_end + 1] in KEYWORD_ENDINGS:
+      return keyword
+
+  return None
+
+
+def _line_end(content: bytes, index: int, end: Optional[int] = None) -> int:
   """
+  Provides where the line containing an index ends.
 
-  # strip the '-----BEGIN RSA PUBLIC KEY-----' header and footer
+  :param content: descriptor content
+  :param index: position within the line
+  :param end: index our content ends at
 
-  content = ''.join(content.split('\n')[1:-1])
+  :returns: **int** index just after the line's newline, or the end of our
+    content if it lacks one
+  """
 
-  return base64.b64decode(stem.util.str_tools._to_bytes(content))
+  if end is None:
+    end = len(content)
 
+  newline = content.find(b'\n', index, end)
+  return end if newline == -1 else newline + 1
 
-def _get_pseudo_pgp_block(remaining_contents: List[str]) -> Tuple[str, str]:
+
+def _find_line(content: bytes, prefix: bytes, start: int = 0, end: Optional[int] = None, is_keyword: bool = True) -> int:
+  """
+  Locates the first line at or after an index that begins with the given
+  prefix. Rather than reading line by line this searches for the prefix with
+  bytes.find(), so content is scanned in C.
+
+  :param content: descriptor content, such as **bytes** or an **mmap**
+  :param prefix: content the line begins with
+  :param start: index to search from
+  :param end: index to search until
+  :param is_keyword: only match lines where our prefix is followed by
+    whitespace or the end of the line
+
+  :returns: **int** index where the line begins, or -1 if there isn't one
   """
-  Checks if given contents begins with a pseudo-Open-PGP-style block and, if
-  so, pops it off and provides it back to the caller.
 
-  :param remaining_contents: lines to be checked for a public key block
+  if end is None:
+    end = len(content)
+
+  if (start == 0 or content[start - 1:start] == b'\n') and content[start:start + len(prefix)] == prefix and start + len(prefix) <= end:
+    if not is_keyword or content[start + len(prefix):start + len(prefix) + 1] in KEYWORD_ENDINGS:
+      return start
+
+  needle = b'\n' + prefix
+  index = start
+
+  while True:
+    index = content.find(needle, index, end)
+
+    if index == -1:
+      return -1
+
+    prefix_end = index + len(needle)
+
+    if not is_keyword or content[prefix_end:prefix_end + 1] in KEYWORD_ENDINGS:
+      return index + 1
 
-  :returns: **tuple** of the (block_type, content) or None if it doesn't exist
+    index = prefix_end
 
-  :raises: **ValueError** if the contents starts with a key block but it's
-    malformed (for instance, if it lacks an ending line)
+
+def _find_lines(content: bytes, prefixes: Sequence[bytes], start: int = 0, end: Optional[int] = None, is_keyword: bool = True) -> Iterator[Tuple[int, bytes]]:
+  """
+  Provides the lines that begin with any of the given prefixes, in order. Each
+  prefix's next occurrence is retained so content is only scanned once for
+  each of them.
+
+  :param content: descriptor content, such as **bytes** or an **mmap**
+  :param prefixes: content the lines begin with
+  :param start: index to search from
+  :param end: index to search until
+  :param is_keyword: only match lines where a prefix is followed by
+    whitespace or the end of the line
+
+  :returns: iterator of (index, prefix) tuples for the lines we find
   """
 
-  if not remaining_contents:
-    return None  # nothing left
+  upcoming = []
 
-  block_match = PGP_BLOCK_START.match(remaining_contents[0])
+  for prefix in prefixes:
+    index = _find_line(content, prefix, start, end, is_keyword)
 
-  if block_match:
-    block_type = block_match.groups()[0]
-    block_lines = []  # type: List[str]
-    end_line = PGP_BLOCK_END % block_type
+    if index != -1:
+      upcoming.append((index, prefix))
 
-    while True:
-      if not remaining_contents:
-        raise ValueError("Unterminated pgp style block (looking for '%s'):\n%s" % (end_line, '\n'.join(block_lines)))
+  heapq.heapify(upcoming)
 
-      line = remaining_contents.pop(0)
-      block_lines.append(line)
+  while upcoming:
+    index, prefix = upcoming[0]
+    yield index, prefix
 
-      if line == end_line:
-        return (block_type, '\n'.join(block_lines))
-  else:
-    return None
+    next_index = _find_line(content, prefix, index + 1, end, is_keyword)
+
+    if next_index == -1:
+      heapq.heappop(upcoming)
+    else:
+      heapq.heapreplace(upcoming, (next_index, prefix))
+
+
+def _split_descriptors(content: bytes, ending_keyword: bytes, with_signature: bool = False, skip_annotations: bool = False, start: int = 0, end: Optional[int] = None) -> Iterator[memoryview]:
+  """
+  Splits content into the descriptors it contains, each of which ends with a
+  line for the given keyword. Descriptors are provided as slices of our
+  content, so they aren't copied until the caller needs them.
+
+  :param content: descriptor content, such as **bytes** or an **mmap**
+  :param ending_keyword: keyword of the last line of each descriptor
+  :param with_signature: descriptors end with the pgp style block that
+    follows the keyword's line (such as a 'router-signature')
+  :param skip_annotations: omits '@' annotation lines that precede our
+    descriptors
+  :param start: index to split our content from
+  :param end: index to split our content until
+
+  :returns: iterator of **memoryview** for each descriptor's content
+  """
+
+  view = memoryview(content)
+  position, content_end = start, len(content) if end is None else end
+
+  while position < content_end:
+    if skip_annotations:
+      while position < content_end and content[position:position + 1] == b'@':
+        position = _line_end(content, position, content_end)
+
+      if position >= content_end:
+        break
+
+    desc_end = _find_line(content, ending_keyword, position, content_end)
+
+    if desc_end != -1 and with_signature:
+      desc_end = _find_line(content, PGP_BLOCK_END.split(' ', 1)[0].encode('utf-8'), desc_end, content_end)
+
+    desc_end = content_end if desc_end == -1 else _line_end(content, desc_end, content_end)
+    yield view[position:desc_end]
+    position = desc_end
+
+
+def _bytes_for_block(content: str) -> bytes:
+  """
+  Provides the base64 decoded content of a pgp-style block.
+
+  :param content: block to be decoded
+
+  :returns: decoded block content
+
+  :raises: **TypeError** if this isn't base64 encoded content
+  """
+
+  # strip the '-----BEGIN RSA PUBLIC KEY-----' header and footer
+
+  content = ''.join(content.split('\n')[1:-1])
+
+  return base64.b64decode(stem.util.str_tools._to_bytes(content))
 
 
 def create_signing_key(private_key: Optional['cryptography.hazmat.backends.openssl.rsa._RSAPrivateKey'] = None) -> 'stem.descriptor.SigningKey':  # type: ignore
@@ -1441,11 +1966,11 @@ def _random_crypto_blob(block_type: Optional[str] = None) -> str:
     return crypto_blob
 
 
-def _descriptor_components(raw_contents: bytes, validate: bool, non_ascii_fields: Sequence[str] = ()) -> ENTRY_TYPE:
-  return _descriptor_components_with_extra(raw_contents, validate, (), non_ascii_fields)  # type: ignore
+def _descriptor_components(raw_contents: bytes, validate: bool, non_ascii_fields: Sequence[str] = (), keywords: Optional[Set[str]] = None) -> ENTRY_TYPE:
+  return _descriptor_components_with_extra(raw_contents, validate, (), non_ascii_fields, keywords)  # type: ignore
 
 
-def _descriptor_components_with_extra(raw_contents: bytes, validate: bool, extra_keywords: Sequence[str] = (), non_ascii_fields: Sequence[str] = ()) -> Tuple[ENTRY_TYPE, List[str]]:
+def _descriptor_components_with_extra(raw_contents: bytes, validate: bool, extra_keywords: Sequence[str] = (), non_ascii_fields: Sequence[str] = (), keywords: Optional[Set[str]] = None) -> Tuple[ENTRY_TYPE, List[str]]:
   """
   Initial breakup of the server descriptor contents to make parsing easier.
 
@@ -1465,6 +1990,8 @@ def _descriptor_components_with_extra(raw_contents: bytes, validate: bool, extra
   :param extra_keywords: entity keywords to put into a separate listing
     with ordering intact
   :param non_ascii_fields: fields containing non-ascii content
+  :param keywords: only retain lines with these keywords, this is ignored if
+    validating
 
   :returns:
     **collections.OrderedDict** with the 'keyword => (value, pgp key) entries'
@@ -1472,12 +1999,22 @@ def _descriptor_components_with_extra(raw_contents: bytes, validate: bool, extra
     value tuple, the second being a list of those entries.
   """
 
+  if keywords is not None and not validate:
+    return _projected_components(raw_contents, keywords, extra_keywords)
+
   entries = collections.OrderedDict()  # type: ENTRY_TYPE
   extra_entries = []  # entries with a keyword in extra_keywords
-  remaining_lines = stem.util.str_tools._to_unicode(raw_contents).split('\n')
+  content = stem.util.str_tools._to_unicode(raw_contents)
+  lines = content.split('\n')
+  line_count, index = len(lines), 0
+
+  # Values are only checked for non-ascii content if the document has some.
+
+  check_ascii = validate and not _is_ascii(content)
 
-  while remaining_lines:
-    line = remaining_lines.pop(0)
+  while index < line_count:
+    line = lines[index]
+    index += 1
 
     # V2 network status documents explicitly can contain blank lines...
     #
@@ -1510,20 +2047,25 @@ def _descriptor_components_with_extra(raw_contents: bytes, validate: bool, extra
     if value is None:
       value = ''
 
-    try:
-      block_attr = _get_pseudo_pgp_block(remaining_lines)
+    block_type, block_contents = None, None
+    block_match = PGP_BLOCK_START.match(lines[index]) if index < line_count and lines[index].startswith('-----BEGIN ') else None
 
-      if block_attr:
-        block_type, block_contents = block_attr
-      else:
-        block_type, block_contents = None, None
-    except ValueError:
-      if not validate:
-        continue
+    if block_match:
+      block_type = block_match.groups()[0]
+      end_line = PGP_BLOCK_END % block_type
 
-      raise
+      try:
+        block_end = lines.index(end_line, index) + 1
+      except ValueError:
+        if not validate:
+          break  # the block consumes the rest of our content
+
+        raise ValueError("Unterminated pgp style block (looking for '%s'):\n%s" % (end_line, '\n'.join(lines[index:])))
+
+      block_contents = '\n'.join(lines[index:block_end])
+      index = block_end
 
-    if validate and keyword not in non_ascii_fields:
+    if check_ascii and keyword not in non_ascii_fields:
       try:
         value.encode('ascii')
       except UnicodeError:
@@ -1541,6 +2083,98 @@ def _descriptor_components_with_extra(raw_contents: bytes, validate: bool, extra
     return entries  # type: ignore
 
 
+def _is_ascii(content: str) -> bool:
+  """
+  Checks if content consists entirely of ascii characters.
+
+  :param content: content to check
+
+  :returns: **True** if our content is ascii, **False** otherwise
+  """
+
+  try:
+    content.encode('ascii')
+    return True
+  except UnicodeError:
+    return False
+
+
+def _projected_components(raw_contents: bytes, keywords: Set[str], extra_keywords: Sequence[str] = ()) -> Tuple[ENTRY_TYPE, List[str]]:
+  """
+  Counterpart of :func:`~stem.descriptor.__init__._descriptor_components_with_extra`
+  that only retains lines with the given keywords. Rather than walking every
+  line we search for these keywords, so the rest of our content is only
+  scanned in C. This doesn't validate our content.
+
+  :param raw_contents: descriptor content provided by the relay
+  :param keywords: keywords of the lines to retain
+  :param extra_keywords: entity keywords to put into a separate listing
+    with ordering intact
+
+  :returns: same as :func:`~stem.descriptor.__init__._descriptor_components_with_extra`
+  """
+
+  entries = collections.OrderedDict()  # type: ENTRY_TYPE
+  extra_entries = []  # entries with a keyword in extra_keywords
+  content = stem.util.str_tools._to_bytes(raw_contents)
+  searchable = b'\n' + content  # indices of a newline here are where lines of our content start
+  has_opt_prefix = b'\nopt ' in searchable
+  line_starts = []
+
+  for keyword in keywords:
+    for needle in (b'\n' + keyword.encode('utf-8'), b'\nopt ' + keyword.encode('utf-8')) if has_opt_prefix else (b'\n' + keyword.encode('utf-8'),):
+      index = searchable.find(needle)
+
+      while index != -1:
+        keyword_end = index + len(needle)
+
+        if searchable[keyword_end:keyword_end + 1] in KEYWORD_ENDINGS:
+          line_starts.append(index)
+
+        index = searchable.find(needle, keyword_end)
+
+  for line_start in sorted(line_starts):
+    line_end = _line_end(content, line_start)
+    line = stem.util.str_tools._to_unicode(content[line_start:line_end].rstrip(b'\n'))
+
+    if line.startswith('opt '):
+      line = line[4:]
+
+    line_match = KEYWORD_LINE.match(line)
+
+    if not line_match:
+      continue
+
+    keyword, value = line_match.group(1), line_match.group(2) or ''
+    block_type, block_contents = None, None
+
+    if content.startswith(b'-----BEGIN ', line_end):
+      block_match = PGP_BLOCK_START.match(stem.util.str_tools._to_unicode(content[line_end:_line_end(content, line_end)].rstrip(b'\n')))
+
+      if block_match:
+        block_type = block_match.group(1)
+        end_line = (PGP_BLOCK_END % block_type).encode('utf-8')
+        block_end = _find_line(content, end_line, line_end, is_keyword = False)
+
+        while block_end != -1 and content[block_end:_line_end(content, block_end)].rstrip(b'\n') != end_line:
+          block_end = _find_line(content, end_line, block_end + 1, is_keyword = False)
+
+        if block_end == -1:
+          continue  # unterminated block
+
+        block_contents = stem.util.str_tools._to_unicode(content[line_end:block_end + len(end_line)])
+
+    if keyword in extra_keywords:
+      extra_entries.append('%s %s' % (keyword, value))
+    else:
+      entries.setdefault(keyword, []).append((value, block_type, block_contents))
+
+  if extra_keywords:
+    return entries, extra_entries
+  else:
+    return entries  # type: ignore
+
+
 # importing at the end to avoid circular dependencies on our Descriptor class
 
 import stem.descriptor.bandwidth_file
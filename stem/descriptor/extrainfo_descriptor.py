@@ -80,14 +80,14 @@ from typing import Any, BinaryIO, Callable, Dict, Iterator, Mapping, Optional, S
 
 from stem.descriptor import (
   ENTRY_TYPE,
-  PGP_BLOCK_END,
   Descriptor,
   DigestHash,
   DigestEncoding,
   create_signing_key,
   _descriptor_content,
-  _read_until_keywords,
   _descriptor_components,
+  _read_remaining,
+  _split_descriptors,
   _value,
   _values,
   _parse_simple_line,
@@ -167,7 +167,7 @@ _timestamp_re = re.compile('^(.*) \\(([0-9]+) s\\)( .*)?$')
 _locale_re = re.compile('^[a-zA-Z0-9\\?]{2}$')
 
 
-def _parse_file(descriptor_file: BinaryIO, is_bridge = False, validate = False, **kwargs: Any) -> Iterator['stem.descriptor.extrainfo_descriptor.ExtraInfoDescriptor']:
+def _parse_file(descriptor_file: BinaryIO, is_bridge = False, validate = False, fields: Optional[Sequence[str]] = None, **kwargs: Any) -> Iterator['stem.descriptor.extrainfo_descriptor.ExtraInfoDescriptor']:
   """
   Iterates over the extra-info descriptors in a file.
 
@@ -175,6 +175,7 @@ def _parse_file(descriptor_file: BinaryIO, is_bridge = False, validate = False,
   :param is_bridge: parses the file as being a bridge descriptor
   :param validate: checks the validity of the descriptor's content if
     **True**, skips these checks otherwise
+  :param fields: only parse these attributes
   :param kwargs: additional arguments for the descriptor constructor
 
   :returns: iterator for :class:`~stem.descriptor.extrainfo_descriptor.ExtraInfoDescriptor`
@@ -188,27 +189,23 @@ def _parse_file(descriptor_file: BinaryIO, is_bridge = False, validate = False,
   if kwargs:
     raise ValueError('BUG: keyword arguments unused by extrainfo descriptors')
 
-  while True:
-    if not is_bridge:
-      extrainfo_content = _read_until_keywords('router-signature', descriptor_file)
+  content, start, end = _read_remaining(descriptor_file)
 
-      # we've reached the 'router-signature', now include the pgp style block
+  if not is_bridge:
+    descriptors = _split_descriptors(content, b'router-signature', with_signature = True, start = start, end = end)
+  else:
+    descriptors = _split_descriptors(content, b'router-digest', start = start, end = end)
 
-      block_end_prefix = PGP_BLOCK_END.split(' ', 1)[0]
-      extrainfo_content += _read_until_keywords(block_end_prefix, descriptor_file, True)
-    else:
-      extrainfo_content = _read_until_keywords('router-digest', descriptor_file, True)
+  for descriptor_content in descriptors:
+    extrainfo_content = bytes(descriptor_content)
 
-    if extrainfo_content:
-      if extrainfo_content[0].startswith(b'@type'):
-        extrainfo_content = extrainfo_content[1:]
+    if extrainfo_content.startswith(b'@type'):
+      extrainfo_content = extrainfo_content.split(b'\n', 1)[1] if b'\n' in extrainfo_content else b''
 
-      if is_bridge:
-        yield BridgeExtraInfoDescriptor(bytes.join(b'', extrainfo_content), validate)
-      else:
-        yield RelayExtraInfoDescriptor(bytes.join(b'', extrainfo_content), validate)
+    if is_bridge:
+      yield BridgeExtraInfoDescriptor(extrainfo_content, validate, fields)
     else:
-      break  # done parsing file
+      yield RelayExtraInfoDescriptor(extrainfo_content, validate, fields)
 
 
 def _parse_timestamp_and_interval(keyword: str, content: str) -> Tuple[datetime.datetime, int, str]:
@@ -821,21 +818,26 @@ class ExtraInfoDescriptor(Descriptor):
     'bridge-ip-transports': _parse_bridge_ip_transports_line,
   }
 
-  def __init__(self, raw_contents: bytes, validate: bool = False) -> None:
+  def __init__(self, raw_contents: bytes, validate: bool = False, fields: Optional[Sequence[str]] = None) -> None:
     """
     Extra-info descriptor constructor. By default this validates the
     descriptor's content as it's parsed. This validation can be disabled to
     either improve performance or be accepting of malformed data.
 
+    .. versionchanged:: 2.0.0
+       Added the fields argument.
+
     :param raw_contents: extra-info content provided by the relay
     :param validate: checks the validity of the extra-info descriptor if
       **True**, skips these checks otherwise
+    :param fields: only parse these attributes, this is ignored if validating
 
     :raises: **ValueError** if the contents is malformed and validate is True
     """
 
     super(ExtraInfoDescriptor, self).__init__(raw_contents, lazy_load = not validate)
-    entries = _descriptor_components(raw_contents, validate)
+    keywords = self._keywords_for(fields) if fields is not None and not validate else None
+    entries = _descriptor_components(raw_contents, validate, keywords = keywords)
 
     if validate:
       for keyword in self._required_fields():
@@ -857,6 +859,7 @@ class ExtraInfoDescriptor(Descriptor):
       self._parse(entries, validate)
     else:
       self._entries = entries
+      self._keywords = keywords
 
   def digest(self, hash_type: 'stem.descriptor.DigestHash' = DigestHash.SHA1, encoding: 'stem.descriptor.DigestEncoding' = DigestEncoding.HEX) -> Union[str, 'hashlib._HASH']:  # type: ignore
     """
@@ -68,7 +68,9 @@ from stem.descriptor import (
   DigestEncoding,
   _descriptor_content,
   _descriptor_components,
-  _read_until_keywords,
+  _find_lines,
+  _read_remaining,
+  _starts_with_keyword,
   _values,
   _parse_simple_line,
   _parse_protocol_line,
@@ -95,13 +97,14 @@ SINGLE_FIELDS = (
 )
 
 
-def _parse_file(descriptor_file: BinaryIO, validate: bool = False, **kwargs: Any) -> Iterator['stem.descriptor.microdescriptor.Microdescriptor']:
+def _parse_file(descriptor_file: BinaryIO, validate: bool = False, fields: Optional[Sequence[str]] = None, **kwargs: Any) -> Iterator['stem.descriptor.microdescriptor.Microdescriptor']:
   """
   Iterates over the microdescriptors in a file.
 
   :param descriptor_file: file with descriptor content
   :param validate: checks the validity of the descriptor's content if
     **True**, skips these checks otherwise
+  :param fields: only parse these attributes
   :param kwargs: additional arguments for the descriptor constructor
 
   :returns: iterator for Microdescriptor instances in the file
@@ -114,45 +117,27 @@ def _parse_file(descriptor_file: BinaryIO, validate: bool = False, **kwargs: Any
   if kwargs:
     raise ValueError('BUG: keyword arguments unused by microdescriptors')
 
-  while True:
-    annotations = _read_until_keywords('onion-key', descriptor_file)
+  # Microdescriptors begin with an 'onion-key' line, and continue until the
+  # next annotation or 'onion-key' line. Lines that precede them are their
+  # annotations.
 
-    # read until we reach an annotation or onion-key line
-    descriptor_lines = []
+  content, content_start, content_end = _read_remaining(descriptor_file)
+  annotations_start, desc_start = content_start, None
 
-    # read the onion-key line, done if we're at the end of the document
+  def microdescriptor(desc_end: int) -> 'stem.descriptor.microdescriptor.Microdescriptor':
+    annotations = [line.strip() for line in content[annotations_start:desc_start].split(b'\n')[:-1]]
+    return Microdescriptor(bytes(content[desc_start:desc_end]), validate, annotations, fields)
 
-    onion_key_line = descriptor_file.readline()
+  for index, prefix in _find_lines(content, (b'@', b'onion-key'), content_start, content_end, is_keyword = False):
+    if desc_start is not None:
+      yield microdescriptor(index)
+      annotations_start, desc_start = index, None
 
-    if onion_key_line:
-      descriptor_lines.append(onion_key_line)
-    else:
-      break
-
-    while True:
-      last_position = descriptor_file.tell()
-      line = descriptor_file.readline()
-
-      if not line:
-        break  # EOF
-      elif line.startswith(b'@') or line.startswith(b'onion-key'):
-        descriptor_file.seek(last_position)
-        break
-      else:
-        descriptor_lines.append(line)
+    if prefix == b'onion-key' and _starts_with_keyword(content, (b'onion-key',), index):
+      desc_start = index
 
-    if descriptor_lines:
-      if descriptor_lines[0].startswith(b'@type'):
-        descriptor_lines = descriptor_lines[1:]
-
-      # strip newlines from annotations
-      annotations = list(map(bytes.strip, annotations))
-
-      descriptor_text = bytes.join(b'', descriptor_lines)
-
-      yield Microdescriptor(descriptor_text, validate, annotations)
-    else:
-      break  # done parsing descriptors
+  if desc_start is not None:
+    yield microdescriptor(content_end)
 
 
 def _parse_id_line(descriptor: 'stem.descriptor.Descriptor', entries: ENTRY_TYPE) -> None:
@@ -245,16 +230,18 @@ class Microdescriptor(Descriptor):
       ('onion-key', _random_crypto_blob('RSA PUBLIC KEY')),
     ))
 
-  def __init__(self, raw_contents: bytes, validate: bool = False, annotations: Optional[Sequence[bytes]] = None) -> None:
+  def __init__(self, raw_contents: bytes, validate: bool = False, annotations: Optional[Sequence[bytes]] = None, fields: Optional[Sequence[str]] = None) -> None:
     super(Microdescriptor, self).__init__(raw_contents, lazy_load = not validate)
     self._annotation_lines = annotations if annotations else []
-    entries = _descriptor_components(raw_contents, validate)
+    keywords = self._keywords_for(fields) if fields is not None and not validate else None
+    entries = _descriptor_components(raw_contents, validate, keywords = keywords)
 
     if validate:
       self._parse(entries, validate)
       self._check_constraints(entries)
     else:
       self._entries = entries
+      self._keywords = keywords
 
   def digest(self, hash_type: 'stem.descriptor.DigestHash' = DigestHash.SHA256, encoding: 'stem.descriptor.DigestEncoding' = DigestEncoding.BASE64) -> Union[str, 'hashlib._HASH']:  # type: ignore
     """
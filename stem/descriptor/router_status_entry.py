@@ -38,7 +38,8 @@ from stem.descriptor import (
   _values,
   _descriptor_components,
   _parse_protocol_line,
-  _read_until_keywords_with_ending_keyword,
+  _find_lines,
+  _read_remaining,
   _random_nickname,
   _random_ipv4_address,
   _random_date,
@@ -93,25 +94,26 @@ def _parse_file(document_file: BinaryIO, validate: bool, entry_class: Type['stem
     if first_keyword in section_end_keywords:
       return
 
-  while end_position is None or document_file.tell() < end_position:
-    desc_lines, ending_keyword = _read_until_keywords_with_ending_keyword(
-      (entry_keyword,) + section_end_keywords,
-      document_file,
-      ignore_first = True,
-      end_position = end_position,
-      include_ending_keyword = True
-    )
+  # Entries are split at the lines that begin with their keyword. We read the
+  # section into memory and afterward leave the file where our entries ended.
 
-    desc_content = bytes.join(b'', desc_lines)
+  content, content_start, content_end = _read_remaining(document_file, end_position)
+  content_view = memoryview(content)
+  end_keywords = tuple(keyword.encode('utf-8') for keyword in section_end_keywords)
+  entry_start = content_start
 
-    if desc_content:
-      yield entry_class(desc_content, validate, *extra_args)
+  for index, keyword in _find_lines(content, (entry_keyword.encode('utf-8'),) + end_keywords, content_start + 1, content_end):
+    yield entry_class(bytes(content_view[entry_start:index]), validate, *extra_args)
+    entry_start = index
 
-      # check if we stopped at the end of the section
-      if ending_keyword in section_end_keywords:
-        break
-    else:
+    if keyword in end_keywords:
       break
+  else:
+    if entry_start < content_end:
+      yield entry_class(bytes(content_view[entry_start:content_end]), validate, *extra_args)
+      entry_start = content_end
+
+  document_file.seek(start_position + entry_start - content_start)
 
 
 def _parse_r_line(descriptor: 'stem.descriptor.Descriptor', entries: ENTRY_TYPE) -> None:
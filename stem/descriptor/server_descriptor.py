@@ -61,18 +61,18 @@ import stem.version
 
 from stem.descriptor.certificate import Ed25519Certificate
 from stem.descriptor.router_status_entry import RouterStatusEntryV3
-from typing import Any, BinaryIO, Iterator, Optional, Mapping, Sequence, Tuple, Type, Union
+from typing import Any, BinaryIO, Iterator, Optional, Mapping, Sequence, Set, Tuple, Type, Union
 
 from stem.descriptor import (
   ENTRY_TYPE,
-  PGP_BLOCK_END,
   Descriptor,
   DigestHash,
   DigestEncoding,
   create_signing_key,
   _descriptor_content,
   _descriptor_components_with_extra,
-  _read_until_keywords,
+  _read_remaining,
+  _split_descriptors,
   _bytes_for_block,
   _value,
   _values,
@@ -145,7 +145,7 @@ def _truncated_b64encode(content: bytes) -> str:
   return stem.util.str_tools._to_unicode(base64.b64encode(content).rstrip(b'='))
 
 
-def _parse_file(descriptor_file: BinaryIO, is_bridge: bool = False, validate: bool = False, **kwargs: Any) -> Iterator['stem.descriptor.server_descriptor.ServerDescriptor']:
+def _parse_file(descriptor_file: BinaryIO, is_bridge: bool = False, validate: bool = False, fields: Optional[Sequence[str]] = None, **kwargs: Any) -> Iterator['stem.descriptor.server_descriptor.ServerDescriptor']:
   """
   Iterates over the server descriptors in a file.
 
@@ -153,6 +153,7 @@ def _parse_file(descriptor_file: BinaryIO, is_bridge: bool = False, validate: bo
   :param is_bridge: parses the file as being a bridge descriptor
   :param validate: checks the validity of the descriptor's content if
     **True**, skips these checks otherwise
+  :param fields: only parse these attributes
   :param kwargs: additional arguments for the descriptor constructor
 
   :returns: iterator for ServerDescriptor instances in the file
@@ -180,49 +181,29 @@ def _parse_file(descriptor_file: BinaryIO, is_bridge: bool = False, validate: bo
   # Metrics descriptor files are the same, but lack any annotations. The
   # following simply does the following...
   #
-  #   - parse as annotations until we get to 'router'
-  #   - parse as descriptor content until we get to 'router-signature' followed
-  #     by the end of the signature block
+  #   - skip annotations until we get to 'router'
+  #   - treat the content as descriptor until we get to 'router-signature'
+  #     followed by the end of the signature block
   #   - construct a descriptor and provide it back to the caller
   #
   # Any annotations after the last server descriptor is ignored (never provided
   # to the caller).
 
-  while True:
-    # skip annotations
+  if is_bridge and kwargs:
+    raise ValueError('BUG: keyword arguments unused by bridge descriptors')
 
-    while True:
-      pos = descriptor_file.tell()
+  content, start, end = _read_remaining(descriptor_file)
 
-      if not descriptor_file.readline().startswith(b'@'):
-        descriptor_file.seek(pos)
-        break
+  if not is_bridge:
+    descriptors = _split_descriptors(content, b'router-signature', with_signature = True, skip_annotations = True, start = start, end = end)
+  else:
+    descriptors = _split_descriptors(content, b'router-digest', skip_annotations = True, start = start, end = end)
 
-    if not is_bridge:
-      descriptor_content = _read_until_keywords('router-signature', descriptor_file)
-
-      # we've reached the 'router-signature', now include the pgp style block
-
-      block_end_prefix = PGP_BLOCK_END.split(' ', 1)[0]
-      descriptor_content += _read_until_keywords(block_end_prefix, descriptor_file, True)
-    else:
-      descriptor_content = _read_until_keywords('router-digest', descriptor_file, True)
-
-    if descriptor_content:
-      if descriptor_content[0].startswith(b'@type'):
-        descriptor_content = descriptor_content[1:]
-
-      descriptor_text = bytes.join(b'', descriptor_content)
-
-      if is_bridge:
-        if kwargs:
-          raise ValueError('BUG: keyword arguments unused by bridge descriptors')
-
-        yield BridgeDescriptor(descriptor_text, validate)
-      else:
-        yield RelayDescriptor(descriptor_text, validate, **kwargs)
+  for descriptor_content in descriptors:
+    if is_bridge:
+      yield BridgeDescriptor(bytes(descriptor_content), validate, fields)
     else:
-      break  # done parsing descriptors
+      yield RelayDescriptor(bytes(descriptor_content), validate, fields = fields, **kwargs)
 
 
 def _parse_router_line(descriptor: 'stem.descriptor.Descriptor', entries: ENTRY_TYPE) -> None:
@@ -581,7 +562,7 @@ class ServerDescriptor(Descriptor):
     'eventdns': _parse_eventdns_line,
   }
 
-  def __init__(self, raw_contents: bytes, validate: bool = False) -> None:
+  def __init__(self, raw_contents: bytes, validate: bool = False, fields: Optional[Sequence[str]] = None) -> None:
     """
     Server descriptor constructor, created from an individual relay's
     descriptor content (as provided by 'GETINFO desc/*', cached descriptors,
@@ -591,9 +572,13 @@ class ServerDescriptor(Descriptor):
     validation can be disables to either improve performance or be accepting of
     malformed data.
 
+    .. versionchanged:: 2.0.0
+       Added the fields argument.
+
     :param raw_contents: descriptor content provided by the relay
     :param validate: checks the validity of the descriptor's content if
       **True**, skips these checks otherwise
+    :param fields: only parse these attributes, this is ignored if validating
 
     :raises: **ValueError** if the contents is malformed and validate is True
     """
@@ -608,7 +593,8 @@ class ServerDescriptor(Descriptor):
     # influences the resulting exit policy, but for everything else the order
     # does not matter so breaking it into key / value pairs.
 
-    entries, self._unparsed_exit_policy = _descriptor_components_with_extra(raw_contents, validate, extra_keywords = ('accept', 'reject'), non_ascii_fields = ('contact', 'platform'))
+    keywords = self._keywords_for(fields) if fields is not None and not validate else None
+    entries, self._unparsed_exit_policy = _descriptor_components_with_extra(raw_contents, validate, extra_keywords = ('accept', 'reject'), non_ascii_fields = ('contact', 'platform'), keywords = keywords)
 
     if validate:
       self._parse(entries, validate)
@@ -625,6 +611,16 @@ class ServerDescriptor(Descriptor):
       self._check_constraints(entries)
     else:
       self._entries = entries
+      self._keywords = keywords
+
+  @classmethod
+  def _keywords_for(cls, fields: Sequence[str]) -> Set[str]:
+    keywords = super(ServerDescriptor, cls)._keywords_for(fields)
+
+    if 'exit_policy' in fields:
+      keywords = keywords.union(('accept', 'reject'))
+
+    return keywords
 
   def digest(self, hash_type: 'stem.descriptor.DigestHash' = DigestHash.SHA1, encoding: 'stem.descriptor.DigestEncoding' = DigestEncoding.HEX) -> Union[str, 'hashlib._HASH']:  # type: ignore
     """
@@ -758,8 +754,8 @@ class RelayDescriptor(ServerDescriptor):
     'router-signature': _parse_router_signature_line,
   })
 
-  def __init__(self, raw_contents: bytes, validate: bool = False, skip_crypto_validation: bool = False) -> None:
-    super(RelayDescriptor, self).__init__(raw_contents, validate)
+  def __init__(self, raw_contents: bytes, validate: bool = False, skip_crypto_validation: bool = False, fields: Optional[Sequence[str]] = None) -> None:
+    super(RelayDescriptor, self).__init__(raw_contents, validate, fields)
 
     if validate:
       if not skip_crypto_validation:
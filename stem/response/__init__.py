@@ -15,6 +15,8 @@ Parses replies from the control socket.
     |
     |- from_str - provides a ControlMessage for the given string
     |- is_ok - response had a 250 status
+    |- is_event - message is an asynchronous event
+    |- status_code - status code of our last line
     |- content - provides the parsed message content
     +- raw_content - unparsed socket data
 
@@ -139,7 +141,7 @@ def _convert_to_single_line(message: 'stem.response.ControlMessage', **kwargs: A
 
 
 def _convert_to_event(message: 'stem.response.ControlMessage', **kwargs: Any) -> 'stem.response.events.Event':
-  stem.response.convert('EVENT', message)
+  stem.response.convert('EVENT', message, **kwargs)
   return message  # type: ignore
 
 
@@ -231,7 +233,11 @@ class ControlMessage(object):
     self._parsed_content = parsed_content
     self._raw_content = raw_content
     self._str = None  # type: Optional[str]
-    self._hash = stem.util._hash_attr(self, '_raw_content')
+    self._hash = None  # type: Optional[int]
+
+    # content decoded to unicode, populated when first requested
+
+    self._unicode_content = None  # type: Optional[List[Tuple[str, str, str]]]
 
   def is_ok(self) -> bool:
     """
@@ -246,6 +252,30 @@ class ControlMessage(object):
 
     return False
 
+  def is_event(self) -> bool:
+    """
+    Checks if this is an asynchronous event rather than a reply to a request.
+
+    .. versionadded:: 2.0.0
+
+    :returns: **True** if our last line has a 650 status code, **False** otherwise
+    """
+
+    return self._parsed_content[-1][0] == '650'
+
+  def status_code(self) -> str:
+    """
+    Provides the status code of our last line. This is cheaper than
+    :func:`~stem.response.ControlMessage.content` since it doesn't decode our
+    content.
+
+    .. versionadded:: 2.0.0
+
+    :returns: **str** with the status code of our last line
+    """
+
+    return self._parsed_content[-1][0]
+
   # TODO: drop this alias when we provide better type support
 
   def _content_bytes(self) -> List[Tuple[str, str, bytes]]:
@@ -286,10 +316,20 @@ class ControlMessage(object):
     """
 
     if not get_bytes:
-      return [(code, div, stem.util.str_tools._to_unicode(content)) for (code, div, content) in self._parsed_content]
+      return list(self._decoded_content())
     else:
       return list(self._parsed_content)  # type: ignore
 
+  def _decoded_content(self) -> List[Tuple[str, str, str]]:
+    """
+    Provides our content decoded to unicode, which we only do once.
+    """
+
+    if self._unicode_content is None:
+      self._unicode_content = [(code, div, stem.util.str_tools._to_unicode(content)) for (code, div, content) in self._parsed_content]
+
+    return self._unicode_content
+
   def raw_content(self, get_bytes: bool = False) -> Union[str, bytes]:
     """
     Provides the unparsed content read from the control socket.
@@ -344,8 +384,8 @@ class ControlMessage(object):
       2nd - "OK"
     """
 
-    for _, _, content in self._parsed_content:
-      yield ControlLine(stem.util.str_tools._to_unicode(content))
+    for _, _, content in self._decoded_content():
+      yield ControlLine(content)
 
   def __len__(self) -> int:
     """
@@ -359,12 +399,16 @@ class ControlMessage(object):
     :returns: :class:`~stem.response.ControlLine` at the index
     """
 
-    content = self._parsed_content[index][2]
-    content = stem.util.str_tools._to_unicode(content)
-
-    return ControlLine(content)
+    return ControlLine(self._decoded_content()[index][2])
 
   def __hash__(self) -> int:
+    # Hashing our content is linear with its size, so we only do so when
+    # needed. This is based on our base class since conversion changes our
+    # type.
+
+    if self._hash is None:
+      self._hash = hash(str(ControlMessage)) * 1024 + stem.util._hash_value(self._raw_content)
+
     return self._hash
 
   def __eq__(self, other: Any) -> bool:
@@ -17,12 +17,12 @@ import stem.version
 from stem.util import connection, log, str_tools, tor_tools
 from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
-# Matches keyword=value arguments. This can't be a simple "(.*)=(.*)" pattern
-# because some positional arguments, like circuit paths, can have an equal
-# sign.
+# Matches an unquoted keyword=value argument. This can't be a simple
+# "(.*)=(.*)" pattern because some positional arguments, like circuit paths,
+# can have an equal sign.
 
-KW_ARG = re.compile('^(.*) ([A-Za-z0-9_]+)=(\\S*)$')
-QUOTED_KW_ARG = re.compile('^(.*) ([A-Za-z0-9_]+)="(.*)"$')
+KW_ARG = re.compile('([A-Za-z0-9_]+)=(\\S*)')
+KEYWORD_CHARS = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_')
 CELL_TYPE = re.compile('^[a-z0-9_]+$')
 
 
@@ -32,6 +32,14 @@ class Event(stem.response.ControlMessage):
   `control-spec
   <https://gitweb.torproject.org/torspec.git/tree/control-spec.txt>`_.
 
+  When converted with **lazy_load** our attributes are parsed when first
+  accessed rather than upfront, so listeners pay only for the events whose
+  content they read. In this case a malformed event raises a
+  :class:`~stem.ProtocolError` upon first access rather than conversion.
+
+  .. versionchanged:: 2.0.0
+     Added lazy loading.
+
   :var str type: event type
   :var list positional_args: positional arguments of the event
   :var dict keyword_args: key/value arguments of the event
@@ -47,18 +55,40 @@ class Event(stem.response.ControlMessage):
   _SKIP_PARSING = False    # skip parsing contents into our positional_args and keyword_args
   _VERSION_ADDED = stem.version.Version('0.1.1.1-alpha')  # minimum version with control-spec V1 event support
 
-  def _parse_message(self) -> None:
+  def _parse_message(self, lazy_load: bool = False) -> None:
     if not str(self).strip():
       raise stem.ProtocolError('Received a blank tor event. Events must at the very least have a type.')
 
     self.type = str(self).split()[0]
-    self.positional_args = []  # type: List[str]
-    self.keyword_args = {}  # type: Dict[str, str]
 
     # if we're a recognized event type then translate ourselves into that subclass
 
     if self.type in EVENT_TYPE_TO_CLASS:
       self.__class__ = EVENT_TYPE_TO_CLASS[self.type]
+
+    self._lazy_loading = lazy_load
+
+    if not lazy_load:
+      self._parse_event()
+    elif self.type in EVENT_TYPE_TO_CLASS:
+      # Our subclass' private state is needed by its methods, but the public
+      # attributes it defaults are left to be parsed when first accessed.
+
+      initial_attr = set(self.__dict__)
+      self.__init__()  # type: ignore
+
+      for attr in [attr for attr in self.__dict__ if attr not in initial_attr and not attr.startswith('_')]:
+        del self.__dict__[attr]
+
+  def _parse_event(self) -> None:
+    """
+    Populates our attributes from our content.
+    """
+
+    self.positional_args = []  # type: List[str]
+    self.keyword_args = {}  # type: Dict[str, str]
+
+    if self.type in EVENT_TYPE_TO_CLASS:
       self.__init__()  # type: ignore
 
     if not self._SKIP_PARSING:
@@ -66,6 +96,35 @@ class Event(stem.response.ControlMessage):
 
     self._parse()
 
+  def _parse_lazy_event(self) -> None:
+    """
+    Populates our attributes if we deferred doing so. Malformed content leaves
+    us unparsed, so its error is raised again upon our next access.
+
+    :raises: :class:`stem.ProtocolError` if our content is malformed
+    """
+
+    if self.__dict__.get('_lazy_loading'):
+      unparsed_attr = dict(self.__dict__)
+      self._lazy_loading = False
+
+      try:
+        self._parse_event()
+      except:
+        self.__dict__.clear()
+        self.__dict__.update(unparsed_attr)
+        raise
+
+  def __getattr__(self, name: str) -> Any:
+    # This is only called for attributes we lack, which we might not have
+    # parsed yet if we're lazy loading.
+
+    if not name.startswith('_') and self.__dict__.get('_lazy_loading'):
+      self._parse_lazy_event()
+      return getattr(self, name)
+
+    raise AttributeError("'%s' object has no attribute '%s'" % (type(self).__name__, name))
+
   def __hash__(self) -> int:
     return stem.util._hash_attr(self, 'arrived_at', parent = stem.response.ControlMessage, cache = True)
 
@@ -79,27 +138,10 @@ class Event(stem.response.ControlMessage):
     **_POSITIONAL_ARGS** and **_KEYWORD_ARGS**.
     """
 
-    # Tor events contain some number of positional arguments followed by
-    # key/value mappings. Parsing keyword arguments from the end until we hit
-    # something that isn't a key/value mapping. The rest are positional.
-
-    content = str(self)
-
-    while True:
-      match = QUOTED_KW_ARG.match(content)
-
-      if not match:
-        match = KW_ARG.match(content)
-
-      if match:
-        content, keyword, value = match.groups()
-        self.keyword_args[keyword] = value
-      else:
-        break
+    self.positional_args, self.keyword_args = _parse_args(str(self))
 
     # Setting attributes for the fields that we recognize.
 
-    self.positional_args = content.split()[1:]
     positional = list(self.positional_args)
 
     for attr_name in self._POSITIONAL_ARGS:
@@ -130,6 +172,42 @@ class Event(stem.response.ControlMessage):
     for controller_attr_name, attr_name in self._KEYWORD_ARGS.items():
       setattr(self, attr_name, self.keyword_args.get(controller_attr_name))
 
+  def compact(self, keep_raw_content: bool = False) -> 'stem.response.events.CompactEvent':
+    """
+    Provides a copy of this event that uses a fraction of our memory, for
+    retaining event history. This has our type, arrival time, and the
+    attributes we parse, but not our positional_args or keyword_args.
+
+    .. versionadded:: 2.0.0
+
+    :param keep_raw_content: retain our raw content if **True**, otherwise
+      it's dropped
+
+    :returns: :class:`~stem.response.events.CompactEvent` with our attributes
+
+    :raises: :class:`stem.ProtocolError` if we're lazy loading and our content
+      is malformed
+    """
+
+    self._parse_lazy_event()
+
+    attributes = tuple(attr for attr in self.__dict__ if not attr.startswith('_') and attr not in ('type', 'arrived_at', 'positional_args', 'keyword_args'))
+    compact_class = _COMPACT_CLASSES.get((type(self), attributes))
+
+    if compact_class is None:
+      compact_class = type('Compact%s' % type(self).__name__, (CompactEvent,), {'__slots__': attributes, '_ATTRIBUTES': CompactEvent._ATTRIBUTES + attributes})
+      _COMPACT_CLASSES[(type(self), attributes)] = compact_class
+
+    compact = compact_class()
+    compact.type = self.type
+    compact.arrived_at = self.arrived_at
+    compact._raw_content = self.raw_content(get_bytes = True) if keep_raw_content else None
+
+    for attr in attributes:
+      setattr(compact, attr, getattr(self, attr))
+
+    return compact
+
   def _iso_timestamp(self, timestamp: str) -> datetime.datetime:
     """
     Parses an iso timestamp (ISOTime2Frac in the control-spec).
@@ -175,6 +253,50 @@ class Event(stem.response.ControlMessage):
           log.log_once(log_id, log.INFO, unrecognized_msg)
 
 
+class CompactEvent(object):
+  """
+  Memory efficient copy of an event, provided by
+  :func:`~stem.response.events.Event.compact`. This has the attributes of the
+  event it was made from, held within slots rather than a dictionary.
+
+  .. versionadded:: 2.0.0
+
+  :var str type: event type
+  :var int arrived_at: unix timestamp for when the event arrived
+  """
+
+  __slots__ = ('type', 'arrived_at', '_raw_content')
+  _ATTRIBUTES = ('type', 'arrived_at')  # type: Tuple[str, ...] # attributes our subclasses have
+
+  def raw_content(self, get_bytes: bool = False) -> Optional[Union[str, bytes]]:
+    """
+    Provides the unparsed content of our event, if it was retained.
+
+    :param get_bytes: if **True** then this provides **bytes** rather than a **str**
+
+    :returns: **str** of our event's content, or **None** if it was dropped
+    """
+
+    if self._raw_content is None or get_bytes:
+      return self._raw_content
+
+    return str_tools._to_unicode(self._raw_content)
+
+  def __repr__(self) -> str:
+    return '%s(%s)' % (type(self).__name__, ', '.join('%s=%r' % (attr, getattr(self, attr)) for attr in self._ATTRIBUTES))
+
+  def __eq__(self, other: Any) -> bool:
+    if type(self) is not type(other):
+      return False
+
+    return all(getattr(self, attr) == getattr(other, attr) for attr in self._ATTRIBUTES + ('_raw_content',))
+
+  def __ne__(self, other: Any) -> bool:
+    return not self == other
+
+  __hash__ = None  # type: ignore # our attributes can be mutable
+
+
 class AddrMapEvent(Event):
   """
   Event that indicates a new address mapping.
@@ -1481,6 +1603,65 @@ class TokenBucketEmptyEvent(Event):
     self._log_if_unrecognized('bucket', stem.TokenBucket)
 
 
+def _parse_args(content: str) -> Tuple[List[str], Dict[str, str]]:
+  """
+  Splits event content into its positional and keyword arguments.
+
+  Tor events contain some number of positional arguments followed by key/value
+  mappings, so we read keyword arguments from the end until we hit something
+  that isn't a key/value mapping. The rest are positional. This is a single
+  pass over the content, with quoted values (which can contain spaces, equal
+  signs, and quotes) provided without their surrounding quotes.
+
+  Keyword arguments are only parsed from single line events.
+
+  :param content: event content, starting with its type
+
+  :returns: **tuple** of the form (positional_args, keyword_args)
+  """
+
+  keyword_args = {}  # type: Dict[str, str]
+  end = len(content) - 1 if content.endswith('\n') else len(content)  # content[:end] is what we have yet to parse
+
+  if '=' not in content or '\n' in content[:end]:
+    return content.split()[1:], keyword_args
+
+  while True:
+    if content.endswith('"', 0, end):
+      # Quoted values end with our content, so they start with the last
+      # 'key="' that follows a space.
+
+      value_start = content.rfind('="', 0, end - 1)
+
+      while value_start != -1:
+        key_start = value_start
+
+        while key_start > 0 and content[key_start - 1] in KEYWORD_CHARS:
+          key_start -= 1
+
+        if 0 < key_start < value_start and content[key_start - 1] == ' ':
+          break
+
+        value_start = content.rfind('="', 0, value_start + 1)
+
+      if value_start != -1:
+        keyword_args[content[key_start:value_start]] = content[value_start + 2:end - 1]
+        end = key_start - 1
+        continue
+
+    arg_start = content.rfind(' ', 0, end) + 1
+    match = KW_ARG.fullmatch(content, arg_start, end) if arg_start else None
+
+    if not match:
+      break
+
+    keyword, value = match.groups()
+    keyword_args[keyword] = value
+    end = arg_start - 1
+
+  return content[:end].split()[1:], keyword_args
+
+
 def _parse_cell_type_mapping(mapping: str) -> Dict[str, int]:
   """
   Parses a mapping of the form...
@@ -1517,6 +1698,10 @@ def _parse_cell_type_mapping(mapping: str) -> Dict[str, int]:
   return results
 
 
+# slotted classes for our compact events, by their event class and attributes
+
+_COMPACT_CLASSES = {}  # type: Dict[Tuple[type, Tuple[str, ...]], type]
+
 EVENT_TYPE_TO_CLASS = {
   'ADDRMAP': AddrMapEvent,
   'BUILDTIMEOUT_SET': BuildTimeoutSetEvent,
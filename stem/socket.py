@@ -97,6 +97,14 @@ from typing import Awaitable, BinaryIO, Callable, List, Optional, Tuple, Type, U
 MESSAGE_PREFIX = re.compile(b'^[a-zA-Z0-9]{3}[-+ ]')
 ERROR_MSG = 'Error while receiving a control message (%s): %s'
 
+# bytes of data we accumulate before providing it to a streaming data handler
+
+DATA_CHUNK_SIZE = 65536
+
+# bytes we request from the socket at a time
+
+READ_SIZE = 65536
+
 # lines to limit our trace logging to, you can disable this by setting it to None
 
 TRUNCATE_LOGS = 10
@@ -397,6 +405,7 @@ class ControlSocket(BaseSocket):
 
   def __init__(self) -> None:
     super(ControlSocket, self).__init__()
+    self._framer = None  # type: Optional[_MessageFramer]
 
   async def send(self, message: Union[bytes, str]) -> None:
     """
@@ -412,10 +421,17 @@ class ControlSocket(BaseSocket):
 
     await self._send(message, send_message)
 
-  async def recv(self) -> stem.response.ControlMessage:
+  async def recv(self, data_handler: Optional[Callable[[str, bytes], Optional[Callable[[bytes], Awaitable[None]]]]] = None) -> stem.response.ControlMessage:
     """
     Receives a message from the control socket, blocking until we've received
-    one. For more information see the :func:`~stem.socket.recv_message` function.
+    one. This is equivalent to the :func:`~stem.socket.recv_message` function,
+    but reads large chunks from the socket rather than a line at a time.
+
+    .. versionchanged:: 2.0.0
+       Added the data_handler argument.
+
+    :param data_handler: streams data blocks if provided, see
+      :func:`~stem.socket.recv_message`
 
     :returns: :class:`~stem.response.ControlMessage` for the message received
 
@@ -424,7 +440,16 @@ class ControlSocket(BaseSocket):
       * :class:`stem.SocketClosed` if the socket closes before we receive a complete message
     """
 
-    return await self._recv(recv_message)
+    async def recv_framed(reader: asyncio.StreamReader) -> stem.response.ControlMessage:
+      # our framer buffers content beyond the message it reads, so it's
+      # retained until we reconnect
+
+      if self._framer is None or self._framer.reader is not reader:
+        self._framer = _MessageFramer(reader)
+
+      return await self._framer.recv(data_handler = data_handler)
+
+    return await self._recv(recv_framed)
 
 
 class ControlPort(ControlSocket):
@@ -553,12 +578,23 @@ async def _write_to_socket(writer: asyncio.StreamWriter, message: Union[str, byt
     raise stem.SocketClosed('file has been closed')
 
 
-async def recv_message(reader: asyncio.StreamReader, arrived_at: Optional[float] = None) -> stem.response.ControlMessage:
+async def recv_message(reader: asyncio.StreamReader, arrived_at: Optional[float] = None, data_handler: Optional[Callable[[str, bytes], Optional[Callable[[bytes], Awaitable[None]]]]] = None) -> stem.response.ControlMessage:
   """
   Pulls from a control socket until we either have a complete message or
   encounter a problem.
 
+  Data blocks (such as the descriptors of a 'GETINFO md/all' reply) can be
+  large, so rather than buffering them a **data_handler** can consume them as
+  they arrive. It's called with the status code and content of a data block's
+  first line, and if it provides a sink we await it with newline separated
+  chunks of the block. Streamed blocks are omitted from our message's content.
+
+  .. versionchanged:: 2.0.0
+     Added the data_handler argument.
+
   :param reader: reader object
+  :param arrived_at: unix timestamp when the message arrived
+  :param data_handler: provides a sink for the data blocks we should stream
 
   :returns: :class:`~stem.response.ControlMessage` read from the socket
 
@@ -637,15 +673,19 @@ async def recv_message(reader: asyncio.StreamReader, arrived_at: Optional[float]
       # get a line with just a period
 
       content_block = bytearray(content)
+      data_sink = data_handler(status_code, content) if data_handler else None
+      data_chunk = bytearray()
 
       while True:
         try:
           line = await reader.readline()
-          raw_content += line
         except socket.error as exc:
           log.info(ERROR_MSG % ('SocketClosed', 'received an exception while mid-way through a data reply (exception: "%s", read content: "%s")' % (exc, log.escape(bytes(raw_content).decode('utf-8')))))
           raise stem.SocketClosed(exc)
 
+        if not data_sink or line == b'.\r\n':
+          raw_content += line
+
         if not line.endswith(b'\r\n'):
           log.info(ERROR_MSG % ('ProtocolError', 'CRLF linebreaks missing from a data reply, "%s"' % log.escape(bytes(raw_content).decode('utf-8'))))
           raise stem.ProtocolError('All lines should end with CRLF')
@@ -660,7 +700,18 @@ async def recv_message(reader: asyncio.StreamReader, arrived_at: Optional[float]
         if line.startswith(b'..'):
           line = line[1:]
 
-        content_block += b'\n' + line
+        if data_sink:
+          data_chunk += line
+          data_chunk += b'\n'
+
+          if len(data_chunk) >= DATA_CHUNK_SIZE:
+            await data_sink(bytes(data_chunk))
+            data_chunk = bytearray()
+        else:
+          content_block += b'\n' + line
+
+      if data_sink and data_chunk:
+        await data_sink(bytes(data_chunk))
 
       # joins the content using a newline rather than CRLF separator (more
       # conventional for multi-line string content outside the windows world)
@@ -674,6 +725,219 @@ async def recv_message(reader: asyncio.StreamReader, arrived_at: Optional[float]
       raise stem.ProtocolError("Unrecognized divider type '%s': %s" % (divider, stem.util.str_tools._to_unicode(line)))
 
 
+class _MessageFramer(object):
+  """
+  Reads control messages in bulk. Rather than awaiting each line we read large
+  chunks from the socket and locate line and data block boundaries within
+  them, so large replies are read with a handful of awaits and copies rather
+  than several per line.
+
+  Content after the message we read is buffered for the next one, so a framer
+  must be used for all reads from its socket.
+
+  :var asyncio.StreamReader reader: reader we pull from
+  """
+
+  def __init__(self, reader: asyncio.StreamReader) -> None:
+    self.reader = reader
+
+    self._buffer = bytearray()
+    self._offset = 0  # start of the content we've yet to process
+
+  async def recv(self, arrived_at: Optional[float] = None, data_handler: Optional[Callable[[str, bytes], Optional[Callable[[bytes], Awaitable[None]]]]] = None) -> stem.response.ControlMessage:
+    """
+    Reads a message. For more information see the
+    :func:`~stem.socket.recv_message` function.
+
+    :param arrived_at: unix timestamp when the message arrived
+    :param data_handler: provides a sink for the data blocks we should stream
+
+    :returns: :class:`~stem.response.ControlMessage` read from the socket
+
+    :raises:
+      * :class:`stem.ProtocolError` the content from the socket is malformed
+      * :class:`stem.SocketClosed` if the socket closes before we receive
+        a complete message
+    """
+
+    parsed_content = []  # type: List[Tuple[str, str, bytes]]
+    raw_content = bytearray()
+    first_line = True
+
+    while True:
+      line = await self._readline()
+
+      if not MESSAGE_PREFIX.match(line):
+        log.info(ERROR_MSG % ('ProtocolError', 'malformed status code/divider, "%s"' % log.escape(line.decode('utf-8'))))
+        raise stem.ProtocolError('Badly formatted reply line: beginning is malformed')
+      elif not line.endswith(b'\r\n'):
+        log.info(ERROR_MSG % ('ProtocolError', 'no CRLF linebreak, "%s"' % log.escape(line.decode('utf-8'))))
+        raise stem.ProtocolError('All lines should end with CRLF')
+
+      status_code, divider, content = stem.util.str_tools._to_unicode(line[:3]), stem.util.str_tools._to_unicode(line[3:4]), line[4:-2]
+
+      if first_line and divider == ' ':
+        _log_trace(line)
+        return stem.response.ControlMessage([(status_code, divider, content)], line, arrived_at = arrived_at)
+
+      first_line = False
+      raw_content += line
+
+      if divider == '-':
+        parsed_content.append((status_code, divider, content))
+      elif divider == ' ':
+        parsed_content.append((status_code, divider, content))
+        _log_trace(bytes(raw_content))
+        return stem.response.ControlMessage(parsed_content, bytes(raw_content), arrived_at = arrived_at)
+      elif divider == '+':
+        data_sink = data_handler(status_code, content) if data_handler else None
+
+        if data_sink:
+          await self._stream_data_block(data_sink, raw_content)
+          parsed_content.append((status_code, divider, content))
+        else:
+          data_block = await self._read_data_block(raw_content)
+          parsed_content.append((status_code, divider, content + b'\n' + data_block if data_block is not None else content))
+      else:
+        log.warn(ERROR_MSG % ('ProtocolError', "\"%s\" isn't a recognized divider type" % divider))
+        raise stem.ProtocolError("Unrecognized divider type '%s': %s" % (divider, stem.util.str_tools._to_unicode(line)))
+
+  async def _fill(self) -> None:
+    """
+    Reads more content from the socket.
+    """
+
+    try:
+      data = await self.reader.read(READ_SIZE)
+    except AttributeError:
+      log.info(ERROR_MSG % ('SocketClosed', 'socket file has been closed'))
+      raise stem.SocketClosed('socket file has been closed')
+    except (OSError, ValueError) as exc:
+      log.info(ERROR_MSG % ('SocketClosed', 'received exception "%s"' % exc))
+      raise stem.SocketClosed(exc)
+
+    if not data:
+      log.info(ERROR_MSG % ('SocketClosed', 'empty socket content'))
+      raise stem.SocketClosed('Received empty socket content.')
+
+    # drop the content we've already processed
+
+    if self._offset:
+      del self._buffer[:self._offset]
+      self._offset = 0
+
+    self._buffer += data
+
+  async def _readline(self) -> bytes:
+    """
+    Provides our next line, including its newline.
+    """
+
+    search_from = self._offset
+
+    while True:
+      line_end = self._buffer.find(b'\n', search_from)
+
+      if line_end != -1:
+        line = bytes(self._buffer[self._offset:line_end + 1])
+        self._offset = line_end + 1
+        return line
+
+      search_from = len(self._buffer) - self._offset
+      await self._fill()
+      search_from += self._offset
+
+  async def _read_data_block(self, raw_content: bytearray) -> Optional[bytes]:
+    """
+    Reads the remainder of a data block.
+
+    :param raw_content: raw message content, which we append the block to
+
+    :returns: **bytes** of the data block, or **None** if it's empty
+    """
+
+    search_from = 0  # relative to our offset
+
+    while True:
+      if self._buffer.startswith(b'.\r\n', self._offset):
+        raw_content += b'.\r\n'
+        self._offset += 3
+        return None
+
+      block_end = self._buffer.find(b'\r\n.\r\n', self._offset + search_from)
+
+      if block_end != -1:
+        break
+
+      search_from = max(0, len(self._buffer) - self._offset - 4)
+      await self._fill()
+
+    with memoryview(self._buffer) as buffer_view:
+      raw_content += buffer_view[self._offset:block_end + 5]
+
+    data_block = _decode_data_block(self._buffer[self._offset:block_end])
+    self._offset = block_end + 5
+
+    return data_block
+
+  async def _stream_data_block(self, data_sink: Callable[[bytes], Awaitable[None]], raw_content: bytearray) -> None:
+    """
+    Provides the remainder of a data block to a sink as it arrives.
+
+    :param data_sink: sink for newline separated chunks of the data block
+    :param raw_content: raw message content, which we append the block's
+      terminator to
+    """
+
+    while True:
+      if self._buffer.startswith(b'.\r\n', self._offset):
+        break
+
+      block_end = self._buffer.find(b'\r\n.\r\n', self._offset)
+
+      if block_end != -1:
+        await data_sink(_decode_data_block(self._buffer[self._offset:block_end]) + b'\n')
+        self._offset = block_end + 2
+        break
+
+      # provide the complete lines we have if there's enough of them
+
+      lines_end = self._buffer.rfind(b'\r\n', self._offset)
+
+      if lines_end != -1 and lines_end - self._offset >= DATA_CHUNK_SIZE:
+        await data_sink(_decode_data_block(self._buffer[self._offset:lines_end]) + b'\n')
+        self._offset = lines_end + 2
+
+      await self._fill()
+
+    raw_content += b'.\r\n'
+    self._offset += 3
+
+
+def _decode_data_block(data_block: bytearray) -> bytes:
+  """
+  Converts data block lines to newline separated content, unescaping lines
+  that start with a period (as per section 2.4 of the control-spec).
+
+  :param data_block: CRLF separated lines, without a trailing CRLF
+
+  :returns: **bytes** with the decoded content
+
+  :raises: :class:`stem.ProtocolError` if a line lacks a CRLF
+  """
+
+  if data_block.count(b'\n') != data_block.count(b'\r\n'):
+    log.info(ERROR_MSG % ('ProtocolError', 'CRLF linebreaks missing from a data reply, "%s"' % log.escape(bytes(data_block).decode('utf-8'))))
+    raise stem.ProtocolError('All lines should end with CRLF')
+
+  data_block = data_block.replace(b'\r\n', b'\n')
+
+  if data_block.startswith(b'..'):
+    del data_block[0]
+
+  return bytes(data_block.replace(b'\n..', b'\n.'))
+
+
 def recv_message_from_bytes_io(reader: BinaryIO, arrived_at: Optional[float] = None) -> stem.response.ControlMessage:
   """
   Pulls from an I/O stream until we either have a complete message or
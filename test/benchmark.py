@@ -0,0 +1,545 @@
+# Copyright 2020, Damian Johnson and The Tor Project
+# See LICENSE for licensing information
+
+"""
+Performance comparisons between our implementations. These aren't part of our
+test suite since their results depend upon the system, but can be run with...
+
+::
+
+  % python -m test.benchmark [benchmark...]
+
+If no benchmarks are named then we run all of them.
+"""
+
+import asyncio
+import collections
+import io
+import os
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import stem.control
+import stem.descriptor
+import stem.response
+import stem.response.events
+import stem.socket
+import stem.util.str_tools
+
+RUNS = 5
+
+
+def _best_time(func, *args):
+  """
+  Provides the shortest runtime across several runs of a function.
+
+  :param function func: function to be timed
+  :param list args: arguments for the function
+
+  :returns: **float** for the best runtime in seconds
+  """
+
+  runtimes = []
+
+  for _ in range(RUNS):
+    start = time.perf_counter()
+    func(*args)
+    runtimes.append(time.perf_counter() - start)
+
+  return min(runtimes)
+
+
+def _print_comparison(label, baseline, candidate):
+  print('  %-30s %8.1f ms => %8.1f ms (%.1fx)' % (label, baseline * 1000, candidate * 1000, baseline / candidate))
+
+
+def bench_framing():
+  """
+  Reading control messages line by line (recv_message) versus in bulk
+  (ControlSocket's framer).
+  """
+
+  def read_messages(content, count, read_message):
+    async def run():
+      reader = asyncio.StreamReader(limit = 2 ** 16)
+
+      for i in range(0, len(content), stem.socket.READ_SIZE):
+        reader.feed_data(content[i:i + stem.socket.READ_SIZE])
+
+      reader.feed_eof()
+      read = read_message(reader)
+
+      for _ in range(count):
+        await read()
+
+    asyncio.run(run())
+
+  def recv_message(reader):
+    return lambda: stem.socket.recv_message(reader)
+
+  def framer(reader):
+    return stem.socket._MessageFramer(reader).recv
+
+  microdescriptor = b'onion-key\r\n-----BEGIN RSA PUBLIC KEY-----\r\n' + b'MIGJAoGBAMhPQtZPaxP3ukybV5LfofKQr20/ljpRk0e9IlGWWMSTkfVvBcHsa6IM\r\n' * 3 + b'-----END RSA PUBLIC KEY-----\r\nntor-onion-key r5572HzD3sa8V5kGZ6rpnvtdcFgXtIZuMqN6T7R+9jI=\r\nfamily $6E5D0B5E4BCA6BA8E4F4A3E4E8AE4E25B5A38E0E\r\nid ed25519 J2BxUBcprtDIcAcgRXKgFybhpzd+ROB+n/7Mnsxe0B8\r\n'
+  large_reply = b'250+md/all=\r\n' + microdescriptor * 10000 + b'.\r\n250 OK\r\n'
+  small_replies = b'250-version=0.4.5.1\r\n250 OK\r\n650 BW 15 25\r\n' * 5000
+
+  _print_comparison('md/all reply (%i KB)' % (len(large_reply) / 1024), _best_time(read_messages, large_reply, 1, recv_message), _best_time(read_messages, large_reply, 1, framer))
+  _print_comparison('10,000 small messages', _best_time(read_messages, small_replies, 10000, recv_message), _best_time(read_messages, small_replies, 10000, framer))
+
+
+def bench_event_args():
+  """
+  Parsing event arguments with regular expressions that rescan the content for
+  each keyword argument versus a single pass tokenizer.
+  """
+
+  kw_arg = re.compile('^(.*) ([A-Za-z0-9_]+)=(\\S*)$')
+  quoted_kw_arg = re.compile('^(.*) ([A-Za-z0-9_]+)="(.*)"$')
+
+  def parse_with_regexes(content):
+    keyword_args = {}
+
+    while True:
+      match = quoted_kw_arg.match(content) or kw_arg.match(content)
+
+      if match:
+        content, keyword, value = match.groups()
+        keyword_args[keyword] = value
+      else:
+        break
+
+    return content.split()[1:], keyword_args
+
+  def parse_events(content, count, parse):
+    for _ in range(count):
+      parse(content)
+
+  circ_event = 'CIRC 7 BUILT $999A226EBED397F331B612FE1E4CFAE5C1F201BA=piyaz,$6D6FE3BFBE8E0CBC8BE5B8E6C1E6F15F7C0EF2A3=Ukaser BUILD_FLAGS=NEED_CAPACITY PURPOSE=GENERAL TIME_CREATED=2012-11-08T16:48:38.417238 REASON=FINISHED REMOTE_REASON=DONE SOCKS_USERNAME="foo bar" SOCKS_PASSWORD="baz" HS_STATE=HSCI_CONNECTING REND_QUERY=expyuzz4wqqyqhjn'
+  bw_event = 'BW 15 25'
+
+  _print_comparison('10,000 CIRC events', _best_time(parse_events, circ_event, 10000, parse_with_regexes), _best_time(parse_events, circ_event, 10000, stem.response.events._parse_args))
+  _print_comparison('10,000 BW events', _best_time(parse_events, bw_event, 10000, parse_with_regexes), _best_time(parse_events, bw_event, 10000, stem.response.events._parse_args))
+
+
+def bench_event_memory():
+  """
+  Memory retained per event by events versus their compact copies.
+  """
+
+  def memory_per_event(content, count, compact):
+    tracemalloc.start()
+
+    try:
+      events = []
+
+      for i in range(count):
+        message = stem.socket.recv_message_from_bytes_io(io.BytesIO(content % i))
+        event = stem.response._convert_to_event(message)
+        events.append(event.compact() if compact else event)
+
+      return tracemalloc.get_traced_memory()[0] / count
+    finally:
+      tracemalloc.stop()
+
+  circ_bw_event = b'650 CIRC_BW ID=%i READ=500 WRITTEN=120 TIME=2018-05-04T06:08:55.751726 DELIVERED_READ=0 OVERHEAD_READ=0 DELIVERED_WRITTEN=0 OVERHEAD_WRITTEN=0\r\n'
+  stream_bw_event = b'650 STREAM_BW %i 500 120 2018-05-04T06:08:55.751726\r\n'
+
+  for label, content in (('CIRC_BW events', circ_bw_event), ('STREAM_BW events', stream_bw_event)):
+    event_size, compact_size = memory_per_event(content, 10000, False), memory_per_event(content, 10000, True)
+    print('  %-30s %8i B => %8i B (%.1fx)' % (label, event_size, compact_size, event_size / compact_size))
+
+
+def bench_replay():
+  """
+  Throughput of listeners that count recorded events by their type, with
+  events parsed as they're received versus when their attributes are first
+  accessed.
+  """
+
+  def replay(path, lazy_event_parsing):
+    controller = stem.control.Controller(stem.socket.ControlSocket())
+    counts = collections.Counter()
+
+    try:
+      controller.set_lazy_event_parsing(lazy_event_parsing)
+      controller.add_event_listener(lambda event: counts.update((event.type,)), stem.control.EventType.CIRC, stem.control.EventType.BW)
+      controller.replay_events(path, speed = None)
+    finally:
+      controller.close()
+
+  circ_event = b'650 CIRC %i BUILT $999A226EBED397F331B612FE1E4CFAE5C1F201BA=piyaz,$6D6FE3BFBE8E0CBC8BE5B8E6C1E6F15F7C0EF2A3=Ukaser BUILD_FLAGS=NEED_CAPACITY PURPOSE=GENERAL TIME_CREATED=2012-11-08T16:48:38.417238\r\n'
+  bw_event = b'650 BW %i 25\r\n'
+
+  with tempfile.TemporaryDirectory() as tmp_dir:
+    path = os.path.join(tmp_dir, 'events')
+
+    with stem.control.EventRecorder(path) as recorder:
+      for i in range(5000):
+        recorder.record(stem.socket.recv_message_from_bytes_io(io.BytesIO(circ_event % (i + 1))), i)
+        recorder.record(stem.socket.recv_message_from_bytes_io(io.BytesIO(bw_event % i)), i)
+
+    _print_comparison('10,000 events', _best_time(replay, path, False), _best_time(replay, path, True))
+
+
+def bench_descriptor_splitting():
+  """
+  Splitting cached-descriptors and consensus content into descriptors by
+  reading it line by line versus searching a buffer for their boundaries.
+  """
+
+  data_dir = os.path.join(os.path.dirname(__file__), 'unit', 'descriptor', 'data')
+
+  def read_until(keywords, descriptor_file, inclusive = False, ignore_first = False):
+    # prior implementation, which checked each line with a regular expression
+
+    content = [descriptor_file.readline()] if ignore_first else []
+    keyword_match = re.compile(stem.descriptor.SPECIFIC_KEYWORD_LINE % '|'.join(keywords))
+
+    while True:
+      last_position = descriptor_file.tell()
+      line = descriptor_file.readline()
+
+      if not line:
+        break
+      elif keyword_match.match(stem.util.str_tools._to_unicode(line)):
+        if inclusive:
+          content.append(line)
+        else:
+          descriptor_file.seek(last_position)
+
+        break
+      else:
+        content.append(line)
+
+    return content
+
+  def split_server_descriptors_by_line(content):
+    descriptor_file = io.BytesIO(content)
+
+    while True:
+      while True:
+        position = descriptor_file.tell()
+
+        if not descriptor_file.readline().startswith(b'@'):
+          descriptor_file.seek(position)
+          break
+
+      descriptor_content = read_until(('router-signature',), descriptor_file)
+      descriptor_content += read_until(('-----END',), descriptor_file, True)
+
+      if not descriptor_content:
+        break
+
+      bytes.join(b'', descriptor_content)
+
+  def split_server_descriptors_by_buffer(content):
+    for descriptor_content in stem.descriptor._split_descriptors(content, b'router-signature', with_signature = True, skip_annotations = True):
+      bytes(descriptor_content)
+
+  def split_router_status_entries_by_line(content):
+    descriptor_file = io.BytesIO(content)
+
+    while True:
+      entry_content = read_until(('r', 'directory-footer'), descriptor_file, ignore_first = True)
+
+      if not entry_content:
+        break
+
+      bytes.join(b'', entry_content)
+
+      if entry_content[-1].startswith(b'directory-footer'):
+        break
+
+  def split_router_status_entries_by_buffer(content):
+    content_view, entry_start = memoryview(content), 0
+
+    for index, keyword in stem.descriptor._find_lines(content, (b'r', b'directory-footer'), 1):
+      bytes(content_view[entry_start:index])
+      entry_start = index
+
+      if keyword == b'directory-footer':
+        break
+
+  with open(os.path.join(data_dir, 'metrics_server_desc_multiple'), 'rb') as desc_file:
+    server_descriptors = desc_file.read().split(b'\n', 1)[1] * 5000
+
+  with open(os.path.join(data_dir, 'cached-consensus'), 'rb') as consensus_file:
+    consensus = consensus_file.read()
+    routers = consensus[consensus.index(b'\nr ') + 1:consensus.index(b'\ndirectory-footer') + 1]
+    router_status_entries = routers * 5000 + b'directory-footer\n'
+
+  _print_comparison('cached-descriptors (%i MB)' % (len(server_descriptors) / 1048576), _best_time(split_server_descriptors_by_line, server_descriptors), _best_time(split_server_descriptors_by_buffer, server_descriptors))
+  _print_comparison('consensus entries (%i MB)' % (len(router_status_entries) / 1048576), _best_time(split_router_status_entries_by_line, router_status_entries), _best_time(split_router_status_entries_by_buffer, router_status_entries))
+
+
+def bench_descriptor_mapping():
+  """
+  Parsing cached-microdescs and cached-consensus files that are read into
+  memory versus memory-mapped.
+  """
+
+  data_dir = os.path.join(os.path.dirname(__file__), 'unit', 'descriptor', 'data')
+
+  def parse(descriptor_file):
+    for desc in stem.descriptor.parse_file(descriptor_file):
+      pass
+
+  def peak_memory(func, *args):
+    tracemalloc.start()
+
+    try:
+      func(*args)
+      return tracemalloc.get_traced_memory()[1]
+    finally:
+      tracemalloc.stop()
+
+  def parse_opened_file(path):
+    with open(path, 'rb') as desc_file:
+      parse(desc_file)
+
+  with open(os.path.join(data_dir, 'cached-microdescs'), 'rb') as desc_file:
+    microdescriptors = desc_file.read() * 10000
+
+  with open(os.path.join(data_dir, 'cached-consensus'), 'rb') as consensus_file:
+    consensus = consensus_file.read()
+    routers_start, footer_start = consensus.index(b'\nr ') + 1, consensus.index(b'\ndirectory-footer') + 1
+    consensus = consensus[:routers_start] + consensus[routers_start:footer_start] * 3000 + consensus[footer_start:]
+
+  with tempfile.TemporaryDirectory() as tmp_dir:
+    for filename, content in (('cached-microdescs', microdescriptors), ('cached-consensus', consensus)):
+      path = os.path.join(tmp_dir, filename)
+
+      with open(path, 'wb') as output_file:
+        output_file.write(content)
+
+      label = '%s (%i MB)' % (filename, len(content) / 1048576)
+      _print_comparison(label, _best_time(parse_opened_file, path), _best_time(parse, path))
+      print('  %-30s %8.1f MB => %8.1f MB peak memory' % ('', peak_memory(parse_opened_file, path) / 1048576, peak_memory(parse, path) / 1048576))
+
+
+def bench_descriptor_workers():
+  """
+  Parsing every attribute of server descriptors and microdescriptors within
+  this process versus a pool of workers (one per core, and at least two).
+  """
+
+  data_dir = os.path.join(os.path.dirname(__file__), 'unit', 'descriptor', 'data')
+  workers = max(2, os.cpu_count() or 1)
+
+  def parse(path, workers = None):
+    for desc in stem.descriptor.parse_file(path, workers = workers):
+      for attr in desc.ATTRIBUTES:
+        getattr(desc, attr)
+
+  with open(os.path.join(data_dir, 'metrics_server_desc_multiple'), 'rb') as desc_file:
+    server_descriptors = desc_file.read() * 1000
+
+  with open(os.path.join(data_dir, 'cached-microdescs'), 'rb') as desc_file:
+    microdescriptors = desc_file.read() * 10000
+
+  print('  %-30s %i workers' % ('', workers))
+
+  with tempfile.TemporaryDirectory() as tmp_dir:
+    for filename, content in (('metrics_server_desc_multiple', server_descriptors), ('cached-microdescs', microdescriptors)):
+      path = os.path.join(tmp_dir, filename)
+
+      with open(path, 'wb') as output_file:
+        output_file.write(content)
+
+      _print_comparison('%s (%i MB)' % (filename, len(content) / 1048576), _best_time(parse, path), _best_time(parse, path, workers))
+
+
+def bench_descriptor_fields():
+  """
+  Parsing every line of descriptors versus only the fields that the
+  docs/_static/example/benchmark_stem.py measurements use.
+  """
+
+  data_dir = os.path.join(os.path.dirname(__file__), 'unit', 'descriptor', 'data')
+
+  def parse(content, descriptor_type, measure, fields = None):
+    for desc in stem.descriptor.parse_file(io.BytesIO(content), descriptor_type, fields = fields):
+      measure(desc)
+
+  workloads = (
+    ('server descriptors', 'metrics_server_desc_multiple', 'server-descriptor 1.0', 1000, ('average_bandwidth', 'burst_bandwidth', 'observed_bandwidth'), lambda desc: min(desc.average_bandwidth, desc.burst_bandwidth, desc.observed_bandwidth)),
+    ('extra-info descriptors', 'extrainfo_relay_descriptor', 'extra-info 1.0', 2000, ('dir_v3_responses',), lambda desc: desc.dir_v3_responses),
+    ('microdescriptors', 'cached-microdescs', 'microdescriptor 1.0', 5000, ('exit_policy',), lambda desc: desc.exit_policy.can_exit_to(port = 80)),
+  )
+
+  for label, filename, descriptor_type, copies, fields, measure in workloads:
+    with open(os.path.join(data_dir, filename), 'rb') as desc_file:
+      content = desc_file.read() * copies
+
+    _print_comparison(label, _best_time(parse, content, descriptor_type, measure), _best_time(parse, content, descriptor_type, measure, fields))
+
+
+def bench_descriptor_tokenizing():
+  """
+  Breaking each descriptor within our test data into keyword lines by popping
+  lines from the front of a list versus walking them with an index.
+  """
+
+  data_dir = os.path.join(os.path.dirname(__file__), 'unit', 'descriptor', 'data')
+
+  def tokenize_by_popping(raw_contents, validate):
+    # prior implementation, which popped lines from the front of a list and
+    # checked each value for non-ascii content
+
+    entries = collections.OrderedDict()
+    remaining_lines = stem.util.str_tools._to_unicode(raw_contents).split('\n')
+
+    while remaining_lines:
+      line = remaining_lines.pop(0)
+
+      if not line:
+        continue
+
+      if line.startswith('opt '):
+        line = line[4:]
+
+      line_match = stem.descriptor.KEYWORD_LINE.match(line)
+
+      if not line_match:
+        continue
+
+      keyword, value = line_match.groups()
+      block_type, block_contents = None, None
+      block_match = stem.descriptor.PGP_BLOCK_START.match(remaining_lines[0]) if remaining_lines else None
+
+      if block_match:
+        block_type, block_lines = block_match.groups()[0], []
+
+        while remaining_lines:
+          block_lines.append(remaining_lines.pop(0))
+
+          if block_lines[-1] == stem.descriptor.PGP_BLOCK_END % block_type:
+            block_contents = '\n'.join(block_lines)
+            break
+
+      if validate:
+        try:
+          (value or '').encode('ascii')
+        except UnicodeError:
+          pass
+
+      entries.setdefault(keyword, []).append((value or '', block_type, block_contents))
+
+    return entries
+
+  def tokenize(func, documents, validate):
+    for content in documents:
+      func(content, validate)
+
+  documents, total_size = [], 0
+
+  for filename in sorted(os.listdir(data_dir)):
+    path = os.path.join(data_dir, filename)
+
+    if not os.path.isfile(path) or '.tar' in filename or filename.startswith('compressed_'):
+      continue
+
+    with open(path, 'rb') as desc_file:
+      documents.append(desc_file.read())
+      total_size += len(documents[-1])
+
+  def is_valid(content):
+    try:
+      stem.descriptor._descriptor_components(content, True)
+      return True
+    except ValueError:
+      return False
+
+  valid_documents = list(filter(is_valid, documents))
+
+  _print_comparison('%i documents (%i KB)' % (len(documents), total_size / 1024), _best_time(tokenize, tokenize_by_popping, documents, False), _best_time(tokenize, stem.descriptor._descriptor_components, documents, False))
+  _print_comparison('%i validated documents' % len(valid_documents), _best_time(tokenize, tokenize_by_popping, valid_documents, True), _best_time(tokenize, stem.descriptor._descriptor_components, valid_documents, True))
+
+  with open(os.path.join(data_dir, 'cached-consensus'), 'rb') as consensus_file:
+    consensus = consensus_file.read()
+    routers_start, footer_start = consensus.index(b'\nr ') + 1, consensus.index(b'\ndirectory-footer') + 1
+    consensus = consensus[:routers_start] + consensus[routers_start:footer_start] * 1000 + consensus[footer_start:]
+
+  _print_comparison('consensus (%i KB)' % (len(consensus) / 1024), _best_time(tokenize_by_popping, consensus, False), _best_time(stem.descriptor._descriptor_components, consensus, False))
+
+
+def bench_bandwidth_aggregation():
+  """
+  Summarizing the bandwidth of each circuit by visiting our samples one tuple
+  at a time versus from running totals and per column.
+  """
+
+  samples = stem.control._BandwidthSamples(65536)
+
+  for i in range(65536 * 2):
+    samples.append(i / 10.0, str(i % 2000), 10, 5)
+
+  def columns(start, end):
+    # prior implementation, which yielded a tuple for each sample
+
+    for ids, read, written in zip(samples.slices(samples.ids, start, end), samples.slices(samples.read, start, end), samples.slices(samples.written, start, end)):
+      for entry in zip(ids, read, written):
+        yield entry
+
+  def entry_total_by_sample(entry_index, start, end):
+    read, written = 0, 0
+
+    for sample_id, sample_read, sample_written in columns(start, end):
+      if sample_id == entry_index:
+        read += sample_read
+        written += sample_written
+
+    return (read, written)
+
+  def totals_by_sample(start, end):
+    totals = {}
+
+    for sample_id, read, written in columns(start, end):
+      entry_totals = totals.get(sample_id)
+
+      if entry_totals is None:
+        totals[sample_id] = [read, written]
+      else:
+        entry_totals[0] += read
+        entry_totals[1] += written
+
+    return totals
+
+  entry_index = samples.id_index('5')
+
+  for label, window in (('all', None), ('hour', 3600), ('minute', 60)):
+    start, end = samples.window(window)
+
+    _print_comparison('one circuit (%s)' % label, _best_time(entry_total_by_sample, entry_index, start, end), _best_time(samples.total, entry_index, start, end))
+    _print_comparison('2,000 circuits (%s)' % label, _best_time(totals_by_sample, start, end), _best_time(samples.totals, start, end))
+
+
+BENCHMARKS = collections.OrderedDict((
+  ('framing', bench_framing),
+  ('event_args', bench_event_args),
+  ('event_memory', bench_event_memory),
+  ('replay', bench_replay),
+  ('descriptor_splitting', bench_descriptor_splitting),
+  ('descriptor_mapping', bench_descriptor_mapping),
+  ('descriptor_workers', bench_descriptor_workers),
+  ('descriptor_fields', bench_descriptor_fields),
+  ('descriptor_tokenizing', bench_descriptor_tokenizing),
+  ('bandwidth_aggregation', bench_bandwidth_aggregation),
+))
+
+
+if __name__ == '__main__':
+  names = sys.argv[1:] if len(sys.argv) > 1 else list(BENCHMARKS.keys())
+
+  for name in names:
+    if name not in BENCHMARKS:
+      print("'%s' isn't a benchmark, options are: %s" % (name, ', '.join(BENCHMARKS.keys())))
+      sys.exit(1)
+
+    print('%s: %s' % (name, BENCHMARKS[name].__doc__.strip().replace('\n  ', ' ')))
+    BENCHMARKS[name]()
+    print('')
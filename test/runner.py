@@ -44,9 +44,11 @@ import uuid
 
 import stem.connection
 import stem.process
+import stem.response
 import stem.socket
 import stem.util.conf
 import stem.util.enum
+import stem.util.str_tools
 import test
 
 from test.output import println, STATUS, ERROR, SUBSTATUS, NO_NL
@@ -125,21 +127,6 @@ def get_runner():
   return INTEG_RUNNER
 
 
-class _MockChrootFile(object):
-  """
-  Wrapper around a file object that strips given content from readline()
-  responses. This is used to simulate a chroot setup by removing the prefix
-  directory from the paths we report.
-  """
-
-  def __init__(self, wrapped_file, strip_text):
-    self.wrapped_file = wrapped_file
-    self.strip_text = strip_text
-
-  async def readline(self):
-    return (await self.wrapped_file.readline()).replace(self.strip_text, '')
-
-
 class Runner(object):
   def __init__(self):
     self.attribute_targets = []
@@ -156,9 +143,9 @@ class Runner(object):
     self._tor_process = None
     self._chroot_path = None
 
-    # set if we monkey patch stem.socket.recv_message()
+    # set if we monkey patch stem.socket.ControlSocket.recv()
 
-    self._original_recv_message = None
+    self._original_recv = None
 
     # The first controller to attach takes ownership so tor will promptly
     # terminate if the tests do. As such we need to ensure that first
@@ -244,20 +231,22 @@ class Runner(object):
         self._run_setup()
         self._start_tor(self._tor_cmd)
 
-        # strip the testing directory from recv_message responses if we're
+        # strip the testing directory from the messages we receive if we're
         # simulating a chroot setup
 
-        if test.Target.CHROOT in self.attribute_targets and not self._original_recv_message:
+        if test.Target.CHROOT in self.attribute_targets and not self._original_recv:
           # TODO: when we have a function for telling stem the chroot we'll
           # need to set that too
 
-          self._original_recv_message = stem.socket.recv_message
+          self._original_recv = stem.socket.ControlSocket.recv
           self._chroot_path = data_dir_path
 
-          async def _chroot_recv_message(control_file):
-            return await self._original_recv_message(_MockChrootFile(control_file, data_dir_path))
+          async def _chroot_recv(control_socket, *args, **kwargs):
+            message = await self._original_recv(control_socket, *args, **kwargs)
+            raw_content = message.raw_content(get_bytes = True).replace(stem.util.str_tools._to_bytes(data_dir_path), b'')
+            return stem.response.ControlMessage.from_str(raw_content, arrived_at = message.arrived_at)
 
-          stem.socket.recv_message = _chroot_recv_message
+          stem.socket.ControlSocket.recv = _chroot_recv
 
         if self.is_accessible():
           # TODO: refactor so owner controller is less convoluted
@@ -311,10 +300,10 @@ class Runner(object):
       if self._test_dir and CONFIG['integ.test_directory'] == '':
         shutil.rmtree(self._test_dir, ignore_errors = True)
 
-      # reverts any mocking of stem.socket.recv_message
-      if self._original_recv_message:
-        stem.socket.recv_message = self._original_recv_message
-        self._original_recv_message = None
+      # reverts any mocking of stem.socket.ControlSocket.recv
+      if self._original_recv:
+        stem.socket.ControlSocket.recv = self._original_recv
+        self._original_recv = None
 
       # clean up our socket directory if we made one
       socket_dir = os.path.dirname(CONTROL_SOCKET_PATH)
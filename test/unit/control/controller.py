@@ -6,8 +6,12 @@ integ tests, but a few bits lend themselves to unit testing.
 import asyncio
 import datetime
 import io
+import os
+import tempfile
+import time
 import unittest
 
+import stem.descriptor.microdescriptor
 import stem.descriptor.router_status_entry
 import stem.response
 import stem.response.events
@@ -17,8 +21,8 @@ import stem.version
 
 from unittest.mock import Mock, patch
 
-from stem import ControllerError, DescriptorUnavailable, InvalidArguments, InvalidRequest, ProtocolError, UnsatisfiableRequest
-from stem.control import MALFORMED_EVENTS, _parse_circ_path, Listener, Controller, EventType
+from stem import CircStatus, ControllerError, DescriptorUnavailable, InvalidArguments, InvalidRequest, ProtocolError, UnsatisfiableRequest
+from stem.control import EVENT_RECORD, LATENCY_BUCKETS, MALFORMED_EVENTS, STREAM_BACKLOG, _parse_circ_path, _sum_bandwidth, read_recorded_events, BandwidthAggregator, _ListenerQueue, _ReplyStream, EventQueueOverflow, EventRecorder, Listener, ListenerOverflow, StreamAttacher, Controller, EventType
 from stem.response import ControlMessage
 from stem.exit_policy import ExitPolicy
 from stem.util.test_tools import coro_func_raising_exc, coro_func_returning_value
@@ -53,6 +57,37 @@ class TestControl(unittest.TestCase):
   def tearDown(self):
     self.controller.close()
 
+  def test_msg_pipelining(self):
+    """
+    Issue several concurrent requests with pipelining enabled, checking that
+    they're all sent before any reply arrives and get their own response.
+    """
+
+    loop = self.controller._loop
+    sent = []
+
+    async def send_mock(message):
+      sent.append(message)
+
+    self.assertFalse(self.controller.is_pipelining_enabled())
+    self.controller.set_pipelining(True)
+    self.assertTrue(self.controller.is_pipelining_enabled())
+
+    with patch('stem.socket.ControlSocket.send', Mock(side_effect = send_mock)):
+      requests = [asyncio.run_coroutine_threadsafe(Controller.msg(self.controller, 'GETINFO %s' % key), loop) for key in ('version', 'uptime', 'address')]
+
+      while len(sent) < 3:
+        time.sleep(0.001)
+
+      self.assertEqual(['GETINFO version', 'GETINFO uptime', 'GETINFO address'], sent)
+
+      for reply in ('250-version=0.4.5.1\r\n250 OK\r\n', '250-uptime=5\r\n250 OK\r\n', '551 Address unknown\r\n'):
+        loop.call_soon_threadsafe(self.controller._deliver_reply, ControlMessage.from_str(reply))
+
+      self.assertEqual('version=0.4.5.1\nOK', str(requests[0].result(1)))
+      self.assertEqual('uptime=5\nOK', str(requests[1].result(1)))
+      self.assertEqual('Address unknown', str(requests[2].result(1)))
+
   def test_event_description(self):
     self.assertEqual("Logging at the debug runlevel. This is low level, high volume information about tor's internals that generally isn't useful to users.", stem.control.event_description('DEBUG'))
     self.assertEqual('Event emitted every second with the bytes sent and received by tor.', stem.control.event_description('BW'))
@@ -125,6 +160,151 @@ class TestControl(unittest.TestCase):
     self.assertRaisesWith(stem.OperationFailed, 'Not running in server mode', self.controller.get_info, 'fingerprint')
     self.assertEqual(2, msg_mock.call_count)
 
+  @patch('stem.control.Controller.msg')
+  def test_get_info_coalescing(self, msg_mock):
+    """
+    Concurrent GETINFO queries should be sent as a single request when
+    coalescing is enabled.
+    """
+
+    values = {'version': '0.4.5.1', 'uptime': '5', 'fingerprint': 'ABCD'}
+
+    async def msg_side_effect(controller, message):
+      params = message.split()[1:]
+
+      if 'bogus' in params:
+        return ControlMessage.from_str('552 Unrecognized key "bogus"\r\n')
+
+      return ControlMessage.from_str(''.join(['250-%s=%s\r\n' % (param, values[param]) for param in params]) + '250 OK\r\n')
+
+    msg_mock.side_effect = msg_side_effect
+    loop = self.controller._loop
+
+    self.assertFalse(self.controller.is_coalescing_enabled())
+    self.controller.set_coalescing(True)
+    self.assertTrue(self.controller.is_coalescing_enabled())
+
+    async def query(*params):
+      return await asyncio.gather(*[Controller.get_info(self.controller, param, 'default') for param in params])
+
+    self.assertEqual(['0.4.5.1', '5', 'ABCD'], asyncio.run_coroutine_threadsafe(query('version', 'uptime', 'fingerprint'), loop).result())
+    self.assertEqual(1, msg_mock.call_count)
+
+    # a bad parameter shouldn't cause other queries to fail
+
+    msg_mock.reset_mock()
+    self.controller.clear_cache()
+
+    self.assertEqual(['0.4.5.1', 'default'], asyncio.run_coroutine_threadsafe(query('version', 'bogus'), loop).result())
+    self.assertEqual(3, msg_mock.call_count)
+
+  @patch('stem.control.Controller.msg')
+  def test_get_conf_coalescing(self, msg_mock):
+    """
+    Concurrent GETCONF queries for differently cased options should query each
+    option once, and only retry alone if another caller's option is invalid.
+    """
+
+    async def msg_side_effect(controller, message):
+      lines = ['ExitPolicy=accept *:80', 'ExitPolicy=reject *:*'] * len(message.split()[1:])
+      return ControlMessage.from_str(''.join(['250-%s\r\n' % line for line in lines[:-1]]) + '250 %s\r\n' % lines[-1])
+
+    msg_mock.side_effect = msg_side_effect
+    loop = self.controller._loop
+    self.controller.set_coalescing(True)
+
+    async def query(*params):
+      return await asyncio.gather(*[Controller.get_conf_map(self.controller, param, multiple = True) for param in params])
+
+    expected = ['accept *:80', 'reject *:*']
+    self.assertEqual([{'ExitPolicy': expected}, {'exitpolicy': expected}], asyncio.run_coroutine_threadsafe(query('ExitPolicy', 'exitpolicy'), loop).result())
+    self.assertEqual(1, msg_mock.call_count)
+    self.assertEqual(1, len(msg_mock.call_args[0][1].split()[1:]))
+
+    # failures other than an unrecognized option aren't retried
+
+    msg_mock.reset_mock()
+    self.controller.clear_cache()
+    msg_mock.side_effect = coro_func_raising_exc(stem.SocketClosed())
+
+    async def failing_query():
+      return await asyncio.gather(*[Controller.get_conf_map(self.controller, param) for param in ('ExitPolicy', 'ORPort')], return_exceptions = True)
+
+    results = asyncio.run_coroutine_threadsafe(failing_query(), loop).result()
+    self.assertTrue(all(isinstance(result, stem.SocketClosed) for result in results))
+    self.assertEqual(1, msg_mock.call_count)
+
+  @patch('stem.control.Controller.msg')
+  def test_get_info_caching_with_ttl(self, msg_mock):
+    """
+    Frequently changing GETINFO parameters are only cached for a short while.
+    """
+
+    message = ControlMessage.from_str('250-traffic/read=1024\r\n250 OK\r\n', 'GETINFO')
+    msg_mock.side_effect = coro_func_returning_value(message)
+
+    with patch('time.time', Mock(return_value = TEST_TIMESTAMP)):
+      self.assertEqual('1024', self.controller.get_info('traffic/read'))
+      self.assertEqual(b'1024', self.controller.get_info('traffic/read', get_bytes = True))
+      self.assertEqual(1, msg_mock.call_count)
+
+    with patch('time.time', Mock(return_value = TEST_TIMESTAMP + 5)):
+      self.assertEqual('1024', self.controller.get_info('traffic/read'))
+      self.assertEqual(2, msg_mock.call_count)
+
+    stats = self.controller.get_cache_stats()
+    self.assertEqual(1, stats.hits)
+    self.assertEqual(1, stats.expirations)
+
+  @patch('stem.control.Controller.msg')
+  def test_get_info_caching_until_event(self, msg_mock):
+    """
+    Descriptor related GETINFO parameters are cached while we're listening for
+    the events that invalidate them.
+    """
+
+    fingerprint = '9695DFC35FFEB861329B9F1AB04C46397020CE31'
+    message = ControlMessage.from_str('250-desc/id/%s=router moria1\r\n250 OK\r\n' % fingerprint, 'GETINFO')
+    msg_mock.side_effect = coro_func_returning_value(message)
+
+    # without a NEWDESC listener we can't tell when this becomes stale
+
+    self.controller.get_info('desc/id/%s' % fingerprint)
+    self.controller.get_info('desc/id/%s' % fingerprint)
+    self.assertEqual(2, msg_mock.call_count)
+
+    self.controller._event_listeners[EventType.NEWDESC] = [Mock()]
+
+    self.controller.get_info('desc/id/%s' % fingerprint)
+    self.controller.get_info('desc/id/%s' % fingerprint)
+    self.assertEqual(3, msg_mock.call_count)
+
+    self.controller._handle_event(ControlMessage.from_str('650 NEWDESC $%s~moria1\r\n' % fingerprint))
+
+    self.controller.get_info('desc/id/%s' % fingerprint)
+    self.assertEqual(4, msg_mock.call_count)
+
+  def test_cache_eviction(self):
+    """
+    Evicts the least recently used entries when our cache is full.
+    """
+
+    self.controller.clear_cache()
+    self.controller._request_cache.max_size = 2
+
+    self.controller._set_cache({'version': '0.4.5.1', 'fingerprint': 'ABCD'}, 'getinfo')
+    self.assertEqual('0.4.5.1', self.controller._get_cache('version', 'getinfo'))
+
+    self.controller._set_cache({'config-file': '/etc/tor/torrc'}, 'getinfo')
+
+    self.assertEqual('0.4.5.1', self.controller._get_cache('version', 'getinfo'))
+    self.assertEqual(None, self.controller._get_cache('fingerprint', 'getinfo'))
+    self.assertEqual('/etc/tor/torrc', self.controller._get_cache('config-file', 'getinfo'))
+
+    stats = self.controller.get_cache_stats()
+    self.assertEqual(1, stats.evictions)
+    self.assertEqual(2, stats.size)
+
   @patch('stem.control.Controller.get_info')
   def test_get_version(self, get_info_mock):
     """
@@ -541,6 +721,190 @@ class TestControl(unittest.TestCase):
 
     self.assertRaises(InvalidArguments, self.controller.get_network_status, nickname)
 
+  @patch('stem.control.Controller._msg_streamed')
+  def test_get_microdescriptors(self, msg_streamed_mock):
+    """
+    Provides microdescriptors as they're read from the socket.
+    """
+
+    descriptors = [stem.descriptor.microdescriptor.Microdescriptor.content({'family': 'relay%i' % i}) for i in range(10)]
+
+    # split our content into chunks that don't align with the descriptors
+
+    content = b'\n'.join(descriptors) + b'\n'
+    chunks = [content[i:i + 100] for i in range(0, len(content), 100)]
+
+    msg_streamed_mock.side_effect = _streamed_reply('md/all', chunks)
+    self.assertEqual(['relay%i' % i for i in range(10)], [desc.family[0] for desc in self.controller.get_microdescriptors()])
+
+    msg_streamed_mock.side_effect = _streamed_reply('md/all', [])
+    self.assertRaises(DescriptorUnavailable, self.controller.get_microdescriptors)
+
+    msg_streamed_mock.side_effect = _streamed_reply('md/all', [], '552 Unrecognized key "md/all"\r\n')
+    self.assertRaises(InvalidArguments, self.controller.get_microdescriptors)
+    self.assertEqual([], list(self.controller.get_microdescriptors([])))
+
+  def test_request_while_streaming(self):
+    """
+    Issue a request while iterating over a streamed reply. Its reply follows
+    the data that we're streaming, so we can't pause reading for our consumer.
+    """
+
+    loop = self.controller._loop
+    descriptors = [stem.descriptor.microdescriptor.Microdescriptor.content({'family': 'relay%i' % i}) for i in range(STREAM_BACKLOG * 2)]
+    sent = []
+
+    async def send_mock(message):
+      sent.append(message)
+
+    async def read_socket():
+      while not sent:
+        await asyncio.sleep(0.001)
+
+      data_sink = self.controller._stream_data('250', b'md/all=')
+
+      for desc in descriptors:
+        await data_sink(desc + b'\n')
+
+      self.controller._deliver_reply(ControlMessage.from_str('250+md/all=\r\n.\r\n250 OK\r\n'))
+
+      while len(sent) < 2:
+        await asyncio.sleep(0.001)
+
+      self.controller._deliver_reply(ControlMessage.from_str('250-version=0.4.5.1\r\n250 OK\r\n'))
+
+    async def iterate():
+      families, version = [], None
+
+      async for desc in Controller.get_microdescriptors(self.controller):
+        if version is None:
+          version = await Controller.msg(self.controller, 'GETINFO version')
+
+        families.append(desc.family[0])
+
+      return families, str(version)
+
+    with patch('stem.socket.ControlSocket.send', Mock(side_effect = send_mock)):
+      asyncio.run_coroutine_threadsafe(read_socket(), loop)
+      families, version = asyncio.run_coroutine_threadsafe(iterate(), loop).result(10)
+
+    self.assertEqual(['GETINFO md/all', 'GETINFO version'], sent)
+    self.assertEqual(['relay%i' % i for i in range(len(descriptors))], families)
+    self.assertEqual('version=0.4.5.1\nOK', version)
+
+  def test_abandoned_reply_stream(self):
+    """
+    Buffer the rest of a streamed reply if its consumer stalls.
+    """
+
+    async def fill_stream():
+      reply_stream = _ReplyStream(asyncio.get_event_loop())
+
+      for i in range(STREAM_BACKLOG * 2):
+        await reply_stream.put(b'chunk %i' % i)
+
+      return len(reply_stream._chunks)
+
+    with patch('stem.control.STREAM_STALL_TIMEOUT', 0.01):
+      self.assertEqual(STREAM_BACKLOG * 2, asyncio.run_coroutine_threadsafe(fill_stream(), self.controller._loop).result(5))
+
+  @patch('stem.control.Controller._msg_streamed')
+  def test_network_status_mirroring(self, msg_streamed_mock):
+    """
+    Provides router status entries from our copy of the consensus, kept current
+    through NS and NEWCONSENSUS events.
+    """
+
+    beaver = NS_DESC % ('Beaver', '/96bKo4soysolMgKn5Hex2nyFSY')
+    caer_sidi = NS_DESC % ('caerSidi', 'p1aag7VwarGxqctS7/fS0y5FU+s')
+
+    beaver_fingerprint = stem.descriptor.router_status_entry._base64_to_hex('/96bKo4soysolMgKn5Hex2nyFSY', False)
+    caer_sidi_fingerprint = stem.descriptor.router_status_entry._base64_to_hex('p1aag7VwarGxqctS7/fS0y5FU+s', False)
+
+    msg_streamed_mock.side_effect = _streamed_reply('ns/all', [beaver.encode('utf-8') + b'\n'])
+
+    self.assertFalse(self.controller.is_network_status_mirroring_enabled())
+    self.controller.set_network_status_mirroring(True)
+    self.assertTrue(self.controller.is_network_status_mirroring_enabled())
+    self.assertEqual(1, msg_streamed_mock.call_count)
+
+    self.assertEqual('Beaver', self.controller.get_network_status('beaver').nickname)
+    self.assertEqual('Beaver', self.controller.get_network_status(beaver_fingerprint).nickname)
+    self.assertRaises(DescriptorUnavailable, self.controller.get_network_status, 'caerSidi')
+
+    # a relay's status changes
+
+    self.controller._handle_event(ControlMessage.from_str('650+NS\r\n%s\r\n.\r\n650 OK\r\n' % caer_sidi.replace('\n', '\r\n')))
+
+    self.assertEqual('caerSidi', self.controller.get_network_status(caer_sidi_fingerprint).nickname)
+    self.assertEqual(['Beaver', 'caerSidi'], sorted([entry.nickname for entry in self.controller.get_network_statuses()]))
+
+    # a new consensus replaces everything
+
+    self.controller._handle_event(ControlMessage.from_str('650+NEWCONSENSUS\r\n%s\r\n.\r\n650 OK\r\n' % caer_sidi.replace('\n', '\r\n')))
+
+    self.assertEqual(['caerSidi'], [entry.nickname for entry in self.controller.get_network_statuses()])
+    self.assertRaises(DescriptorUnavailable, self.controller.get_network_status, beaver_fingerprint)
+    self.assertEqual(1, msg_streamed_mock.call_count)
+
+    with patch('stem.control.BaseController.msg', Mock(side_effect = coro_func_returning_value(ControlMessage.from_str('250 OK\r\n')))):
+      self.controller.set_network_status_mirroring(False)
+
+    self.assertFalse(self.controller.is_network_status_mirroring_enabled())
+    self.assertFalse(EventType.NS in self.controller._event_listeners)
+
+  @patch('stem.control.Controller.get_info')
+  def test_circuit_tracking(self, get_info_mock):
+    """
+    Provides circuits and streams from our tables, kept current through CIRC,
+    CIRC_MINOR, and STREAM events.
+    """
+
+    status = {
+      'circuit-status': '4 BUILT $999A226EBED397F331B612FE1E4CFAE5C1F201BA~piyaz PURPOSE=GENERAL\r\n7 EXTENDED $E57A476CD4DFBD99B4EE52A100A58610AD6E80B9~ergebnisoffen PURPOSE=GENERAL\r\n',
+      'stream-status': '1 SUCCEEDED 4 10.10.10.1:80\r\n',
+    }
+
+    async def get_info(controller, param):
+      return status[param]
+
+    get_info_mock.side_effect = get_info
+
+    self.assertFalse(self.controller.is_circuit_tracking_enabled())
+    self.controller.set_circuit_tracking(True)
+    self.assertTrue(self.controller.is_circuit_tracking_enabled())
+    self.assertEqual(2, get_info_mock.call_count)
+
+    self.assertEqual(['4', '7'], [circ.id for circ in self.controller.get_circuits()])
+    self.assertEqual(CircStatus.EXTENDED, self.controller.get_circuit(7).status)
+    self.assertEqual(['1'], [stream.id for stream in self.controller.get_streams()])
+
+    # circuits and streams come and go
+
+    for event in (
+      '650 CIRC 7 BUILT $E57A476CD4DFBD99B4EE52A100A58610AD6E80B9~ergebnisoffen PURPOSE=GENERAL\r\n',
+      '650 CIRC 4 CLOSED $999A226EBED397F331B612FE1E4CFAE5C1F201BA~piyaz PURPOSE=GENERAL REASON=FINISHED\r\n',
+      '650 CIRC 9 LAUNCHED PURPOSE=GENERAL\r\n',
+      '650 CIRC_MINOR 7 PURPOSE_CHANGED $E57A476CD4DFBD99B4EE52A100A58610AD6E80B9~ergebnisoffen PURPOSE=HS_CLIENT_REND HS_STATE=HSCR_JOINED OLD_PURPOSE=GENERAL\r\n',
+      '650 STREAM 1 CLOSED 4 10.10.10.1:80 REASON=DONE\r\n',
+      '650 STREAM 2 NEW 0 www.torproject.org:443\r\n',
+    ):
+      self.controller._handle_event(ControlMessage.from_str(event))
+
+    self.assertEqual(['7', '9'], [circ.id for circ in self.controller.get_circuits()])
+    self.assertEqual(CircStatus.BUILT, self.controller.get_circuit(7).status)
+    self.assertEqual('HS_CLIENT_REND', self.controller.get_circuit(7).purpose)
+    self.assertRaises(ValueError, self.controller.get_circuit, 4)
+    self.assertEqual(None, self.controller.get_circuit(4, None))
+    self.assertEqual(['2'], [stream.id for stream in self.controller.get_streams()])
+    self.assertEqual(2, get_info_mock.call_count)
+
+    with patch('stem.control.BaseController.msg', Mock(side_effect = coro_func_returning_value(ControlMessage.from_str('250 OK\r\n')))):
+      self.controller.set_circuit_tracking(False)
+
+    self.assertFalse(self.controller.is_circuit_tracking_enabled())
+    self.assertFalse(EventType.CIRC_MINOR in self.controller._event_listeners)
+
   @patch('stem.control.Controller.is_authenticated', Mock(return_value = True))
   @patch('stem.control.Controller._attach_listeners', Mock(side_effect = coro_func_returning_value(([], []))))
   @patch('stem.control.Controller.get_version')
@@ -622,7 +986,413 @@ class TestControl(unittest.TestCase):
     self._emit_event(BW_EVENT)
     self.bw_listener.assert_called_once_with(BW_EVENT)
 
+  @patch('stem.util.log.warn', Mock())
+  def test_lazy_event_parsing(self):
+    """
+    Provide events that parse their attributes when they're accessed.
+    """
+
+    self.assertFalse(self.controller.is_lazy_event_parsing_enabled())
+    self.controller.set_lazy_event_parsing(True)
+    self.assertTrue(self.controller.is_lazy_event_parsing_enabled())
+
+    self._emit_event(CIRC_EVENT)
+    event = self.circ_listener.call_args[0][0]
+    self.assertFalse('status' in event.__dict__)
+    self.assertEqual(CircStatus.LAUNCHED, event.status)
+
+    # malformed events go to the listeners of their type
+
+    self._emit_event(BAD_EVENT)
+    self.malformed_listener.assert_not_called()
+    self.assertRaises(ProtocolError, getattr, self.bw_listener.call_args[0][0], 'read')
+
+  def test_bandwidth_aggregator(self):
+    """
+    Summarize bandwidth events, including after our ring buffers wrap.
+    """
+
+    aggregator = BandwidthAggregator(size = 6)
+
+    def event(content, arrived_at):
+      return ControlMessage.from_str('650 %s\r\n' % content, 'EVENT', arrived_at = arrived_at)
+
+    self.assertEqual((0, 0), aggregator.total(EventType.BW))
+    self.assertEqual([], aggregator.top(EventType.CIRC_BW))
+
+    for i in range(1, 9):
+      aggregator(event('BW %i %i' % (i, i * 10), 100 + i))
+
+    # only our six newest samples are retained
+
+    self.assertEqual((3 + 4 + 5 + 6 + 7 + 8, 330), aggregator.total(EventType.BW))
+    self.assertEqual((7 + 8, 150), aggregator.total(EventType.BW, window = 2))
+    self.assertEqual((7.5, 75.0), aggregator.rate(EventType.BW, 2))
+
+    # rates are averaged over the part of our window that we have samples for
+
+    recent_aggregator = BandwidthAggregator()
+
+    for i in range(1, 6):
+      recent_aggregator(event('BW 120 60', 100 + i))
+
+    self.assertEqual((120.0, 60.0), recent_aggregator.rate(EventType.BW, 60))
+    self.assertEqual((120.0, 60.0), recent_aggregator.rate(EventType.BW, 2))
+    self.assertEqual((0.0, 0.0), recent_aggregator.rate(EventType.CIRC_BW, 60))
+
+    for circ_id, read, written, arrived_at in (('5', 10, 1, 100), ('7', 200, 2, 101), ('5', 30, 3, 102), ('ab', 1, 1, 102), ('9', 5, 5, 103)):
+      aggregator(event('CIRC_BW ID=%s READ=%i WRITTEN=%i' % (circ_id, read, written), arrived_at))
+
+    self.assertEqual([('7', 200, 2), ('5', 40, 4)], aggregator.top(EventType.CIRC_BW, 2))
+    self.assertEqual([('5', 30, 3), ('9', 5, 5), ('ab', 1, 1)], aggregator.top(EventType.CIRC_BW, window = 2))
+    self.assertEqual((40, 4), aggregator.total(EventType.CIRC_BW, entry_id = '5'))
+    self.assertEqual((1, 1), aggregator.total(EventType.CIRC_BW, entry_id = 'ab'))
+    self.assertEqual((0, 0), aggregator.total(EventType.CIRC_BW, entry_id = '12'))
+    self.assertEqual((30, 3), aggregator.total(EventType.CIRC_BW, window = 2, entry_id = '5'))
+
+    self.assertRaises(ValueError, BandwidthAggregator, 0)
+
   @patch('stem.control.Controller.get_version', Mock(side_effect = coro_func_returning_value(stem.version.Version('0.5.0.14'))))
+  def test_event_loop_shutdown(self):
+    """
+    Events that are enqueued when we close should still be delivered, after
+    which our event loop ends.
+    """
+
+    with patch('stem.control.Controller.is_alive') as is_alive_mock:
+      is_alive_mock.return_value = True
+      loop = self.controller._loop
+      event_loop = asyncio.run_coroutine_threadsafe(Controller._event_loop(self.controller), loop)
+
+      asyncio.run_coroutine_threadsafe(Controller._enqueue_event(self.controller, ControlMessage.from_str(BW_EVENT.raw_content())), loop).result()
+      is_alive_mock.return_value = False
+      self.controller._close()
+
+      event_loop.result(timeout = 1)
+
+    self.bw_listener.assert_called_once()
+
+  @patch('stem.control.Controller.is_alive', Mock(return_value = True))
+  def test_event_queue_limit(self):
+    """
+    Bound our event queue, checking each of our overflow actions.
+    """
+
+    bw_events = [ControlMessage.from_str('650 BW %i 25\r\n' % i) for i in range(1, 7)]
+
+    def queued_events():
+      return [int(str(msg).split()[1]) for msg, _ in self.controller._event_queue._queue]
+
+    async def run():
+      self.controller.set_event_queue_limit(2, EventQueueOverflow.DROP_NEWEST)
+
+      for event in bw_events[:3]:
+        await Controller._enqueue_event(self.controller, event)
+
+      self.assertEqual([1, 2], queued_events())
+      self.assertEqual((2, 3, 1, 0), self.controller.get_event_queue_stats()[:4])
+
+      self.controller.set_event_queue_limit(2, EventQueueOverflow.DROP_OLDEST)
+      await Controller._enqueue_event(self.controller, bw_events[3])
+
+      self.assertEqual([2, 4], queued_events())
+      self.assertEqual((2, 4, 2, 0), self.controller.get_event_queue_stats()[:4])
+
+      # when paused we don't read further until there's room
+
+      self.controller.set_event_queue_limit(2)
+      enqueue_task = asyncio.ensure_future(Controller._enqueue_event(self.controller, bw_events[4]))
+      await asyncio.sleep(0.05)
+
+      self.assertFalse(enqueue_task.done())
+      self.assertEqual((2, 5, 2, 1), self.controller.get_event_queue_stats()[:4])
+
+      self.controller.set_event_queue_limit(3)
+      await asyncio.wait_for(enqueue_task, 1)
+      self.assertEqual([2, 4, 5], queued_events())
+
+      # but continue reading if a reply is expected
+
+      async with self.controller._msg_lock:
+        await asyncio.wait_for(Controller._enqueue_event(self.controller, bw_events[5]), 1)
+
+      stats = self.controller.get_event_queue_stats()
+      self.assertEqual((4, 6, 2, 2), stats[:4])
+      self.assertTrue(stats.lag >= 0.05)
+
+      # as our listeners catch up we report the events they haven't finished
+
+      release = asyncio.Event()
+
+      async def slow_listener(event):
+        await release.wait()
+
+      self.controller._event_listeners[EventType.BW].append(slow_listener)
+
+      with patch('stem.control.Controller.is_alive', Mock(return_value = True)) as is_alive_mock:
+        event_loop_task = asyncio.ensure_future(Controller._event_loop(self.controller))
+        await asyncio.sleep(0.01)
+
+        stats = self.controller.get_event_queue_stats()
+        self.assertEqual(3, stats.queued)
+        self.assertTrue(stats.lag >= 0.05)
+
+        release.set()
+        await self.controller._event_queue.join()
+
+        stats = self.controller.get_event_queue_stats()
+        self.assertEqual((0, 0.0), (stats.queued, stats.lag))
+        self.assertTrue(stats.max_lag >= 0.05)
+
+        is_alive_mock.return_value = False
+        self.controller._event_queue.put_nowait(None)
+        await event_loop_task
+
+    asyncio.run_coroutine_threadsafe(asyncio.wait_for(run(), 5), self.controller._loop).result()
+    self.assertRaises(ValueError, self.controller.set_event_queue_limit, 0)
+
+  def test_event_recording(self):
+    """
+    Record events as they're read from our socket, then replay them to our
+    listeners.
+    """
+
+    events = [
+      (1000.25, '650 BW 15 25\r\n'),
+      (1000.5, '650 CIRC 4 LAUNCHED\r\n'),
+      (1000.75, '650 BW 10 20\r\n'),
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+      path = os.path.join(tmp_dir, 'events')
+
+      with EventRecorder(path) as recorder:
+        self.controller.set_event_recorder(recorder)
+        self.assertEqual(recorder, self.controller.get_event_recorder())
+
+        for arrived_at, content in events[:2]:
+          recorder.record(ControlMessage.from_str(content), arrived_at)
+
+        # events read from our socket are recorded
+
+        with patch('stem.control.Controller.is_alive', Mock(side_effect = [True, False])):
+          with patch('stem.socket.ControlSocket.recv', Mock(side_effect = coro_func_returning_value(ControlMessage.from_str(events[2][1])))):
+            asyncio.run_coroutine_threadsafe(Controller._reader_loop(self.controller), self.controller._loop).result(1)
+
+        self.assertEqual(3, recorder.count)
+        self.controller.set_event_recorder(None)
+
+      recorded = list(read_recorded_events(path))
+      self.assertEqual([arrived_at for arrived_at, _ in events[:2]], [arrived_at for arrived_at, _ in recorded[:2]])
+      self.assertEqual([content for _, content in events], [msg.raw_content() for _, msg in recorded])
+
+      # partially written events are ignored
+
+      with open(path, 'ab') as recording:
+        recording.write(b'\x00\x00')
+
+      self.assertEqual(3, self.controller.replay_events(path, speed = None))
+      self.assertEqual([15, 10], [call[0][0].read for call in self.bw_listener.call_args_list])
+      self.assertEqual(1, self.circ_listener.call_count)
+
+      # replaying at twice the pace takes half as long
+
+      paced_path = os.path.join(tmp_dir, 'paced_events')
+
+      with EventRecorder(paced_path) as recorder:
+        for arrived_at, content in events:
+          recorder.record(ControlMessage.from_str(content), arrived_at)
+
+      start = time.time()
+      self.assertEqual(3, self.controller.replay_events(paced_path, speed = 2))
+      self.assertTrue(0.24 <= time.time() - start < 1)
+
+      self.assertRaises(ValueError, self.controller.replay_events, path, speed = 0)
+      self.assertRaises(ValueError, self.controller.replay_events, __file__)
+
+      # appending to a recording discards its partially written event
+
+      with EventRecorder(path) as recorder:
+        recorder.record(ControlMessage.from_str('650 BW 5 5\r\n'), 1001.0)
+
+      with open(path, 'ab') as recording:
+        recording.write(EVENT_RECORD.pack(1002.0, 500) + b'650 BW')
+
+      with EventRecorder(path) as recorder:
+        recorder.record(ControlMessage.from_str('650 BW 7 7\r\n'), 1003.0)
+
+      recorded = list(read_recorded_events(path))
+      self.assertEqual([1000.25, 1000.5, 1001.0, 1003.0], [arrived_at for arrived_at, _ in recorded[:2] + recorded[-2:]])
+      self.assertEqual([content for _, content in events] + ['650 BW 5 5\r\n', '650 BW 7 7\r\n'], [msg.raw_content() for _, msg in recorded])
+
+      # but we won't append to other files
+
+      other_path = os.path.join(tmp_dir, 'other')
+
+      with open(other_path, 'w') as other_file:
+        other_file.write('hello world')
+
+      self.assertRaises(ValueError, EventRecorder, other_path)
+
+      with open(other_path) as other_file:
+        self.assertEqual('hello world', other_file.read())
+
+  @patch('stem.control.Controller.msg', Mock(side_effect = coro_func_returning_value(ControlMessage.from_str('250 OK\r\n'))))
+  def test_event_dispatch(self):
+    """
+    Notify the listeners of each event type, including when listeners are
+    removed during our dispatch.
+    """
+
+    def event(content):
+      return ControlMessage.from_str('650 %s\r\n' % content)
+
+    async def run():
+      # each listener receives only the event types it's subscribed to
+
+      for content in ('CIRC 7 LAUNCHED', 'BW 15 25', 'BW &15* 25', 'STREAM_BW 2 11 22'):
+        await Controller._handle_event(self.controller, event(content))
+
+      self.assertEqual(['7'], [call[0][0].id for call in self.circ_listener.call_args_list])
+      self.assertEqual([15], [call[0][0].read for call in self.bw_listener.call_args_list])
+      self.assertEqual(1, self.malformed_listener.call_count)
+
+      # event types without a listener are dropped without waiting on our lock
+
+      async with self.controller._event_listeners_lock:
+        await asyncio.wait_for(Controller._handle_event(self.controller, event('STREAM_BW 2 11 22')), 1)
+
+      # listeners removed while we dispatch are notified of the event in flight,
+      # but not afterward
+
+      removals = []
+      later_listener = Mock()
+
+      async def removing_listener(event):
+        removals.append(asyncio.ensure_future(self.controller.remove_event_listener(self.bw_listener)))
+        removals.append(asyncio.ensure_future(self.controller.remove_event_listener(removing_listener)))
+        await asyncio.sleep(0.01)
+
+      await self.controller.add_event_listener(removing_listener, EventType.BW)
+      await self.controller.add_event_listener(later_listener, EventType.BW)
+
+      await Controller._handle_event(self.controller, event('BW 20 30'))
+      await asyncio.gather(*removals)
+      await Controller._handle_event(self.controller, event('BW 40 50'))
+
+      self.assertEqual([15, 20], [call[0][0].read for call in self.bw_listener.call_args_list])
+      self.assertEqual([20, 40], [call[0][0].read for call in later_listener.call_args_list])
+      self.assertEqual([later_listener], self.controller._event_listeners[EventType.BW])
+
+    with patch('stem.control.Controller.get_version', Mock(side_effect = coro_func_returning_value(stem.version.Version('0.4.5.1')))):
+      asyncio.run_coroutine_threadsafe(asyncio.wait_for(run(), 5), self.controller._loop).result()
+
+  def test_event_listener_queue(self):
+    """
+    Notify listeners from their own queues, checking that a slow listener
+    doesn't delay others and that our overflow policies apply.
+    """
+
+    threaded_listener = Mock()
+    bw_events = [ControlMessage.from_str('650 BW %i 25\r\n' % i) for i in range(1, 5)]
+
+    async def run():
+      release = asyncio.Event()
+      received = []
+
+      async def slow_listener(event):
+        await release.wait()
+        received.append(event.read)
+
+      await self.controller.add_event_listener(slow_listener, EventType.BW, queue_size = 2, overflow = ListenerOverflow.DROP_OLDEST)
+      await self.controller.add_event_listener(threaded_listener, EventType.BW, queue_size = 1)
+
+      for event in bw_events:
+        await Controller._handle_event(self.controller, event)
+        await asyncio.sleep(0)
+
+      # our slow listener is blocked on the first event, but others are still notified
+
+      self.assertEqual(4, self.bw_listener.call_count)
+      self.assertEqual((2, 0, 1), self.controller.get_listener_stats(slow_listener)[:3])
+
+      release.set()
+
+      while self.controller.get_listener_stats(slow_listener).queued or threaded_listener.call_count < 4:
+        await asyncio.sleep(0.01)
+
+      self.assertEqual([1, 3, 4], received)
+      self.assertEqual((0, 3, 1), self.controller.get_listener_stats(slow_listener)[:3])
+      self.assertEqual((0, 4, 0), self.controller.get_listener_stats(threaded_listener)[:3])
+
+      await self.controller.remove_event_listener(slow_listener)
+      self.assertRaises(ValueError, self.controller.get_listener_stats, slow_listener)
+
+    asyncio.run_coroutine_threadsafe(asyncio.wait_for(run(), 5), self.controller._loop).result()
+    self.assertRaises(ValueError, self.controller.add_event_listener, Mock(), EventType.BW, queue_size = 0)
+
+  def test_listener_queue_coalescing(self):
+    """
+    When full, coalescing listener queues replace the oldest event of the same
+    type.
+    """
+
+    listener_queue = _ListenerQueue(Mock(), 2, ListenerOverflow.COALESCE)
+    circ_events = [ControlMessage.from_str('650 CIRC %i LAUNCHED\r\n' % i, 'EVENT') for i in range(3)]
+    bw_event = ControlMessage.from_str('650 BW 15 25\r\n', 'EVENT')
+
+    async def run():
+      # queuing doesn't yield, so our listener's task can't drain us
+
+      for event in (circ_events[0], bw_event, circ_events[1], circ_events[2]):
+        await listener_queue.put(event)
+
+      return [event for event, _ in listener_queue._events]
+
+    self.assertEqual([bw_event, circ_events[2]], asyncio.run(run()))
+    self.assertEqual(2, listener_queue.dropped)
+
+  def test_listener_queue_coalescing_bandwidth(self):
+    """
+    Coalescing listener queues sum the bandwidth events of each circuit.
+    """
+
+    listener_queue = _ListenerQueue(Mock(), 2, ListenerOverflow.COALESCE)
+    circ_bw_events = [ControlMessage.from_str('650 CIRC_BW ID=%s READ=%i WRITTEN=%i\r\n' % args, 'EVENT') for args in (('5', 10, 1), ('7', 20, 2), ('5', 30, 3), ('5', 50, 5))]
+
+    async def run():
+      for event in circ_bw_events:
+        await listener_queue.put(event)
+
+      return [event for event, _ in listener_queue._events]
+
+    queued = asyncio.run(run())
+
+    self.assertEqual([('5', 90, 9), ('7', 20, 2)], [(event.id, event.read, event.written) for event in queued])
+    self.assertEqual((0, 2), (listener_queue.dropped, listener_queue.coalesced))
+
+    # summed events have content that matches their attributes
+
+    self.assertEqual('CIRC_BW ID=5 READ=90 WRITTEN=9', str(queued[0]))
+    self.assertEqual('650 CIRC_BW ID=5 READ=90 WRITTEN=9\r\n', queued[0].raw_content())
+    self.assertEqual({'ID': '5', 'READ': '90', 'WRITTEN': '9'}, queued[0].keyword_args)
+    self.assertEqual(circ_bw_events[0].arrived_at, queued[0].arrived_at)
+
+    # as do those with positional arguments, or lacking some of our keywords
+
+    bw_events = [ControlMessage.from_str(content, 'EVENT') for content in ('650 BW 15 25\r\n', '650 BW 10 5\r\n')]
+    self.assertEqual('BW 25 30', str(_sum_bandwidth(*bw_events)))
+
+    stream_bw_events = [ControlMessage.from_str('650 STREAM_BW 2 %i %i %s\r\n' % args, 'EVENT') for args in ((10, 20, '2012-12-06T13:51:44.000000'), (1, 2, '2012-12-06T13:51:45.000000'))]
+    self.assertEqual('STREAM_BW 2 11 22 2012-12-06T13:51:45.000000', str(_sum_bandwidth(*stream_bw_events)))
+
+    circ_bw_events = [ControlMessage.from_str(content, 'EVENT') for content in ('650 CIRC_BW ID=5 READ=10 WRITTEN=1 DELIVERED_READ=8\r\n', '650 CIRC_BW ID=5 READ=30 WRITTEN=3\r\n')]
+    self.assertEqual('CIRC_BW ID=5 READ=40 WRITTEN=4 DELIVERED_READ=8', str(_sum_bandwidth(*circ_bw_events)))
+
+    # other listeners' events are unchanged
+
+    self.assertEqual((10, 1), (circ_bw_events[0].read, circ_bw_events[0].written))
+
   @patch('stem.control.Controller.msg', Mock(side_effect = coro_func_returning_value(ControlMessage.from_str('250 OK\r\n'))))
   @patch('stem.control.Controller.add_event_listener', Mock(side_effect = coro_func_returning_value(None)))
   @patch('stem.control.Controller.remove_event_listener', Mock(side_effect = coro_func_returning_value(None)))
@@ -673,6 +1443,176 @@ class TestControl(unittest.TestCase):
     with patch('stem.control.Controller.msg', msg_mock):
       self.assertRaises(UnsatisfiableRequest, self.controller.attach_stream, 'stream_id', 'circ_id')
 
+  def test_msg_immediate(self):
+    """
+    Immediate requests are sent while a msg() call awaits its reply, and both
+    receive their own response.
+    """
+
+    loop = self.controller._loop
+    sent = []
+
+    async def send_mock(message):
+      sent.append(message)
+
+    with patch('stem.socket.ControlSocket.send', Mock(side_effect = send_mock)):
+      request = asyncio.run_coroutine_threadsafe(Controller.msg(self.controller, 'GETINFO version'), loop)
+
+      while len(sent) < 1:
+        time.sleep(0.001)
+
+      attach_request = asyncio.run_coroutine_threadsafe(Controller._msg_pipelined(self.controller, 'ATTACHSTREAM 5 12', immediate = True), loop)
+
+      while len(sent) < 2:
+        time.sleep(0.001)
+
+      self.assertEqual(['GETINFO version', 'ATTACHSTREAM 5 12'], sent)
+
+      for reply in ('250-version=0.4.5.1\r\n250 OK\r\n', '552 Unknown stream "5"\r\n'):
+        loop.call_soon_threadsafe(self.controller._deliver_reply, ControlMessage.from_str(reply))
+
+      self.assertEqual('version=0.4.5.1\nOK', str(request.result(1)))
+      self.assertEqual('Unknown stream "5"', str(attach_request.result(1)))
+
+  def test_metrics(self):
+    """
+    Measure our requests by their command and events by their type.
+    """
+
+    loop = self.controller._loop
+    sent, measured = [], []
+
+    async def send_mock(message):
+      sent.append(message)
+
+    self.assertFalse(self.controller.is_metrics_enabled())
+    self.assertEqual(None, self.controller.get_metrics())
+
+    self.controller.set_metrics(True)
+    self.controller.add_metrics_listener(measured.append)
+
+    with patch('stem.socket.ControlSocket.send', Mock(side_effect = send_mock)):
+      requests = [asyncio.run_coroutine_threadsafe(Controller._msg_pipelined(self.controller, message), loop) for message in ('GETINFO version', 'GETINFO blarg')]
+
+      while len(sent) < 2:
+        time.sleep(0.001)
+
+      for reply in ('250-version=0.4.5.1\r\n250 OK\r\n', '552 Unrecognized key "blarg"\r\n'):
+        loop.call_soon_threadsafe(self.controller._deliver_reply, ControlMessage.from_str(reply))
+
+      for request in requests:
+        request.result(1)
+
+    self.controller._metrics.add_event(ControlMessage.from_str('650 BW 15 25\r\n'))
+
+    self.assertEqual(['GETINFO', 'GETINFO'], [entry.command for entry in measured])
+    self.assertEqual([False, True], [entry.is_error for entry in measured])
+    self.assertEqual([len('GETINFO version\r\n'), len('GETINFO blarg\r\n')], [entry.bytes_sent for entry in measured])
+    self.assertEqual([len('250-version=0.4.5.1\r\n250 OK\r\n'), len('552 Unrecognized key "blarg"\r\n')], [entry.bytes_received for entry in measured])
+
+    metrics = self.controller.get_metrics()
+    getinfo = metrics['commands']['GETINFO']
+
+    self.assertEqual(2, getinfo['count'])
+    self.assertEqual(1, getinfo['errors'])
+    self.assertEqual(len('552 Unrecognized key "blarg"\r\n'), getinfo['max_reply_size'])
+    self.assertEqual(2, getinfo['round_trip']['count'])
+    self.assertEqual(2, sum([count for _, count in getinfo['queue_wait']['buckets']]))
+    self.assertEqual(len(LATENCY_BUCKETS) + 1, len(getinfo['round_trip']['buckets']))
+    self.assertEqual({'count': 1, 'bytes': len('650 BW 15 25\r\n')}, {key: metrics['events']['BW'][key] for key in ('count', 'bytes')})
+    self.assertEqual(getinfo['bytes_received'] + len('650 BW 15 25\r\n'), metrics['bytes_received'])
+
+    self.assertTrue(self.controller.remove_metrics_listener(measured.append))
+    self.assertFalse(self.controller.remove_metrics_listener(measured.append))
+
+    self.controller.set_metrics(False)
+    self.assertEqual(None, self.controller.get_metrics())
+
+  def test_stream_attacher_routes(self):
+    """
+    Pick circuits for streams by their target address and port.
+    """
+
+    def stream(target):
+      return stem.response._convert_to_event(ControlMessage.from_str('650 STREAM 5 NEW 0 %s\r\n' % target))
+
+    chooser = Mock(return_value = '30')
+    attacher = StreamAttacher(chooser)
+
+    self.assertEqual('30', attacher.choose(stream('www.torproject.org:443')))
+    self.assertEqual([0.0, 0.0, 0.0], attacher.latency())
+
+    attacher.add_route('10', port = 443)
+    attacher.add_route('11', address = 'www.torproject.org')
+    attacher.add_route('12', address = 'www.torproject.org', port = 443)
+    attacher.add_route('13')
+
+    self.assertEqual('12', attacher.choose(stream('www.torproject.org:443')))
+    self.assertEqual('11', attacher.choose(stream('WWW.torproject.org:80')))
+    self.assertEqual('10', attacher.choose(stream('example.com:443')))
+    self.assertEqual('13', attacher.choose(stream('example.com:80')))
+
+    attacher.remove_route('www.torproject.org', 443)
+    attacher.remove_circuit('10')
+    self.assertEqual('11', attacher.choose(stream('www.torproject.org:443')))
+    self.assertEqual('13', attacher.choose(stream('example.com:443')))
+
+    attacher.remove_route()
+    self.assertEqual('30', attacher.choose(stream('example.com:443')))
+    self.assertEqual(1 + 1, chooser.call_count)
+
+    attacher._latencies.extend([0.4, 0.1, 0.3, 0.2])
+    self.assertEqual([0.3, 0.4], attacher.latency(50, 99))
+
+  @patch('stem.control.Controller.msg', Mock(side_effect = coro_func_returning_value(ControlMessage.from_str('250 OK\r\n'))))
+  def test_set_stream_attacher(self):
+    """
+    Attach new streams to the circuits our attacher picks, falling back to
+    letting tor pick if that fails.
+    """
+
+    loop = self.controller._loop
+    sent = []
+
+    async def send_mock(message):
+      sent.append(message)
+      reply = '552 Unknown circuit "14"\r\n' if message == 'ATTACHSTREAM 6 14' else '250 OK\r\n'
+      loop.call_soon(self.controller._deliver_reply, ControlMessage.from_str(reply))
+
+    attacher = StreamAttacher()
+    attacher.add_route('12', port = 443)
+    attacher.add_route('14', port = 80)
+
+    self.controller.set_stream_attacher(attacher)
+    self.assertEqual(attacher, self.controller.get_stream_attacher())
+    self.assertTrue(EventType.STREAM in self.controller._event_listeners)
+
+    with patch('stem.socket.ControlSocket.send', Mock(side_effect = send_mock)):
+      self.controller._handle_event(ControlMessage.from_str('650 STREAM 5 NEW 0 www.torproject.org:443\r\n'))
+      self.controller._handle_event(ControlMessage.from_str('650 STREAM 5 SENTCONNECT 12 www.torproject.org:443\r\n'))
+      self.controller._handle_event(ControlMessage.from_str('650 STREAM 6 NEW 0 www.torproject.org:80\r\n'))
+
+      # the circuit closes, so later streams are attached by tor
+
+      self.controller._handle_event(ControlMessage.from_str('650 CIRC 12 CLOSED\r\n'))
+      self.controller._handle_event(ControlMessage.from_str('650 STREAM 7 NEW 0 www.torproject.org:443\r\n'))
+
+      start = time.time()
+
+      while attacher.attached < 3 and time.time() - start < 1:
+        time.sleep(0.001)
+
+    self.assertEqual(['ATTACHSTREAM 5 12', 'ATTACHSTREAM 6 0', 'ATTACHSTREAM 6 14', 'ATTACHSTREAM 7 0'], sorted(sent))
+    self.assertEqual((3, 1), (attacher.attached, attacher.failed))
+    self.assertTrue(attacher.latency(50)[0] > 0)
+
+    with patch('stem.control.Controller.reset_conf', Mock(side_effect = coro_func_returning_value(None))) as reset_conf_mock:
+      self.controller.set_stream_attacher(None)
+      reset_conf_mock.assert_called_once_with(self.controller, '__LeaveStreamsUnattached')
+
+    self.assertEqual(None, self.controller.get_stream_attacher())
+    self.assertFalse(EventType.STREAM in self.controller._event_listeners)
+
   def test_parse_circ_path(self):
     """
     Exercises the _parse_circ_path() helper function.
@@ -761,8 +1701,29 @@ class TestControl(unittest.TestCase):
 
           uncast_event = ControlMessage.from_str(event.raw_content())
           event_queue = self.controller._event_queue
-          asyncio.run_coroutine_threadsafe(event_queue.put(uncast_event), loop).result()
+          asyncio.run_coroutine_threadsafe(Controller._enqueue_event(self.controller, uncast_event), loop).result()
           asyncio.run_coroutine_threadsafe(event_queue.join(), loop).result()  # block until the event is consumed
         finally:
           is_alive_mock.return_value = False
           self.controller._close()
+
+
+def _streamed_reply(param, chunks, reply = None):
+  """
+  Provides a _msg_streamed() side effect that streams the given chunks of a
+  GETINFO reply.
+  """
+
+  async def side_effect(controller, message):
+    reply_stream = _ReplyStream(controller._loop)
+
+    async def read_socket():
+      for chunk in chunks:
+        await reply_stream.put(chunk)
+
+      reply_stream.reply.set_result(ControlMessage.from_str(reply if reply else '250+%s=\r\n.\r\n250 OK\r\n' % param))
+
+    controller._loop.create_task(read_socket())
+    return reply_stream
+
+  return side_effect
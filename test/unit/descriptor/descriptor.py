@@ -2,10 +2,18 @@
 Unit tests for the base stem.descriptor module.
 """
 
+import os
+import tarfile
+import tempfile
 import unittest
 
-from stem.descriptor import Descriptor
+import stem.descriptor
+
+from unittest.mock import patch
+
+from stem.descriptor import Descriptor, _MappedFile, _descriptor_chunks, _descriptor_components, _find_line, _find_lines, _split_descriptors
 from stem.descriptor.server_descriptor import RelayDescriptor
+from test.unit.descriptor import get_resource
 
 
 class TestDescriptor(unittest.TestCase):
@@ -49,3 +57,144 @@ class TestDescriptor(unittest.TestCase):
     self.assertEqual(0, len(RelayDescriptor.from_str('', multiple = True)))
 
     self.assertRaisesWith(ValueError, "Descriptor.from_str() expected a single descriptor, but had 2 instead. Please include 'multiple = True' if you want a list of results instead.", RelayDescriptor.from_str, desc_text)
+
+  def test_descriptor_components(self):
+    """
+    Break content into its keyword lines and the blocks that follow them.
+    """
+
+    content = b'router relay1\n\nopt platform Tor\nsigning-key\n-----BEGIN RSA PUBLIC KEY-----\nabc\n-----END RSA PUBLIC KEY-----\ncontact caf\xc3\xa9\n'
+
+    self.assertEqual([
+      ('router', [('relay1', None, None)]),
+      ('platform', [('Tor', None, None)]),
+      ('signing-key', [('', 'RSA PUBLIC KEY', '-----BEGIN RSA PUBLIC KEY-----\nabc\n-----END RSA PUBLIC KEY-----')]),
+      ('contact', [('caf\xe9', None, None)]),
+    ], list(_descriptor_components(content, False).items()))
+
+    self.assertEqual(['router', 'platform', 'signing-key', 'contact'], list(_descriptor_components(content, True, non_ascii_fields = ('contact',)).keys()))
+    self.assertRaisesWith(ValueError, "'contact' line had non-ascii content: caf?", _descriptor_components, content, True)
+
+    # an unterminated block consumes the rest of the content
+
+    content = b'router relay1\nsigning-key\n-----BEGIN RSA PUBLIC KEY-----\nabc\ncontact foo\n'
+
+    self.assertEqual(['router'], list(_descriptor_components(content, False).keys()))
+    self.assertRaisesWith(ValueError, "Unterminated pgp style block (looking for '-----END RSA PUBLIC KEY-----'):\n-----BEGIN RSA PUBLIC KEY-----\nabc\ncontact foo\n", _descriptor_components, content, True)
+
+  def test_find_line(self):
+    """
+    Locate lines by their keyword or prefix.
+    """
+
+    content = b'router-digest abc\nrouter foo\n@downloaded-at 2012\nrouter\n'
+
+    self.assertEqual(18, _find_line(content, b'router'))
+    self.assertEqual(49, _find_line(content, b'router', 19))
+    self.assertEqual(0, _find_line(content, b'router', is_keyword = False))
+    self.assertEqual(29, _find_line(content, b'@', is_keyword = False))
+    self.assertEqual(-1, _find_line(content, b'router', 19, 40))
+    self.assertEqual(-1, _find_line(content, b'signature'))
+
+    self.assertEqual([(18, b'router'), (29, b'@'), (49, b'router')], list(_find_lines(content, (b'router', b'@'), 1, is_keyword = False)))
+
+  def test_split_descriptors(self):
+    """
+    Split content at the line that ends each descriptor.
+    """
+
+    signature = b'router-signature\n-----BEGIN SIGNATURE-----\nabc\n-----END SIGNATURE-----\n'
+    content = b'@downloaded-at 2012\nrouter relay1\n' + signature + b'@source foo\nrouter relay2\n' + signature
+
+    self.assertEqual([b'router relay1\n' + signature, b'router relay2\n' + signature], [bytes(desc) for desc in _split_descriptors(content, b'router-signature', with_signature = True, skip_annotations = True)])
+    self.assertEqual([b'router relay1\nrouter-digest abc'], [bytes(desc) for desc in _split_descriptors(b'router relay1\nrouter-digest abc', b'router-digest')])
+    self.assertEqual([], list(_split_descriptors(b'@downloaded-at 2012\n', b'router-digest', skip_annotations = True)))
+
+  def test_descriptor_chunks(self):
+    """
+    Split content into chunks that begin with a descriptor's annotations.
+    """
+
+    content = b'@downloaded-at 2012\nrouter relay1\n@source foo\n@source bar\nrouter relay2\nrouter relay3\n'
+
+    def chunks(chunk_size):
+      return [content[start:end] for start, end in _descriptor_chunks(content, b'router', 0, len(content), chunk_size)]
+
+    self.assertEqual([b'@downloaded-at 2012\nrouter relay1\n', b'@source foo\n@source bar\nrouter relay2\n', b'router relay3\n'], chunks(1))
+    self.assertEqual([b'@downloaded-at 2012\nrouter relay1\n', b'@source foo\n@source bar\nrouter relay2\nrouter relay3\n'], chunks(40))
+    self.assertEqual([content], chunks(1000))
+
+  def test_parse_file_in_parallel(self):
+    """
+    Parse files and archives with a pool of workers.
+    """
+
+    for filename in ('cached-microdescs', 'metrics_server_desc_multiple', 'extrainfo_bridge_descriptor_multiple', 'cached-consensus', 'descriptor_archive.tar'):
+      expected = list(stem.descriptor.parse_file(get_resource(filename)))
+
+      with patch('stem.descriptor.PARALLEL_CHUNK_SIZE', 1):
+        self.assertEqual(expected, list(stem.descriptor.parse_file(get_resource(filename), workers = 2)))
+        self.assertEqual(sorted(map(str, expected)), sorted(map(str, stem.descriptor.parse_file(get_resource(filename), workers = 2, ordered = False))))
+
+  def test_parse_file_with_fields(self):
+    """
+    Parse only some attributes of our descriptors.
+    """
+
+    expected = list(stem.descriptor.parse_file(get_resource('metrics_server_desc_multiple')))
+    descriptors = list(stem.descriptor.parse_file(get_resource('metrics_server_desc_multiple'), fields = ('fingerprint', 'observed_bandwidth', 'exit_policy')))
+
+    self.assertEqual(expected, descriptors)
+
+    for expected_desc, desc in zip(expected, descriptors):
+      self.assertEqual(expected_desc.fingerprint, desc.fingerprint)
+      self.assertEqual(expected_desc.observed_bandwidth, desc.observed_bandwidth)
+      self.assertEqual(expected_desc.average_bandwidth, desc.average_bandwidth)  # parsed from the same line
+      self.assertEqual(expected_desc.exit_policy, desc.exit_policy)
+      self.assertRaises(AttributeError, getattr, desc, 'platform')
+
+    microdescriptors = list(stem.descriptor.parse_file(get_resource('cached-microdescs'), fields = ('exit_policy',)))
+    self.assertEqual([str(desc.exit_policy) for desc in stem.descriptor.parse_file(get_resource('cached-microdescs'))], [str(desc.exit_policy) for desc in microdescriptors])
+
+    # other descriptor types are unaffected
+
+    self.assertEqual(3, len(list(stem.descriptor.parse_file(get_resource('cached-consensus'), fields = ('exit_policy',)))))
+    self.assertRaises(ValueError, list, stem.descriptor.parse_file(get_resource('cached-microdescs'), fields = ('nickname',)))
+
+    # archives with a mix of descriptor types, parsed by our workers
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+      archive_path = os.path.join(tmpdir, 'mixed.tar')
+
+      with tarfile.open(archive_path, 'w') as archive:
+        for filename in ('metrics_consensus', 'metrics_server_desc_multiple'):
+          archive.add(get_resource(filename), arcname = filename)
+
+      expected = list(stem.descriptor.parse_file(archive_path, fields = ('fingerprint', 'observed_bandwidth')))
+      self.assertEqual(9, len(expected))
+
+      with patch('stem.descriptor.PARALLEL_CHUNK_SIZE', 1):
+        self.assertEqual(expected, list(stem.descriptor.parse_file(archive_path, fields = ('fingerprint', 'observed_bandwidth'), workers = 2)))
+
+      self.assertEqual([desc.observed_bandwidth for desc in expected[-2:]], [desc.observed_bandwidth for desc in stem.descriptor.parse_file(get_resource('metrics_server_desc_multiple'), fields = ('fingerprint', 'observed_bandwidth'), workers = 2)])
+
+  def test_parse_file_memory_mapped(self):
+    """
+    Parse the files we're given the path of from a memory mapping.
+    """
+
+    for filename in ('cached-microdescs', 'cached-consensus', 'metrics_server_desc_multiple', 'extrainfo_bridge_descriptor_multiple'):
+      with open(get_resource(filename), 'rb') as desc_file:
+        expected = [desc.get_bytes() for desc in stem.descriptor.parse_file(desc_file)]
+
+      self.assertEqual(expected, [desc.get_bytes() for desc in stem.descriptor.parse_file(get_resource(filename))])
+
+    with _MappedFile(get_resource('cached-microdescs')) as desc_file:
+      self.assertEqual(b'@last-listed 2013-02-24 00:18:36\n', desc_file.readline())
+      self.assertEqual(33, desc_file.tell())
+      self.assertEqual(0, desc_file.seek(0))
+      self.assertEqual(b'@last-listed', desc_file.read(12))
+
+    # stopping midway leaves slices of our mapping in use
+
+    next(stem.descriptor.parse_file(get_resource('cached-microdescs')))
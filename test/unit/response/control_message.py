@@ -2,6 +2,7 @@
 Unit tests for the stem.response.ControlMessage parsing and class.
 """
 
+import asyncio
 import io
 import socket
 import unittest
@@ -52,6 +53,8 @@ class TestControlMessage(unittest.TestCase):
 
     message = self._assert_message_parses(OK_REPLY)
     self.assertEqual('OK', str(message))
+    self.assertEqual('250', message.status_code())
+    self.assertFalse(message.is_event())
 
     contents = message.content()
     self.assertEqual(1, len(contents))
@@ -65,6 +68,8 @@ class TestControlMessage(unittest.TestCase):
     # BW event
     message = self._assert_message_parses(EVENT_BW)
     self.assertEqual('BW 32326 2856', str(message))
+    self.assertEqual('650', message.status_code())
+    self.assertTrue(message.is_event())
 
     contents = message.content()
     self.assertEqual(1, len(contents))
@@ -168,6 +173,86 @@ class TestControlMessage(unittest.TestCase):
     control_socket_file = control_socket.makefile()
     self.assertRaises(stem.SocketClosed, stem.socket.recv_message_from_bytes_io, control_socket_file)
 
+  def test_content_is_a_copy(self):
+    """
+    Our content is only decoded once, but callers shouldn't be able to modify
+    it.
+    """
+
+    message = stem.response.ControlMessage.from_str(GETINFO_VERSION)
+    content = message.content()
+    content.pop()
+
+    self.assertEqual([('250', '-', 'version=0.2.2.23-alpha (git-b85eb949b528f4d7)'), ('250', ' ', 'OK')], message.content())
+    self.assertEqual('OK', message[1])
+
+  def test_streamed_data(self):
+    """
+    Provides data blocks to a data handler rather than buffering them.
+    """
+
+    chunks = []
+
+    async def data_sink(chunk):
+      chunks.append(chunk)
+
+    def data_handler(status_code, content):
+      return data_sink if content == b'info/names=' else None
+
+    async def recv(content):
+      reader = asyncio.StreamReader()
+      reader.feed_data(stem.util.str_tools._to_bytes(content))
+      reader.feed_eof()
+
+      return await stem.socket.recv_message(reader, data_handler = data_handler)
+
+    message = asyncio.run(recv(GETINFO_INFONAMES))
+    expected_lines = GETINFO_INFONAMES.split('\r\n')[1:-3]
+
+    self.assertEqual('\n'.join(expected_lines) + '\n', stem.util.str_tools._to_unicode(b''.join(chunks)))
+    self.assertEqual([('250', '+', 'info/names='), ('250', ' ', 'OK')], message.content())
+
+    # data blocks that we don't provide a sink for are buffered as usual
+
+    chunks = []
+    message = asyncio.run(recv(GETINFO_INFONAMES.replace('info/names', 'info/events')))
+
+    self.assertEqual([], chunks)
+    self.assertTrue(message.content()[0][2].startswith('info/events=\naccounting/bytes --'))
+
+  def test_framing(self):
+    """
+    Reading messages in bulk should provide the same results as reading them
+    line by line, regardless of how the content is split across reads.
+    """
+
+    content = stem.util.str_tools._to_bytes(''.join([GETINFO_VERSION, GETINFO_INFONAMES, EVENT_BW, OK_REPLY, '250+config-text=\r\n.\r\n250 OK\r\n', '250+test=\r\n..a\r\n...\r\n\r\n.\r\n250 OK\r\n']))
+
+    async def recv_all(read_size, read_message):
+      reader = asyncio.StreamReader()
+
+      for i in range(0, len(content), read_size):
+        reader.feed_data(content[i:i + read_size])
+
+      reader.feed_eof()
+      read_message = read_message(reader)
+      messages = []
+
+      while True:
+        try:
+          messages.append(await read_message())
+        except stem.SocketClosed:
+          return messages
+
+    expected = asyncio.run(recv_all(len(content), lambda reader: lambda: stem.socket.recv_message(reader)))
+    self.assertEqual(6, len(expected))
+
+    for read_size in (1, 2, 5, 64, len(content)):
+      messages = asyncio.run(recv_all(read_size, lambda reader: stem.socket._MessageFramer(reader).recv))
+
+      self.assertEqual([msg.raw_content() for msg in expected], [msg.raw_content() for msg in messages])
+      self.assertEqual([msg.content() for msg in expected], [msg.content() for msg in messages])
+
   def test_equality(self):
     msg = stem.response.ControlMessage.from_str(EVENT_BW)
     event_msg = stem.response.ControlMessage.from_str(EVENT_BW, 'EVENT')
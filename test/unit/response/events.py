@@ -568,6 +568,84 @@ class TestEvents(unittest.TestCase):
     self.assertEqual(['SOLID', '"NON', 'SENSE"'], event.positional_args)
     self.assertEqual({'condition': 'MEH', 'quoted': '1 2 3'}, event.keyword_args)
 
+  def test_parse_args(self):
+    """
+    Parse the positional and keyword arguments of event content.
+    """
+
+    parse_args = stem.response.events._parse_args
+
+    self.assertEqual(([], {}), parse_args('BW'))
+    self.assertEqual((['15', '25'], {}), parse_args('BW 15 25'))
+    self.assertEqual((['1', 'BUILT', '$AB=x'], {'PURPOSE': 'GENERAL'}), parse_args('CIRC 1 BUILT $AB=x PURPOSE=GENERAL'))
+    self.assertEqual((['1'], {'A': 'x=y "z"', 'B': ''}), parse_args('CIRC 1 B= A="x=y "z""'))
+
+    # keyword arguments must trail our positional arguments
+
+    self.assertEqual((['A=1', 'x'], {'B': '2'}), parse_args('CIRC A=1 x B=2'))
+
+    # an unterminated quote is an unquoted value
+
+    self.assertEqual(([], {'A': '"'}), parse_args('CIRC A="'))
+
+    # keyword arguments are only parsed from single line content
+
+    self.assertEqual((['A=1', 'B=2'], {}), parse_args('CIRC A=1\nB=2'))
+
+  def test_lazy_loading(self):
+    """
+    Parse event attributes when they're first accessed.
+    """
+
+    event = ControlMessage.from_str(CIRC_LAUNCHED, 'EVENT', normalize = True, lazy_load = True)
+    self.assertTrue(isinstance(event, stem.response.events.CircuitEvent))
+    self.assertEqual('CIRC', event.type)
+    self.assertFalse('id' in event.__dict__)
+
+    self.assertEqual('7', event.id)
+    self.assertEqual(CircStatus.LAUNCHED, event.status)
+    self.assertEqual(_get_event(CIRC_LAUNCHED).keyword_args, event.keyword_args)
+    self.assertRaises(AttributeError, getattr, event, 'no_such_attr')
+
+    # malformed content is reported when we're read
+
+    event = ControlMessage.from_str(CIRC_LAUNCHED_BAD_2, 'EVENT', normalize = True, lazy_load = True)
+    self.assertRaises(ProtocolError, getattr, event, 'id')
+    self.assertRaises(ProtocolError, getattr, event, 'id')
+    self.assertRaises(ProtocolError, getattr, event, 'status')
+    self.assertRaises(ProtocolError, event.compact)
+
+    # methods relying on our private state can be called before we're parsed
+
+    event = ControlMessage.from_str(NEWCONSENSUS_EVENT, 'EVENT', normalize = True, lazy_load = True)
+    self.assertFalse('consensus_content' in event.__dict__)
+    self.assertEqual([entry.nickname for entry in _get_event(NEWCONSENSUS_EVENT).entries()], [entry.nickname for entry in event.entries()])
+
+  def test_compact(self):
+    """
+    Make compact copies of events.
+    """
+
+    event = _get_event(CIRC_LAUNCHED)
+    compact = event.compact()
+
+    self.assertEqual('CompactCircuitEvent', type(compact).__name__)
+    self.assertFalse(hasattr(compact, '__dict__'))
+    self.assertFalse(hasattr(compact, 'positional_args'))
+    self.assertEqual(None, compact.raw_content())
+
+    for attr in ('type', 'arrived_at', 'id', 'status', 'path', 'build_flags', 'purpose', 'created', 'reason'):
+      self.assertEqual(getattr(event, attr), getattr(compact, attr))
+
+    self.assertEqual(compact, event.compact())
+    self.assertEqual(type(compact), type(event.compact()))
+    self.assertEqual(event.raw_content(), event.compact(keep_raw_content = True).raw_content())
+
+    # lazily loaded events are parsed when compacted
+
+    lazy_event = ControlMessage.from_str(CIRC_LAUNCHED, 'EVENT', normalize = True, lazy_load = True)
+    self.assertEqual(event.id, lazy_event.compact().id)
+
   def test_log_events(self):
     event = _get_event('650 DEBUG connection_edge_process_relay_cell(): Got an extended cell! Yay.')
 